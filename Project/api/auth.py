@@ -1,12 +1,19 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Set, Tuple
 
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from database import get_db, User
 from schemas import TokenData
+import metrics
 
 SECRET_KEY = "your-secret-key-here-change-in-production"
 ALGORITHM = "HS256"
@@ -14,6 +21,8 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 BCRYPT_MAX_PASSWORD_BYTES = 72
 
+PRINCIPAL_CACHE_SIZE = int(os.getenv("AUCTION_AUTH_CACHE_SIZE", "10000"))
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
@@ -42,25 +51,111 @@ def verify_token(token: str, credentials_exception):
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
-        token_data = TokenData(email=email)
+        token_data = TokenData(email=email, exp=payload.get("exp"))
     except JWTError:
         raise credentials_exception
     return token_data
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as route handlers see it; detached from any DB session."""
+    id: int
+    name: str
+    email: str
+    role: str
+
+class PrincipalCache:
+    """
+    Bounded LRU of verified token -> Principal. Each entry expires at its token's exp,
+    and all of a user's entries are dropped when that user's row changes.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Principal, float]]" = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, token: str) -> None:
+        principal, _ = self._entries.pop(token)
+        tokens = self._tokens_by_user.get(principal.id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[principal.id]
+
+    def get(self, token: str) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None and entry[1] <= time.time():
+                self._drop(token)
+                entry = None
+            if entry is None:
+                metrics.inc("auth_cache_misses_total")
+                return None
+            self._entries.move_to_end(token)
+        metrics.inc("auth_cache_hits_total")
+        return entry[0]
+
+    def put(self, token: str, principal: Principal, expires_at: Optional[int]) -> None:
+        if expires_at is None:
+            return
+        with self._lock:
+            if token in self._entries:
+                self._drop(token)
+            self._entries[token] = (principal, float(expires_at))
+            self._tokens_by_user.setdefault(principal.id, set()).add(token)
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._drop(token)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_SIZE)
+
+metrics.describe("auth_cache_hits_total", "Authenticated requests served from the principal cache")
+metrics.describe("auth_cache_misses_total", "Authenticated requests that verified the token and loaded the user")
+metrics.describe_gauge(
+    "auth_cache_hit_ratio",
+    "Share of authenticated requests served from the principal cache",
+    lambda: metrics.get("auth_cache_hits_total")
+    / max(metrics.get("auth_cache_hits_total") + metrics.get("auth_cache_misses_total"), 1),
+)
+metrics.describe_gauge("auth_cache_entries", "Tokens held in the principal cache", lambda: len(principal_cache))
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_principals(mapper, connection, target):
+    principal_cache.invalidate_user(target.id)
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Principal:
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     token_data = verify_token(token, credentials_exception)
-    # Placeholder: get user from database
     user = db.query(User).filter(User.email == token_data.email).first()
     if user is None:
         raise credentials_exception
-    return user
+    principal = Principal(id=user.id, name=user.name, email=user.email, role=user.role)
+    principal_cache.put(token, principal, token_data.exp)
+    return principal
 
-def get_current_manager(current_user: User = Depends(get_current_user)):
+def get_current_manager(current_user: Principal = Depends(get_current_user)):
     if current_user.role != "manager":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -68,7 +163,7 @@ def get_current_manager(current_user: User = Depends(get_current_user)):
         )
     return current_user
 
-def get_current_customer(current_user: User = Depends(get_current_user)):
+def get_current_customer(current_user: Principal = Depends(get_current_user)):
     if current_user.role != "customer":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Bid throughput on one hot item.
+
+Threads, each with its own session, place bids on the same item through
+services.bidding.submit_bid with ever-higher amounts drawn from a shared counter,
+so they race exactly as concurrent customers do. Reports accepted bids per
+second, rejections by rule and per-bid latency, and checks the item ends at the
+highest accepted bid:
+
+    python bench/bid_throughput.py --threads 8 --bids 2000
+"""
+import itertools
+import threading
+import time
+from collections import Counter
+from decimal import Decimal
+
+import click
+
+from harness import latency, print_latencies, throwaway_database, write_report
+
+
+@click.command()
+@click.option("--threads", default=8, show_default=True, help="Concurrent bidders.")
+@click.option("--bids", default=2000, show_default=True, help="Bids placed in total.")
+@click.option("--seed", default=1, show_default=True, help="Random seed for the dataset.")
+@click.option("--output", type=click.Path(dir_okay=False), help="Also write the results as JSON.")
+def main(threads, bids, seed, output):
+    _, catalog = throwaway_database(customers=threads, managers=1, auctions=1, items_per_auction=1, seed=seed)
+    import metrics
+    from database import AuctionItem, SessionLocal, User
+    from services.bidding import BidRejected, submit_bid
+
+    (auction_id, items), = catalog.items()
+    (item_id, opening_price), = items.items()
+    with SessionLocal() as db:
+        bidder_ids = [user_id for (user_id,) in db.query(User.id).filter(User.role == "customer")]
+    amounts = itertools.count()
+    amounts_lock = threading.Lock()
+    samples, accepted, rejected, errors = [], [], Counter(), []
+
+    def bidder(bidder_id, count):
+        db = SessionLocal()
+        try:
+            for _ in range(count):
+                with amounts_lock:
+                    amount = opening_price + Decimal(next(amounts))
+                started = time.perf_counter()
+                try:
+                    submit_bid(db, auction_id, item_id, bidder_id, amount)
+                    accepted.append(amount)
+                except BidRejected as e:
+                    rejected[e.reason] += 1
+                samples.append((time.perf_counter() - started) * 1000)
+        except Exception as e:
+            errors.append(repr(e))
+        finally:
+            db.close()
+
+    workers = [
+        threading.Thread(target=bidder, args=(bidder_ids[n % len(bidder_ids)], bids // threads + (n < bids % threads)))
+        for n in range(threads)
+    ]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    if errors:
+        raise click.ClickException(f"{len(errors)} bidders failed, first: {errors[0]}")
+
+    with SessionLocal() as db:
+        final = db.get(AuctionItem, item_id).current_bid
+    consistent = bool(accepted) and final == max(accepted)
+    results = {
+        "elapsed_s": round(elapsed, 3),
+        "attempts_per_s": round(len(samples) / elapsed, 1),
+        "accepted_per_s": round(len(accepted) / elapsed, 1),
+        "accepted": len(accepted),
+        "rejected": dict(rejected),
+        "lock_retries": int(metrics.get("db_lock_retries_total")),
+        "latency_ms": latency(samples),
+        "final_bid_is_highest_accepted": consistent,
+    }
+    print_latencies({"submit_bid": results["latency_ms"]})
+    click.echo(
+        f"\n{results['attempts_per_s']} bids/s attempted, {results['accepted_per_s']} accepted/s "
+        f"({len(accepted)} accepted, rejected: {dict(rejected) or 'none'}, lock retries: {results['lock_retries']})"
+    )
+    click.echo(f"Final price {final} is the highest accepted bid: {consistent}")
+    write_report(output, "bid_throughput", {"threads": threads, "bids": bids, "seed": seed}, results)
+    if not consistent:
+        raise click.ClickException("Final price does not match the highest accepted bid")
+
+
+if __name__ == "__main__":
+    main()
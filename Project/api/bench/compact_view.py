@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Payload size and latency of the full and compact (?view=compact) representations.
+
+For auction detail, a page of the auction list and the customer's bid history,
+fetches both views in-process through TestClient, with the response cache cleared
+before every request so each one is rendered, and reports the bytes on the wire
+next to the latency:
+
+    python bench/compact_view.py --bids 100
+"""
+import random
+
+import click
+
+from harness import (
+    customer_email,
+    latency,
+    password,
+    place_bids,
+    print_latencies,
+    throwaway_database,
+    time_calls,
+    write_report,
+)
+
+VIEWS = ("full", "compact")
+
+
+@click.command()
+@click.option("--auctions", default=200, show_default=True, help="Auctions seeded.")
+@click.option("--items", "items_per_auction", default=10, show_default=True, help="Items per seeded auction.")
+@click.option("--bids", default=100, show_default=True, help="Bids in the customer's history.")
+@click.option("--page-size", default=50, show_default=True, help="Auctions per list page.")
+@click.option("--repeat", default=200, show_default=True, help="Requests per case.")
+@click.option("--seed", default=1, show_default=True, help="Random seed for the dataset.")
+@click.option("--output", type=click.Path(dir_okay=False), help="Also write the results as JSON.")
+def main(auctions, items_per_auction, bids, page_size, repeat, seed, output):
+    _, catalog = throwaway_database(customers=1, managers=1, auctions=auctions, items_per_auction=items_per_auction, seed=seed)
+    place_bids(catalog, bids, seed)
+    from fastapi.testclient import TestClient
+    from main import app
+    from services.response_cache import response_cache
+
+    auction_id = random.Random(seed).choice(sorted(catalog))
+    paths = {
+        "GET /auctions/{auction_id}": f"/auctions/{auction_id}",
+        f"GET /auctions/?limit={page_size}": f"/auctions/?limit={page_size}",
+        "GET /customers/bids": "/customers/bids",
+    }
+    sizes, rows = {}, {}
+    with TestClient(app) as client:
+        email = customer_email(0)
+        token = client.post("/auth/login", data={"username": email, "password": password(email)}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for label, path in paths.items():
+            for view in VIEWS:
+                case = f"{label} {view}"
+
+                def fetch():
+                    response_cache.clear()
+                    return client.get(path, params={"view": view}, headers=headers)
+
+                sizes[case] = len(fetch().content)
+                rows[case] = latency(time_calls(fetch, repeat))
+
+    print_latencies(rows)
+    click.echo(f"\n{'case':<44} {'bytes':>9}")
+    for label in paths:
+        full, compact = sizes[f"{label} full"], sizes[f"{label} compact"]
+        click.echo(f"{label + ' full':<44} {full:>9}")
+        click.echo(f"{label + ' compact':<44} {compact:>9}  ({compact / full:.0%} of full)")
+    config = {"auctions": auctions, "items_per_auction": items_per_auction, "bids": bids,
+              "page_size": page_size, "repeat": repeat, "seed": seed}
+    write_report(output, "compact_view", config, {"bytes": sizes, "latency_ms": rows})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Latency of cheap requests while a large export is running.
+
+Starts uvicorn on a throwaway database big enough for GET /managers/auctions/export
+to take a while, then times GET /health and GET /auctions/{id} twice: with the
+server idle, and while managers stream exports back to back. Blocking database
+work on the event loop shows up as the second set of percentiles climbing; with
+route handlers in the threadpool they should stay flat:
+
+    python bench/event_loop_latency.py --auctions 5000 --exporters 2
+"""
+import random
+import threading
+
+import click
+
+from harness import (
+    customer_email,
+    latency,
+    manager_email,
+    print_latencies,
+    start_server,
+    throwaway_database,
+    write_report,
+)
+from loadtest import Client, Recorder
+
+
+def measure(client, auction_ids, requests, phase):
+    for n in range(requests):
+        client.request(f"{phase} GET /health", "GET", "/health")
+        client.request(f"{phase} GET /auctions/{{auction_id}}", "GET", f"/auctions/{auction_ids[n % len(auction_ids)]}")
+
+
+@click.command()
+@click.option("--auctions", default=5000, show_default=True, help="Auctions seeded; the export covers all of them.")
+@click.option("--items", "items_per_auction", default=10, show_default=True, help="Items per seeded auction.")
+@click.option("--exporters", default=2, show_default=True, help="Managers exporting concurrently in the busy phase.")
+@click.option("--requests", default=300, show_default=True, help="Requests per route and phase.")
+@click.option("--seed", default=1, show_default=True, help="Random seed for the dataset.")
+@click.option("--port", default=8766, show_default=True, help="Port for the uvicorn under test.")
+@click.option("--output", type=click.Path(dir_okay=False), help="Also write the results as JSON.")
+def main(auctions, items_per_auction, exporters, requests, seed, port, output):
+    db_url, catalog = throwaway_database(customers=1, managers=exporters, auctions=auctions,
+                                         items_per_auction=items_per_auction, seed=seed)
+    # Different auctions per phase, so neither phase is served from the other's cached responses
+    auction_ids = random.Random(seed).sample(sorted(catalog), min(2 * requests, len(catalog)))
+    idle_ids, busy_ids = auction_ids[::2], auction_ids[1::2]
+    server = start_server(db_url, port)
+    recorder = Recorder()
+    stop = threading.Event()
+    exporting = threading.Event()
+    exports = []
+
+    def exporter(n):
+        client = Client(port, recorder)
+        if client.login(manager_email(n)):
+            exporting.set()
+            while not stop.is_set():
+                _, body = client.request("GET /managers/auctions/export", "GET", "/managers/auctions/export")
+                exports.append(len(body))
+        client.close()
+
+    try:
+        client = Client(port, recorder)
+        if not client.login(customer_email(0)):
+            raise click.ClickException("Customer login failed")
+        measure(client, idle_ids, requests, "idle")
+        threads = [threading.Thread(target=exporter, args=(n,)) for n in range(exporters)]
+        for thread in threads:
+            thread.start()
+        if not exporting.wait(30):
+            raise click.ClickException("Manager login failed")
+        measure(client, busy_ids, requests, "exporting")
+        stop.set()
+        for thread in threads:
+            thread.join()
+        client.close()
+    finally:
+        stop.set()
+        server.terminate()
+        server.wait(10)
+
+    rows = {route: latency(samples) for route, samples in sorted(recorder.latencies.items()) if route != "POST /auth/login"}
+    print_latencies(rows)
+    click.echo(f"\n{len(exports)} exports of ~{max(exports, default=0) // 1024} KiB completed during the busy phase")
+    config = {"auctions": auctions, "items_per_auction": items_per_auction, "exporters": exporters,
+              "requests": requests, "seed": seed}
+    write_report(output, "event_loop_latency", config, {"latency_ms": rows, "exports": len(exports)})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Shared setup for the benchmarks in this directory: a throwaway seeded database,
+latency summaries and JSON reports that can be compared across commits.
+
+Every benchmark is a script run from the api directory, e.g.
+
+    python bench/bid_throughput.py --threads 8 --output bids.json
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import click
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+API_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, API_DIR)
+
+from loadtest import customer_email, git_commit, manager_email, password, percentile, seed_database, start_server  # noqa: E402
+
+
+def throwaway_database(customers=5, managers=1, auctions=10, items_per_auction=5, seed=1):
+    """
+    Seed a temporary SQLite file with loadtest's dataset and point the app at it.
+    Call before importing any app module. Returns (db_url, {auction_id: {item_id: opening_price}}).
+    """
+    directory = tempfile.mkdtemp(prefix="auction-bench-")
+    db_url = f"sqlite:///{os.path.join(directory, 'auction_house.db')}"
+    catalog = seed_database(db_url, customers, managers, auctions, items_per_auction, random.Random(seed))
+    return db_url, catalog
+
+
+def place_bids(catalog, count, seed=1):
+    """Place `count` accepted bids by the first seeded customer, on distinct random items. Returns the bidder's id."""
+    from database import SessionLocal, User
+    from services.bidding import submit_bid
+
+    items = [(auction_id, item_id, price) for auction_id, prices in catalog.items() for item_id, price in prices.items()]
+    with SessionLocal() as db:
+        bidder_id = db.query(User.id).filter(User.email == customer_email(0)).scalar()
+        for auction_id, item_id, price in random.Random(seed).sample(items, min(count, len(items))):
+            submit_bid(db, auction_id, item_id, bidder_id, price + 1)
+    return bidder_id
+
+
+def time_calls(call, repeat):
+    """Run call() `repeat` times; returns each call's duration in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def latency(samples_ms):
+    ordered = sorted(samples_ms)
+    return {
+        "n": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 3),
+        "p50": round(percentile(ordered, 50), 3),
+        "p95": round(percentile(ordered, 95), 3),
+        "p99": round(percentile(ordered, 99), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def print_latencies(rows):
+    """Print {label: latency(...)} as a table, in milliseconds."""
+    click.echo(f"\n{'case':<44} {'n':>6} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for label, stats in rows.items():
+        click.echo(
+            f"{label:<44} {stats['n']:>6} {stats['mean']:>9} {stats['p50']:>9} {stats['p95']:>9} {stats['p99']:>9}"
+        )
+
+
+def write_report(output, benchmark, config, results):
+    if output is None:
+        return
+    report = {"benchmark": benchmark, "commit": git_commit(), "config": config, "results": results}
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    click.echo(f"\nResults written to {output}")
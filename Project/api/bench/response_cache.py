@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Read-heavy speedup from the response cache.
+
+Times GET /auctions/{id} and a page of GET /auctions/ in-process through
+TestClient three ways: a cache miss (the cache is cleared before every request,
+so each one queries and serializes), a hit (cached bytes), and a revalidation
+with If-None-Match answered 304 from the cache:
+
+    python bench/response_cache.py --repeat 300
+"""
+import random
+
+import click
+
+from harness import customer_email, latency, password, print_latencies, throwaway_database, time_calls, write_report
+
+
+@click.command()
+@click.option("--auctions", default=200, show_default=True, help="Auctions seeded.")
+@click.option("--items", "items_per_auction", default=10, show_default=True, help="Items per seeded auction.")
+@click.option("--page-size", default=50, show_default=True, help="Auctions per list page.")
+@click.option("--repeat", default=300, show_default=True, help="Requests per case.")
+@click.option("--seed", default=1, show_default=True, help="Random seed for the dataset.")
+@click.option("--output", type=click.Path(dir_okay=False), help="Also write the results as JSON.")
+def main(auctions, items_per_auction, page_size, repeat, seed, output):
+    _, catalog = throwaway_database(customers=1, managers=1, auctions=auctions, items_per_auction=items_per_auction, seed=seed)
+    from fastapi.testclient import TestClient
+    from main import app
+    from services.response_cache import response_cache
+
+    auction_id = random.Random(seed).choice(sorted(catalog))
+    paths = {
+        "GET /auctions/{auction_id}": f"/auctions/{auction_id}",
+        f"GET /auctions/?limit={page_size}": f"/auctions/?limit={page_size}",
+    }
+    rows = {}
+    with TestClient(app) as client:
+        email = customer_email(0)
+        token = client.post("/auth/login", data={"username": email, "password": password(email)}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for label, path in paths.items():
+            etag = client.get(path, headers=headers).headers["ETag"]
+
+            def miss():
+                response_cache.clear()
+                client.get(path, headers=headers)
+
+            rows[f"{label} miss"] = latency(time_calls(miss, repeat))
+            client.get(path, headers=headers)
+            rows[f"{label} hit"] = latency(time_calls(lambda: client.get(path, headers=headers), repeat))
+            revalidate = {**headers, "If-None-Match": etag}
+            rows[f"{label} 304"] = latency(time_calls(lambda: client.get(path, headers=revalidate), repeat))
+
+    print_latencies(rows)
+    click.echo("")
+    for label in paths:
+        speedup = rows[f"{label} miss"]["mean"] / rows[f"{label} hit"]["mean"]
+        click.echo(f"{label}: hits are {speedup:.1f}x faster than misses on average")
+    config = {"auctions": auctions, "items_per_auction": items_per_auction, "page_size": page_size,
+              "repeat": repeat, "seed": seed}
+    write_report(output, "response_cache", config, {"latency_ms": rows})
+
+
+if __name__ == "__main__":
+    main()
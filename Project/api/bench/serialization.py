@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Response serialization: FastAPI's response_model path against responses.dump_json.
+
+For each endpoint's response model, loads the value the route loads (ORM rows
+with the same joinedloads) and times turning it into body bytes two ways:
+
+- response_model: what FastAPI does for a route returning ORM objects, i.e.
+  validate into the model, dump it to JSON-compatible Python, then json.dumps
+  in JSONResponse. The threadpool hop FastAPI adds around validation for sync
+  routes is left out, so this is a lower bound on the old cost.
+- dump_json: one validation from attributes and pydantic's compiled serializer
+  straight to bytes, as model_response does.
+
+Both must produce identical bytes:
+
+    python bench/serialization.py --bids 500
+"""
+import random
+from typing import List
+
+import click
+
+from harness import latency, place_bids, print_latencies, throwaway_database, time_calls, write_report
+
+
+@click.command()
+@click.option("--auctions", default=200, show_default=True, help="Auctions seeded.")
+@click.option("--items", "items_per_auction", default=10, show_default=True, help="Items per seeded auction.")
+@click.option("--bids", default=500, show_default=True, help="Bids in the customer's history.")
+@click.option("--page-size", default=50, show_default=True, help="Auctions per list page.")
+@click.option("--repeat", default=200, show_default=True, help="Serializations per case.")
+@click.option("--seed", default=1, show_default=True, help="Random seed for the dataset.")
+@click.option("--output", type=click.Path(dir_okay=False), help="Also write the results as JSON.")
+def main(auctions, items_per_auction, bids, page_size, repeat, seed, output):
+    _, catalog = throwaway_database(customers=1, managers=1, auctions=auctions, items_per_auction=items_per_auction, seed=seed)
+    bidder_id = place_bids(catalog, bids, seed)
+    from fastapi.responses import JSONResponse
+    from fastapi.utils import create_model_field
+    from sqlalchemy.orm import joinedload
+
+    from compact import compact_bids
+    from database import Auction, AuctionItem, Bid, SessionLocal
+    from responses import dump_json
+    from schemas import AuctionDetailResponse, AuctionPage, BidResponse, CompactResponse, ItemPriceResponse
+    from services.price_book import price_book
+
+    auction_id = random.Random(seed).choice(sorted(catalog))
+    with SessionLocal() as db:
+        history = (
+            db.query(Bid)
+            .options(
+                joinedload(Bid.item).joinedload(AuctionItem.auction).joinedload(Auction.creator),
+                joinedload(Bid.bidder),
+            )
+            .filter(Bid.bidder_id == bidder_id)
+            .order_by(Bid.created_at.desc())
+            .all()
+        )
+        detail = (
+            db.query(Auction)
+            .options(joinedload(Auction.creator), joinedload(Auction.items))
+            .filter(Auction.id == auction_id)
+            .first()
+        )
+        page = (
+            db.query(Auction)
+            .options(joinedload(Auction.creator))
+            .order_by(Auction.created_at.desc(), Auction.id.desc())
+            .limit(page_size)
+            .all()
+        )
+        cases = {
+            "GET /customers/bids List[BidResponse]": (List[BidResponse], history),
+            "GET /customers/bids?view=compact CompactResponse": (CompactResponse, compact_bids(history)),
+            "GET /auctions/{auction_id} AuctionDetailResponse": (AuctionDetailResponse, detail),
+            f"GET /auctions/?limit={page_size} AuctionPage": (AuctionPage, {"items": page, "next_cursor": None}),
+            "POST /auctions/{auction_id}/bids BidResponse": (BidResponse, history[0]),
+            "GET /auctions/{auction_id}/prices List[ItemPriceResponse]": (
+                List[ItemPriceResponse], price_book.load_auction(db, auction_id)
+            ),
+        }
+
+        rows, speedups = {}, {}
+        for label, (response_type, value) in cases.items():
+            field = create_model_field("Response", response_type, mode="serialization")
+
+            def response_model():
+                validated, errors = field.validate(value, {}, loc=("response",))
+                assert not errors, errors
+                return JSONResponse(field.serialize(validated)).body
+
+            def fast():
+                return dump_json(response_type, value)
+
+            if response_model() != fast():
+                raise click.ClickException(f"{label}: the two paths produce different bytes")
+            rows[f"{label} response_model"] = latency(time_calls(response_model, repeat))
+            rows[f"{label} dump_json"] = latency(time_calls(fast, repeat))
+            speedups[label] = round(rows[f"{label} response_model"]["mean"] / rows[f"{label} dump_json"]["mean"], 2)
+
+    print_latencies(rows)
+    click.echo("")
+    for label, speedup in speedups.items():
+        click.echo(f"{label}: dump_json is {speedup}x faster, identical bytes")
+    config = {"auctions": auctions, "items_per_auction": items_per_auction, "bids": bids,
+              "page_size": page_size, "repeat": repeat, "seed": seed}
+    write_report(output, "serialization", config, {"latency_ms": rows, "speedup": speedups})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Compact (normalized) rendering of auction reads, selected per request with ?view=compact."""
+from typing import Iterable, List, Literal, Optional
+
+from fastapi import Query
+from pydantic import BaseModel
+
+from database import Auction, AuctionItem, Bid, User
+from schemas import AuctionDetailResponse, AuctionPage, CompactAuction, CompactBid, CompactItem, CompactResponse, UserResponse
+from services.price_book import ItemPrice
+
+VIEW_FULL = "full"
+VIEW_COMPACT = "compact"
+
+
+def view_param(
+    view: Literal["full", "compact"] = Query(
+        VIEW_FULL, description="compact: ids plus side-loaded auctions/items/users maps"
+    ),
+) -> str:
+    return view
+
+
+def _add_user(payload: CompactResponse, user: User) -> None:
+    if user.id not in payload.users:
+        payload.users[user.id] = UserResponse.model_validate(user)
+
+
+def _add_auction(payload: CompactResponse, auction: Auction) -> None:
+    if auction.id not in payload.auctions:
+        payload.auctions[auction.id] = CompactAuction.model_validate(auction)
+        _add_user(payload, auction.creator)
+
+
+def _add_item(payload: CompactResponse, item: AuctionItem) -> None:
+    if item.id not in payload.items:
+        payload.items[item.id] = CompactItem.model_validate(item)
+        _add_auction(payload, item.auction)
+
+
+def compact_auctions(auctions: List[Auction], next_cursor: Optional[str] = None) -> CompactResponse:
+    payload = CompactResponse(ids=[auction.id for auction in auctions], next_cursor=next_cursor)
+    for auction in auctions:
+        _add_auction(payload, auction)
+    return payload
+
+
+def compact_auction_detail(auction: Auction) -> CompactResponse:
+    payload = compact_auctions([auction])
+    for item in auction.items:
+        _add_item(payload, item)
+    return payload
+
+
+def compact_bids(bids: List[Bid]) -> CompactResponse:
+    payload = CompactResponse(ids=[bid.id for bid in bids])
+    for bid in bids:
+        payload.bids[bid.id] = CompactBid.model_validate(bid)
+        _add_item(payload, bid.item)
+        _add_user(payload, bid.bidder)
+    return payload
+
+
+def render_page(auctions: List[Auction], next_cursor: Optional[str], view: str) -> BaseModel:
+    if view == VIEW_COMPACT:
+        return compact_auctions(auctions, next_cursor)
+    return AuctionPage.model_validate({"items": auctions, "next_cursor": next_cursor}, from_attributes=True)
+
+
+def _apply_prices(items: Iterable[BaseModel], prices: Iterable[ItemPrice]) -> None:
+    by_item = {price.item_id: price for price in prices}
+    for item in items:
+        price = by_item.get(item.id)
+        if price is not None:
+            item.current_bid = price.current_bid
+            item.current_bidder_id = price.current_bidder_id
+
+
+def render_auction(auction: Auction, view: str, prices: Iterable[ItemPrice] = ()) -> BaseModel:
+    """Detail in the requested view; `prices` (from the price book) override the items' loaded prices."""
+    if view == VIEW_COMPACT:
+        payload = compact_auction_detail(auction)
+        _apply_prices(payload.items.values(), prices)
+        return payload
+    detail = AuctionDetailResponse.model_validate(auction)
+    _apply_prices(detail.items, prices)
+    return detail
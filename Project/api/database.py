@@ -1,9 +1,14 @@
 import sqlite3
 import os
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, ForeignKey, Text, Numeric
+import time
+from sqlalchemy import create_engine, event, inspect, text, Column, Integer, String, DateTime, ForeignKey, Text, Numeric, Index, UniqueConstraint, and_, case
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.schema import CreateColumn
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
+import metrics
 
 # Get absolute path to project data directory
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -14,14 +19,61 @@ os.makedirs(DATA_DIR, exist_ok=True)
 
 # Absolute path to SQLite database
 DB_PATH = os.path.join(DATA_DIR, "auction_house.db")
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_PATH}"
+SQLALCHEMY_DATABASE_URL = os.getenv("AUCTION_DB_URL", f"sqlite:///{DB_PATH}")
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+# Connection pool sizing
+DB_POOL_SIZE = int(os.getenv("AUCTION_DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("AUCTION_DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("AUCTION_DB_POOL_TIMEOUT", "30"))
+
+# SQLite performance profile, applied to every new connection
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("AUCTION_SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("AUCTION_SQLITE_SYNCHRONOUS", "NORMAL"),
+    "cache_size": os.getenv("AUCTION_SQLITE_CACHE_SIZE", "-65536"),  # negative = KiB, i.e. 64 MiB
+    "mmap_size": os.getenv("AUCTION_SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+    "temp_store": os.getenv("AUCTION_SQLITE_TEMP_STORE", "MEMORY"),
+    "busy_timeout": os.getenv("AUCTION_SQLITE_BUSY_TIMEOUT_MS", "5000"),
+}
+
+# Retries on top of busy_timeout for lock errors SQLite reports without waiting
+DB_LOCK_RETRIES = int(os.getenv("AUCTION_DB_LOCK_RETRIES", "5"))
+DB_LOCK_BACKOFF = float(os.getenv("AUCTION_DB_LOCK_BACKOFF", "0.02"))
+
+IS_SQLITE = SQLALCHEMY_DATABASE_URL.startswith("sqlite")
+
+engine_options = {}
+if IS_SQLITE:
+    engine_options["connect_args"] = {"check_same_thread": False}
+if ":memory:" not in SQLALCHEMY_DATABASE_URL:
+    engine_options.update(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+    )
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options)
+
+if IS_SQLITE:
+    @event.listens_for(engine, "connect")
+    def _apply_sqlite_profile(dbapi_connection, connection_record):
+        # Let SQLAlchemy rather than pysqlite emit BEGIN (see _begin_sqlite_transaction);
+        # this also makes SAVEPOINT behave correctly.
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _begin_sqlite_transaction(conn):
+        conn.exec_driver_sql("BEGIN")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+metrics.describe("db_lock_retries_total", "Write transactions retried after SQLite lock contention")
+metrics.describe("db_lock_failures_total", "Write transactions that failed after exhausting lock retries")
+
 Base = declarative_base()
 
 class User(Base):
@@ -49,10 +101,35 @@ class Auction(Base):
     ended_at = Column(DateTime, nullable=True)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     status = Column(String, default="active")  # 'active', 'ended', 'cancelled'
+    # Bumped on every change to the auction, its items' prices or its creator's shown details; feeds ETags
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     
     creator = relationship("User", back_populates="created_auctions")
     items = relationship("AuctionItem", back_populates="auction")
     
+    __table_args__ = (
+        # Keyset pagination order for every auction list
+        Index("ix_auctions_created_at_id", "created_at", "id"),
+        # Status-filtered lists in the same order
+        Index("ix_auctions_status_created_at_id", "status", "created_at", "id"),
+        # Active auctions by end time (closer, effective-status filters)
+        Index("ix_auctions_status_ended_at", "status", "ended_at"),
+    )
+    
+    @hybrid_property
+    def effective_status(self):
+        """Status as of now: an active auction past ended_at reads as 'ended' even before it is closed."""
+        if self.status == "active" and self.ended_at is not None and self.ended_at <= datetime.utcnow():
+            return "ended"
+        return self.status
+    
+    @effective_status.expression
+    def effective_status(cls):
+        return case(
+            (and_(cls.status == "active", cls.ended_at.isnot(None), cls.ended_at <= datetime.utcnow()), "ended"),
+            else_=cls.status,
+        )
+    
     def __repr__(self):
         return f"<Auction(id={self.id}, name='{self.name}', status='{self.status}')>"
 
@@ -63,7 +140,7 @@ class AuctionItem(Base):
     name = Column(String, nullable=False)
     opening_price = Column(Numeric(10, 2), nullable=False)
     closing_price = Column(Numeric(10, 2), default=0)
-    auction_id = Column(Integer, ForeignKey("auctions.id"), nullable=False)
+    auction_id = Column(Integer, ForeignKey("auctions.id"), nullable=False, index=True)
     current_bid = Column(Numeric(10, 2), default=0)
     current_bidder_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     
@@ -78,7 +155,7 @@ class Bid(Base):
     __tablename__ = "bids"
     
     id = Column(Integer, primary_key=True, index=True)
-    item_id = Column(Integer, ForeignKey("auction_items.id"), nullable=False)
+    item_id = Column(Integer, ForeignKey("auction_items.id"), nullable=False, index=True)
     bidder_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     amount = Column(Numeric(10, 2), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -86,9 +163,42 @@ class Bid(Base):
     item = relationship("AuctionItem", back_populates="bids")
     bidder = relationship("User", back_populates="bids")
     
+    __table_args__ = (
+        # A bidder's history, newest first
+        Index("ix_bids_bidder_id_created_at", "bidder_id", "created_at"),
+    )
+    
     def __repr__(self):
         return f"<Bid(id={self.id}, amount={self.amount}, item_id={self.item_id})>"
 
+class ProxyBid(Base):
+    """A bidder's standing maximum for an item; the engine bids on their behalf up to it."""
+    __tablename__ = "proxy_bids"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    item_id = Column(Integer, ForeignKey("auction_items.id"), nullable=False)
+    bidder_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    max_amount = Column(Numeric(10, 2), nullable=False)
+    # When max_amount was last set; the earlier of two equal maximums wins
+    placed_at = Column(DateTime, default=datetime.utcnow)
+    
+    item = relationship("AuctionItem")
+    bidder = relationship("User")
+    
+    __table_args__ = (
+        # One standing maximum per bidder per item
+        UniqueConstraint("item_id", "bidder_id", name="uq_proxy_bids_item_id_bidder_id"),
+        # The two highest maximums for an item
+        Index("ix_proxy_bids_item_id_max_amount", "item_id", "max_amount"),
+    )
+    
+    @property
+    def leading(self):
+        return self.item.current_bidder_id == self.bidder_id
+    
+    def __repr__(self):
+        return f"<ProxyBid(id={self.id}, item_id={self.item_id}, bidder_id={self.bidder_id}, max_amount={self.max_amount})>"
+
 def get_db():
     db = SessionLocal()
     try:
@@ -96,9 +206,62 @@ def get_db():
     finally:
         db.close()
 
+# Called with the attempt number (0 first) before each attempt of run_write_transaction,
+# e.g. so query budgets count only the statements of the attempt that commits
+write_attempt_hooks = []
+
+def is_lock_error(error: Exception) -> bool:
+    """True for SQLite lock contention, which run_write_transaction retries."""
+    if not isinstance(error, OperationalError):
+        return False
+    message = str(error.orig).lower()
+    return "database is locked" in message or "database table is locked" in message
+
+def run_write_transaction(db, work, *args, **kwargs):
+    """
+    Run work(db, *args, **kwargs), which must finish with db.commit(), retrying
+    with exponential backoff when SQLite reports lock contention.
+    Any read transaction already open on the session is ended first, so the write
+    starts from a fresh snapshot and SQLite's busy handler can wait for the lock.
+    """
+    for attempt in range(DB_LOCK_RETRIES + 1):
+        db.rollback()
+        for hook in write_attempt_hooks:
+            hook(attempt)
+        try:
+            return work(db, *args, **kwargs)
+        except OperationalError as e:
+            db.rollback()
+            if not is_lock_error(e):
+                raise
+            if attempt == DB_LOCK_RETRIES:
+                metrics.inc("db_lock_failures_total")
+                raise
+            metrics.inc("db_lock_retries_total")
+            time.sleep(DB_LOCK_BACKOFF * (2 ** attempt))
+
 def create_tables():
     Base.metadata.create_all(bind=engine)
+    migrate()
+
+def migrate():
+    """
+    Bring an existing database file up to the current models.
+    create_all() skips tables that already exist, including their columns and
+    indexes, so columns and indexes added since the file was created are added here.
+    New columns must be nullable or have a server_default.
+    """
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    ddl = CreateColumn(column).compile(dialect=conn.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
 
 if __name__ == "__main__":
     create_tables()
-    print("Database tables created successfully!")
\ No newline at end of file
+    print("Database tables created and migrated successfully!")
\ No newline at end of file
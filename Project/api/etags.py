@@ -0,0 +1,44 @@
+"""Conditional GET for auction reads: ETags derived from Auction.version."""
+import hashlib
+from typing import Iterable, Optional
+
+from fastapi import Request, Response, status
+
+from database import Auction
+
+
+def _view_suffix(view: str) -> str:
+    # Each representation of a resource needs its own tag
+    return "" if view == "full" else f".{view}"
+
+
+def auction_etag(auction_id: int, version: int, effective_status: str, view: str = "full") -> str:
+    # effective_status covers auctions that have ended but not been closed (and bumped) yet
+    return f'W/"a{auction_id}.{version}.{effective_status}{_view_suffix(view)}"'
+
+
+def page_etag(auctions: Iterable[Auction], next_cursor: Optional[str], view: str = "full") -> str:
+    digest = hashlib.blake2b(digest_size=12)
+    for auction in auctions:
+        digest.update(f"{auction.id}.{auction.version}.{auction.effective_status};".encode())
+    digest.update((next_cursor or "").encode())
+    return f'W/"p{digest.hexdigest()}{_view_suffix(view)}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def is_fresh(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match already covers `etag`."""
+    if_none_match = request.headers.get("if-none-match")
+    return bool(if_none_match) and _matches(if_none_match, etag)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Load test for the auction API.
+
+Seeds a throwaway database, starts uvicorn on it, and runs simulated customers
+(login, list, view, bid, my-bids) and managers (login, list, export, import)
+against it for a fixed time. Reports throughput and p50/p95/p99 latency per
+route, and writes the same figures as JSON so runs can be compared across commits:
+
+    python loadtest.py --customers 20 --managers 2 --duration 30 --output results.json
+"""
+
+import http.client
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal
+from urllib.parse import urlencode
+
+import click
+
+API_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Relative weights of each simulated action
+CUSTOMER_MIX = {"list": 30, "view": 35, "bid": 25, "my-bids": 10}
+MANAGER_MIX = {"list": 60, "export": 30, "import": 10}
+
+# Auctions per CSV uploaded by the import action
+IMPORT_ROWS = 20
+# Seconds to wait for the server to answer /health
+SERVER_START_TIMEOUT = 30
+
+
+def seed_database(db_url, customers, managers, auctions, items_per_auction, rng):
+    """
+    Create the schema and bulk-insert the users, auctions and items.
+    Returns {auction_id: {item_id: opening_price}}.
+    """
+    os.environ["AUCTION_DB_URL"] = db_url
+    sys.path.append(API_DIR)
+    from sqlalchemy import insert, select
+    from database import Auction, AuctionItem, User, create_tables, engine
+
+    create_tables()
+    ends_at = datetime.utcnow() + timedelta(days=7)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"name": f"Manager {n}", "email": manager_email(n), "password": password(manager_email(n)), "role": "manager"}
+            for n in range(managers)
+        ] + [
+            {"name": f"Customer {n}", "email": customer_email(n), "password": password(customer_email(n)), "role": "customer"}
+            for n in range(customers)
+        ])
+        manager_ids = conn.execute(select(User.id).where(User.role == "manager")).scalars().all()
+        conn.execute(insert(Auction), [
+            {"name": f"Load test auction {n}", "ended_at": ends_at, "created_by": rng.choice(manager_ids), "status": "active"}
+            for n in range(auctions)
+        ])
+        auction_ids = conn.execute(select(Auction.id)).scalars().all()
+        conn.execute(insert(AuctionItem), [
+            {
+                "name": f"Lot {auction_id}-{n}",
+                "opening_price": Decimal(rng.randrange(1000, 100000)) / 100,
+                "auction_id": auction_id,
+                "current_bid": 0,
+            }
+            for auction_id in auction_ids
+            for n in range(items_per_auction)
+        ])
+        catalog = defaultdict(dict)
+        for row in conn.execute(select(AuctionItem.id, AuctionItem.auction_id, AuctionItem.opening_price)):
+            catalog[row.auction_id][row.id] = row.opening_price
+    engine.dispose()
+    return dict(catalog)
+
+
+def customer_email(n):
+    return f"loadtest.customer{n}@example.com"
+
+
+def manager_email(n):
+    return f"loadtest.manager{n}@example.com"
+
+
+def password(email):
+    return f"loadtest:{email}"
+
+
+def start_server(db_url, port):
+    env = {**os.environ, "AUCTION_DB_URL": db_url}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=API_DIR,
+        env=env,
+    )
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise click.ClickException(f"uvicorn exited with status {server.returncode}")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return server
+        except OSError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise click.ClickException("uvicorn did not become healthy in time")
+
+
+class Recorder:
+    """Latency samples and status codes per route, shared by all workers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    def record(self, route, status, seconds):
+        with self._lock:
+            self.latencies[route].append(seconds * 1000)
+            self.statuses[route][status] += 1
+
+
+class Client:
+    """One simulated user: a keep-alive connection and a bearer token."""
+
+    def __init__(self, port, recorder):
+        self.port = port
+        self.recorder = recorder
+        self.token = None
+        self._conn = None
+
+    def request(self, route, method, path, body=None, content_type=None):
+        """Send a request and record it under `route`. Returns (status, body); status 0 is a connection error."""
+        headers = {}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if content_type:
+            headers["Content-Type"] = content_type
+        start = time.perf_counter()
+        try:
+            if self._conn is None:
+                self._conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=30)
+            self._conn.request(method, path, body=body, headers=headers)
+            response = self._conn.getresponse()
+            status, payload = response.status, response.read()
+        except (OSError, http.client.HTTPException):
+            self.close()
+            status, payload = 0, b""
+        self.recorder.record(route, status, time.perf_counter() - start)
+        return status, payload
+
+    def json(self, route, method, path, data):
+        return self.request(route, method, path, json.dumps(data).encode(), "application/json")
+
+    def login(self, email):
+        status, payload = self.request(
+            "POST /auth/login", "POST", "/auth/login",
+            urlencode({"username": email, "password": password(email)}).encode(),
+            "application/x-www-form-urlencoded",
+        )
+        if status == 200:
+            self.token = json.loads(payload)["access_token"]
+        return status == 200
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def run_customer(client, email, rng, deadline, think, catalog, prices):
+    if not client.login(email):
+        return
+    actions, weights = zip(*CUSTOMER_MIX.items())
+    while time.monotonic() < deadline:
+        action = rng.choices(actions, weights)[0]
+        auction_id = rng.choice(list(catalog))
+        if action == "list":
+            client.request("GET /auctions/", "GET", "/auctions/?limit=20")
+        elif action == "view":
+            status, payload = client.request("GET /auctions/{auction_id}", "GET", f"/auctions/{auction_id}")
+            if status == 200:
+                for item in json.loads(payload)["items"]:
+                    prices[item["id"]] = Decimal(item["current_bid"] or 0)
+        elif action == "bid":
+            item_id, opening_price = rng.choice(list(catalog[auction_id].items()))
+            amount = max(prices.get(item_id, Decimal("0")), opening_price) + Decimal(rng.randint(1, 20))
+            status, _ = client.json(
+                "POST /auctions/{auction_id}/bids", "POST", f"/auctions/{auction_id}/bids",
+                {"item_id": item_id, "amount": str(amount)},
+            )
+            if status == 200:
+                prices[item_id] = max(prices.get(item_id, Decimal("0")), amount)
+        else:
+            client.request("GET /customers/bids", "GET", "/customers/bids")
+        if think:
+            time.sleep(think)
+    client.close()
+
+
+def import_csv(rng):
+    ends_at = (datetime.utcnow() + timedelta(days=7)).strftime("%Y-%m-%d %H:%M:%S")
+    lines = ["name,ended_at,item_1_name,item_1_price,item_2_name,item_2_price"]
+    for n in range(IMPORT_ROWS):
+        tag = rng.getrandbits(32)
+        lines.append(f"Imported {tag},{ends_at},Lot {tag}-1,{rng.randint(10, 900)}.00,Lot {tag}-2,{rng.randint(10, 900)}.00")
+    return ("\n".join(lines) + "\n").encode()
+
+
+def multipart(field, filename, content):
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        "Content-Type: text/csv\r\n\r\n"
+    ).encode() + content + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def run_manager(client, email, rng, deadline, think):
+    if not client.login(email):
+        return
+    actions, weights = zip(*MANAGER_MIX.items())
+    while time.monotonic() < deadline:
+        action = rng.choices(actions, weights)[0]
+        if action == "list":
+            client.request("GET /managers/auctions", "GET", "/managers/auctions?limit=20")
+        elif action == "export":
+            client.request("GET /managers/auctions/export", "GET", "/managers/auctions/export")
+        else:
+            body, content_type = multipart("file", "loadtest.csv", import_csv(rng))
+            client.request("POST /managers/auctions/import", "POST", "/managers/auctions/import", body, content_type)
+        if think:
+            time.sleep(think)
+    client.close()
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an ascending list."""
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def summarize(latencies, statuses, elapsed):
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "throughput_rps": round(len(ordered) / elapsed, 2),
+        "latency_ms": {
+            "mean": round(sum(ordered) / len(ordered), 2),
+            "p50": round(percentile(ordered, 50), 2),
+            "p95": round(percentile(ordered, 95), 2),
+            "p99": round(percentile(ordered, 99), 2),
+            "max": round(ordered[-1], 2),
+        },
+        "status": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=API_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report):
+    click.echo(f"\n{'route':<36} {'reqs':>7} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8}  status")
+    rows = sorted(report["routes"].items()) + [("TOTAL", report["total"])]
+    for route, stats in rows:
+        latency = stats["latency_ms"]
+        status = " ".join(f"{code}:{count}" for code, count in stats["status"].items())
+        click.echo(
+            f"{route:<36} {stats['requests']:>7} {stats['throughput_rps']:>8} "
+            f"{latency['p50']:>8} {latency['p95']:>8} {latency['p99']:>8}  {status}"
+        )
+
+
+@click.command()
+@click.option("--customers", default=20, show_default=True, help="Simulated customers.")
+@click.option("--managers", default=2, show_default=True, help="Simulated managers.")
+@click.option("--auctions", default=50, show_default=True, help="Auctions seeded.")
+@click.option("--items", "items_per_auction", default=10, show_default=True, help="Items per seeded auction.")
+@click.option("--duration", default=30.0, show_default=True, help="Seconds of load after login.")
+@click.option("--think-ms", default=0, show_default=True, help="Pause between a user's requests.")
+@click.option("--seed", default=1, show_default=True, help="Random seed for the dataset and the action mix.")
+@click.option("--port", default=8765, show_default=True, help="Port for the uvicorn under test.")
+@click.option("--db", "db_path", type=click.Path(dir_okay=False), help="Keep the database here instead of a temporary file.")
+@click.option("--output", type=click.Path(dir_okay=False), default="loadtest-results.json", show_default=True)
+def main(customers, managers, auctions, items_per_auction, duration, think_ms, seed, port, db_path, output):
+    """Seed a database, load a local uvicorn with simulated users and report per-route latency."""
+    tmpdir = None
+    if db_path is None:
+        tmpdir = tempfile.TemporaryDirectory(prefix="auction-loadtest-")
+        db_path = os.path.join(tmpdir.name, "loadtest.db")
+    elif os.path.exists(db_path):
+        raise click.ClickException(f"{db_path} already exists")
+    db_url = f"sqlite:///{os.path.abspath(db_path)}"
+
+    rng = random.Random(seed)
+    catalog = seed_database(db_url, customers, managers, auctions, items_per_auction, rng)
+    click.echo(f"Seeded {customers} customers, {managers} managers, {auctions} auctions x {items_per_auction} items")
+
+    server = start_server(db_url, port)
+    recorder = Recorder()
+    prices = {}
+    threads = []
+    try:
+        started_at = datetime.utcnow()
+        deadline = time.monotonic() + duration
+        think = think_ms / 1000
+        for n in range(customers):
+            args = (Client(port, recorder), customer_email(n), random.Random(f"{seed}-customer-{n}"), deadline, think, catalog, prices)
+            threads.append(threading.Thread(target=run_customer, args=args, daemon=True))
+        for n in range(managers):
+            args = (Client(port, recorder), manager_email(n), random.Random(f"{seed}-manager-{n}"), deadline, think)
+            threads.append(threading.Thread(target=run_manager, args=args, daemon=True))
+        started = time.monotonic()
+        click.echo(f"Running {len(threads)} users for {duration:g}s against port {port}...")
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+    finally:
+        server.terminate()
+        server.wait(10)
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+    if not recorder.latencies:
+        raise click.ClickException("No requests completed")
+    all_latencies = [sample for samples in recorder.latencies.values() for sample in samples]
+    all_statuses = sum(recorder.statuses.values(), Counter())
+    report = {
+        "commit": git_commit(),
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "config": {
+            "customers": customers,
+            "managers": managers,
+            "auctions": auctions,
+            "items_per_auction": items_per_auction,
+            "duration_s": duration,
+            "think_ms": think_ms,
+            "seed": seed,
+        },
+        "elapsed_s": round(elapsed, 2),
+        "total": summarize(all_latencies, all_statuses, elapsed),
+        "routes": {
+            route: summarize(samples, recorder.statuses[route], elapsed)
+            for route, samples in recorder.latencies.items()
+        },
+    }
+    print_report(report)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    click.echo(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,53 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+from anyio import to_thread
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
-from database import get_db, create_tables
+from database import DB_MAX_OVERFLOW, DB_POOL_SIZE, SessionLocal, get_db, create_tables
 from routes import auth, auctions, customers, managers
+import metrics
+from query_budget import MODE_OFF, QUERY_BUDGET_MODE, QueryBudgetMiddleware, query_budget
+from request_metrics import RequestMetricsMiddleware
+from responses import FastJSONResponse
+from services.import_jobs import import_jobs
+from services.price_book import price_book
+from services.pubsub import auction_broker
+from services.scheduler import auction_closer
+
+# Route handlers are plain functions that FastAPI runs in this threadpool, so
+# blocking SQLAlchemy calls never stall the event loop. Sized to the DB pool by default.
+THREADPOOL_SIZE = int(os.getenv("AUCTION_THREADPOOL_SIZE", str(DB_POOL_SIZE + DB_MAX_OVERFLOW)))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    # Here rather than at import: spawned import workers re-import this module
+    create_tables()
+    # Seed the in-memory price book so live price reads stay off SQLite
+    db = SessionLocal()
+    try:
+        price_book.seed(db)
+    finally:
+        db.close()
+    # Close auctions as they end instead of lazily inside GET handlers
+    auction_closer.start()
+    # Live auction streams fan out on this loop; publishers may be on any thread
+    auction_broker.bind(asyncio.get_running_loop())
+    yield
+    import_jobs.shutdown()
+    auction_closer.stop()
+    auction_broker.bind(None)
 
-app = FastAPI(title="Auction House API", version="1.0.0")
+app = FastAPI(
+    title="Auction House API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,8 +57,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create database tables
-create_tables()
+# Added last so it wraps CORS too: per-route latency, status and SQL accounting
+app.add_middleware(RequestMetricsMiddleware)
+
+# Per-route SQL statement budgets (see query_budget.py); off unless AUCTION_QUERY_BUDGET is set
+if QUERY_BUDGET_MODE != MODE_OFF:
+    app.add_middleware(QueryBudgetMiddleware)
 
 # Include routers
 app.include_router(auth.router, prefix="/auth", tags=["authentication"])
@@ -24,13 +71,20 @@ app.include_router(customers.router, prefix="/customers", tags=["customers"])
 app.include_router(managers.router, prefix="/managers", tags=["managers"])
 
 @app.get("/")
+@query_budget(0)
 async def root():
     return {"message": "Auction House API"}
 
 @app.get("/health")
+@query_budget(0)
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+@query_budget(0)
+async def metrics_endpoint():
+    return metrics.render()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,127 @@
+"""In-process metrics registry, rendered in Prometheus text format at /metrics."""
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+# Sorted (name, value) pairs identifying one series of a metric
+Labels = Tuple[Tuple[str, str], ...]
+
+_lock = threading.Lock()
+_counters: Dict[Tuple[str, Labels], float] = defaultdict(float)
+_help: Dict[str, str] = {}
+_gauges: Dict[str, Callable[[], float]] = {}
+_buckets: Dict[str, Tuple[float, ...]] = {}
+_histograms: Dict[Tuple[str, Labels], "_Histogram"] = {}
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, size: int):
+        self.counts: List[int] = [0] * size  # per bucket, not cumulative; last is +Inf
+        self.sum = 0.0
+
+
+def _labels(labels: Optional[Mapping[str, str]]) -> Labels:
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+def describe(name: str, help_text: str, labeled: bool = False) -> None:
+    """
+    Register a counter. Unlabeled counters are exported (as 0) before their first
+    increment; labeled ones appear with each label set's first increment.
+    """
+    with _lock:
+        _help[name] = help_text
+        if not labeled:
+            _counters[(name, ())] += 0
+
+
+def describe_gauge(name: str, help_text: str, read: Callable[[], float]) -> None:
+    """Register a gauge whose value is read from `read()` at scrape time."""
+    with _lock:
+        _help[name] = help_text
+        _gauges[name] = read
+
+
+def describe_histogram(name: str, help_text: str, buckets: Sequence[float]) -> None:
+    """Register a histogram with the given upper bounds (a +Inf bucket is implied)."""
+    with _lock:
+        _help[name] = help_text
+        _buckets[name] = tuple(sorted(buckets))
+
+
+def inc(name: str, amount: float = 1.0, labels: Optional[Mapping[str, str]] = None) -> None:
+    key = (name, _labels(labels))
+    with _lock:
+        _counters[key] += amount
+
+
+def observe(name: str, value: float, labels: Optional[Mapping[str, str]] = None) -> None:
+    """Record one observation in a histogram registered with describe_histogram()."""
+    buckets = _buckets[name]
+    key = (name, _labels(labels))
+    index = bisect_left(buckets, value)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = _Histogram(len(buckets) + 1)
+        histogram.counts[index] += 1
+        histogram.sum += value
+
+
+def get(name: str, labels: Optional[Mapping[str, str]] = None) -> float:
+    return _counters.get((name, _labels(labels)), 0.0)
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _header(lines: List[str], name: str, kind: str, help_texts: Dict[str, str]) -> None:
+    if name in help_texts:
+        lines.append(f"# HELP {name} {help_texts[name]}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def render() -> str:
+    with _lock:
+        counters = sorted(_counters.items())
+        gauges = sorted(_gauges.items())
+        histograms = sorted((key, list(h.counts), h.sum) for key, h in _histograms.items())
+        buckets = dict(_buckets)
+        help_texts = dict(_help)
+    lines = []
+    previous = None
+    for (name, labels), value in counters:
+        if name != previous:
+            _header(lines, name, "counter", help_texts)
+            previous = name
+        lines.append(f"{name}{_label_text(labels)} {_format(value)}")
+    for name, read in gauges:
+        _header(lines, name, "gauge", help_texts)
+        lines.append(f"{name} {_format(read())}")
+    previous = None
+    for (name, labels), counts, total in histograms:
+        if name != previous:
+            _header(lines, name, "histogram", help_texts)
+            previous = name
+        cumulative = 0
+        for bound, count in zip(buckets[name] + (float("inf"),), counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else _format(bound)
+            lines.append(f"{name}_bucket{_label_text(labels + (('le', le),))} {cumulative}")
+        lines.append(f"{name}_sum{_label_text(labels)} {_format(total)}")
+        lines.append(f"{name}_count{_label_text(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,58 @@
+"""Keyset (cursor) pagination for auction lists, ordered by (created_at, id) descending."""
+import base64
+import binascii
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query as OrmQuery
+
+from database import Auction
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(created_at: datetime, auction_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{auction_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, auction_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(auction_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+class PageParams:
+    """Query parameters shared by every paginated auction list."""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    ):
+        self.after = decode_cursor(cursor) if cursor else None
+        self.limit = limit
+
+
+def paginate_auctions(query: OrmQuery, page: PageParams) -> Tuple[List[Auction], Optional[str]]:
+    """
+    Apply keyset ordering/limit to an Auction query.
+    Returns (auctions, next_cursor); next_cursor is None on the last page.
+    Backed by the ix_auctions_created_at_id index, so cost does not grow with page depth.
+    """
+    query = query.order_by(Auction.created_at.desc(), Auction.id.desc())
+    if page.after is not None:
+        query = query.filter(tuple_(Auction.created_at, Auction.id) < tuple_(*page.after))
+    auctions = query.limit(page.limit + 1).all()
+    next_cursor = None
+    if len(auctions) > page.limit:
+        auctions = auctions[:page.limit]
+        last = auctions[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return auctions, next_cursor
@@ -1,48 +1,72 @@
 #!/usr/bin/env python3
 """
-Populate auction house database with realistic dummy data
-Bids table will remain empty for fresh auction start
+Populate auction house database with realistic dummy data.
+
+By default only the hand-written sample (known logins, a few auctions, no bids)
+is loaded. Options add a seeded, generated dataset on top, bulk-inserted, e.g.
+
+    python populate_data.py --customers 100000 --auctions 50000 --items-per-auction 10 --bids-per-item 5
+
+The same seed and options always produce the same rows.
 """
 
 import sys
 import os
+import time
+from collections import defaultdict
 from datetime import datetime, timedelta
 from decimal import Decimal
 import random
 
+import click
+from sqlalchemy import func, insert, select, text
+
 # Add the API directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from database import SessionLocal, User, Auction, AuctionItem, Bid
+from database import Base, SessionLocal, User, Auction, AuctionItem, Bid, create_tables, engine
+
+# Rows per executemany; each batch is committed on its own
+DEFAULT_BATCH_SIZE = 50_000
+
+FIRST_NAMES = ["Alex", "Jordan", "Sam", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn"]
+LAST_NAMES = ["Reed", "Patel", "Kim", "Garcia", "Novak", "Okafor", "Rossi", "Larsen", "Haddad", "Silva"]
+AUCTION_THEMES = ["Modern Art", "Vintage Photography", "Timepieces", "Antiques", "Sculpture", "Rare Books", "Jewelry", "Ceramics"]
+ITEM_KINDS = ["Canvas", "Print", "Watch", "Desk", "Bronze", "First Edition", "Ring", "Vase", "Clock", "Lithograph"]
 
-def populate_database():
-    """Populate database with realistic auction house data"""
+def populate_database(sample=True, now=None, **generated):
+    """
+    Populate database with the sample data and, if asked, a generated dataset (see generate_data).
+    Dates are relative to `now` (UTC, default the current time); pin it for a reproducible database.
+    """
+    now = now or datetime.utcnow()
+    customers = []
+    create_tables()
+    truncate_tables()
+    print("🧹 Cleared existing data...")
+    
     db = SessionLocal()
     
     try:
-        # Clear existing data
-        db.query(Bid).delete()
-        db.query(AuctionItem).delete()
-        db.query(Auction).delete()
-        db.query(User).delete()
-        db.commit()
-        
-        print("🧹 Cleared existing data...")
+        if sample:
+            # Create Users
+            managers = create_managers(db)
+            customers = create_customers(db)
+            print(f"👥 Created {len(managers)} managers and {len(customers)} customers")
+            
+            # Create Auctions
+            active_auctions, ended_auctions = create_auctions(db, managers, now)
+            print(f"🎪 Created {len(active_auctions)} active and {len(ended_auctions)} ended auctions")
+            
+            # Create Auction Items
+            create_auction_items(db, active_auctions, ended_auctions)
+            print(f"🎯 Created sample auction items (no bids)")
+            
+            db.commit()
         
-        # Create Users
-        managers = create_managers(db)
-        customers = create_customers(db)
-        print(f"👥 Created {len(managers)} managers and {len(customers)} customers")
+        if generated.get("managers") or generated.get("customers") or generated.get("auctions"):
+            generate_data(now=now, **generated)
         
-        # Create Auctions
-        active_auctions, ended_auctions = create_auctions(db, managers)
-        print(f"🎪 Created {len(active_auctions)} active and {len(ended_auctions)} ended auctions")
-        
-        # Create Auction Items
-        create_auction_items(db, active_auctions, ended_auctions)
-        print(f"🎯 Created auction items (bids table kept empty)")
-        
-        db.commit()
         print("✅ Database populated successfully with realistic data!")
         
         # Print summary
@@ -125,9 +149,8 @@ def create_customers(db):
     db.commit()
     return customers
 
-def create_auctions(db, managers):
-    """Create auctions"""
-    now = datetime.utcnow()
+def create_auctions(db, managers, now):
+    """Create auctions, dated relative to `now`"""
     
     # Active auctions
     active_auctions_data = [
@@ -282,6 +305,151 @@ def create_auction_items(db, active_auctions, ended_auctions):
     
     db.commit()
 
+def truncate_tables():
+    """
+    Empty every table in one transaction, children first. A DELETE without WHERE
+    lets SQLite drop whole tables instead of deleting row by row.
+    """
+    tables = list(reversed(Base.metadata.sorted_tables))
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text(f"TRUNCATE TABLE {', '.join(table.name for table in tables)} RESTART IDENTITY"))
+        else:
+            for table in tables:
+                conn.execute(table.delete())
+
+class BulkWriter:
+    """
+    Buffers rows per table and writes each full buffer with one executemany, in
+    its own transaction. Parent tables are always flushed before their children.
+    """
+    
+    def __init__(self, conn, batch_size):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.order = [table.name for table in Base.metadata.sorted_tables]
+        self.buffers = defaultdict(list)
+        self.written = defaultdict(int)
+        self.started = time.monotonic()
+    
+    def add(self, table, row):
+        buffer = self.buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush(table)
+    
+    def flush(self, upto=None):
+        """Write buffered rows for `upto` and every table it may reference (all tables if None)"""
+        last = self.order.index(upto.name) if upto is not None else len(self.order) - 1
+        for table in sorted(self.buffers, key=lambda t: self.order.index(t.name)):
+            if self.order.index(table.name) > last or not self.buffers[table]:
+                continue
+            rows = self.buffers[table]
+            self.buffers[table] = []
+            self.conn.execute(insert(table), rows)
+            self.conn.commit()
+            self.written[table.name] += len(rows)
+        self._progress()
+    
+    def _progress(self):
+        counts = ", ".join(f"{name}: {count:,}" for name, count in self.written.items())
+        print(f"\r   ⏳ {counts} ({time.monotonic() - self.started:.0f}s)", end="", flush=True)
+
+def _cents(value):
+    return Decimal(value) / 100
+
+def generate_data(managers=0, customers=0, auctions=0, items_per_auction=8, bids_per_item=0,
+                  ended_ratio=0.3, hot_skew=1.5, seed=42, batch_size=DEFAULT_BATCH_SIZE, now=None):
+    """
+    Bulk-insert a seeded dataset on top of whatever is already in the database.
+    
+    Each item's bid count is drawn from a Pareto distribution with shape `hot_skew`
+    (> 1; lower means a longer tail), scaled so the mean is `bids_per_item`: most
+    items get a few bids and a handful of hot items get very many. Bids rise from
+    the opening price, are spread over the auction's run, and leave the item's
+    current bid (and closing price, for ended auctions) consistent with them.
+    Together with `seed`, a fixed `now` (UTC) makes the dataset identical run to run.
+    """
+    rng = random.Random(seed)
+    now = (now or datetime.utcnow()).replace(microsecond=0)
+    pareto_mean = hot_skew / (hot_skew - 1)
+    
+    with engine.connect() as conn:
+        writer = BulkWriter(conn, batch_size)
+        users = User.__table__
+        for role, count in (("manager", managers), ("customer", customers)):
+            for n in range(count):
+                writer.add(users, {
+                    "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    "email": f"{role}{n}@generated.example.com",
+                    "password": f"generated_password_{role}_{n}",
+                    "role": role,
+                })
+        writer.flush(users)
+        manager_ids = conn.execute(select(User.id).where(User.role == "manager").order_by(User.id)).scalars().all()
+        customer_ids = conn.execute(select(User.id).where(User.role == "customer").order_by(User.id)).scalars().all()
+        if auctions and not manager_ids:
+            raise click.UsageError("Generating auctions needs at least one manager")
+        if auctions and bids_per_item and not customer_ids:
+            raise click.UsageError("Generating bids needs at least one customer")
+        
+        auction_id = (conn.execute(select(func.max(Auction.id))).scalar() or 0) + 1
+        item_id = (conn.execute(select(func.max(AuctionItem.id))).scalar() or 0) + 1
+        for n in range(auctions):
+            created_at = now - timedelta(seconds=rng.randint(3600, 90 * 86400))
+            if rng.random() < ended_ratio:
+                status = "ended"
+                ended_at = created_at + (now - created_at) * rng.uniform(0.2, 0.95)
+                bidding_ends = ended_at
+            else:
+                status = "active"
+                ended_at = None if rng.random() < 0.2 else now + timedelta(seconds=rng.randint(3600, 30 * 86400))
+                bidding_ends = now
+            writer.add(Auction.__table__, {
+                "id": auction_id,
+                "name": f"{rng.choice(AUCTION_THEMES)} Sale #{n + 1}",
+                "created_at": created_at,
+                "ended_at": ended_at,
+                "created_by": rng.choice(manager_ids),
+                "status": status,
+            })
+            for i in range(items_per_auction):
+                # Whole cents throughout; lognormal opening prices, median about $200
+                opening = max(100, int(rng.lognormvariate(10, 1.2)))
+                bid_count = 0
+                if bids_per_item:
+                    expected = bids_per_item * rng.paretovariate(hot_skew) / pareto_mean
+                    bid_count = int(expected + rng.random())
+                price, bidder, bids = opening, None, []
+                for offset in sorted(rng.random() for _ in range(bid_count)):
+                    if bidder is not None:
+                        # Increments scale with the opening price, so hot items stay plausible
+                        price += max(100, opening * rng.randint(1, 5) // 100)
+                    bidder = rng.choice(customer_ids)
+                    bids.append({
+                        "item_id": item_id,
+                        "bidder_id": bidder,
+                        "amount": _cents(price),
+                        "created_at": created_at + (bidding_ends - created_at) * offset,
+                    })
+                sold = bidder is not None
+                writer.add(AuctionItem.__table__, {
+                    "id": item_id,
+                    "name": f"{rng.choice(ITEM_KINDS)} {auction_id}-{i + 1}",
+                    "opening_price": _cents(opening),
+                    "auction_id": auction_id,
+                    "current_bid": _cents(price) if sold else Decimal("0"),
+                    "current_bidder_id": bidder,
+                    "closing_price": _cents(price) if sold and status == "ended" else Decimal("0"),
+                })
+                for bid in bids:
+                    writer.add(Bid.__table__, bid)
+                item_id += 1
+            auction_id += 1
+        writer.flush()
+        print()
+    print(f"🎲 Generated {dict(writer.written)} (seed {seed})")
+
 def print_database_summary(db):
     """Print summary of created data"""
     print("\n📊 Database Summary:")
@@ -292,7 +460,10 @@ def print_database_summary(db):
     print(f"   Active Auctions: {db.query(Auction).filter(Auction.status == 'active').count()}")
     print(f"   Ended Auctions: {db.query(Auction).filter(Auction.status == 'ended').count()}")
     print(f"   Auction Items: {db.query(AuctionItem).count()}")
-    print(f"   Bids: {db.query(Bid).count()} (intentionally empty)")
+    print(f"   Bids: {db.query(Bid).count()}")
+    
+    if db.query(Auction).count() > 10:
+        return
     
     print("\n🎪 Active Auctions:")
     active_auctions = db.query(Auction).filter(Auction.status == 'active').all()
@@ -306,5 +477,21 @@ def print_database_summary(db):
         item_count = db.query(AuctionItem).filter(AuctionItem.auction_id == auction.id).count()
         print(f"   - {auction.name} ({item_count} items)")
 
+@click.command()
+@click.option("--sample/--no-sample", default=True, show_default=True, help="Load the hand-written sample data.")
+@click.option("--managers", default=0, show_default=True, help="Managers to generate.")
+@click.option("--customers", default=0, show_default=True, help="Customers to generate.")
+@click.option("--auctions", default=0, show_default=True, help="Auctions to generate.")
+@click.option("--items-per-auction", default=8, show_default=True)
+@click.option("--bids-per-item", default=0.0, show_default=True, help="Mean bids per generated item.")
+@click.option("--ended-ratio", default=0.3, show_default=True, type=click.FloatRange(0, 1), help="Share of generated auctions already ended.")
+@click.option("--hot-skew", default=1.5, show_default=True, type=click.FloatRange(1, min_open=True), help="Pareto shape of bids per item; lower is more skewed.")
+@click.option("--seed", default=42, show_default=True)
+@click.option("--batch-size", default=DEFAULT_BATCH_SIZE, show_default=True, type=click.IntRange(1), help="Rows per executemany/commit.")
+@click.option("--now", type=click.DateTime(["%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"]), help="Reference time (UTC) every date is relative to; default the current time.")
+def main(sample, now, **generated):
+    """Reset the database and load sample and/or generated data"""
+    populate_database(sample, now, **generated)
+
 if __name__ == "__main__":
-    populate_database()
\ No newline at end of file
+    main()
\ No newline at end of file
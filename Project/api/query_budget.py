@@ -0,0 +1,178 @@
+"""
+Query budgets: catch N+1 patterns before production data makes them slow.
+
+A budget caps the SQL statements a unit of work may run and how often any one
+statement (same SQL text, any parameters) may repeat. Declare one on a route:
+
+    @router.get("/{auction_id}")
+    @query_budget(3)
+    def get_auction(...): ...
+
+and QueryBudgetMiddleware checks every request against its route's budget,
+counting dependencies and response serialization too. AUCTION_QUERY_BUDGET
+selects the mode: "off" (default; the middleware is not installed), "log"
+(staging: a warning with the stack of the offending statement) or "raise"
+(tests: QueryBudgetExceeded, which TestClient re-raises). Around any block,
+`with query_budget(5): ...` raises directly. When run_write_transaction retries
+a write after a lock error, only the attempt that commits is counted.
+"""
+import logging
+import os
+import sys
+import traceback
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+
+from database import engine, write_attempt_hooks
+
+logger = logging.getLogger(__name__)
+
+MODE_OFF = "off"
+MODE_LOG = "log"
+MODE_RAISE = "raise"
+QUERY_BUDGET_MODE = os.getenv("AUCTION_QUERY_BUDGET", MODE_OFF)
+
+# Budget for routes that do not declare one
+DEFAULT_MAX_QUERIES = int(os.getenv("AUCTION_QUERY_BUDGET_DEFAULT", "10"))
+
+# Not counted: transaction control and connection setup
+_IGNORED_PREFIXES = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE", "PRAGMA")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A unit of work ran more statements than its budget allows, or repeated one."""
+
+
+class QueryBudget:
+    """
+    At most max_queries statements, none run more than max_repeats times. Usable as
+    a context manager (checked on exit) or as a route decorator (checked per request
+    by QueryBudgetMiddleware).
+    """
+
+    def __init__(self, max_queries: int, max_repeats: int = 1, name: Optional[str] = None):
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self.name = name
+        self._trackers = []
+
+    def __call__(self, endpoint):
+        endpoint.query_budget = self
+        if self.name is None:
+            self.name = endpoint.__qualname__
+        return endpoint
+
+    def __enter__(self):
+        name = self.name
+        if name is None:
+            caller = sys._getframe(1)
+            name = f"{caller.f_code.co_name} ({caller.f_code.co_filename}:{caller.f_lineno})"
+        tracker = _Tracker(self, name=name)
+        self._trackers.append((tracker, _active.set(_active.get() + (tracker,))))
+        return tracker
+
+    def __exit__(self, exc_type, exc, tb):
+        tracker, token = self._trackers.pop()
+        _active.reset(token)
+        if exc_type is None:
+            tracker.report(MODE_RAISE)
+        return False
+
+
+query_budget = QueryBudget
+
+
+class _Tracker:
+    def __init__(self, budget: Optional[QueryBudget] = None, scope: Optional[dict] = None, name: Optional[str] = None):
+        self.budget = budget
+        self.scope = scope
+        self.name = name
+        self.queries = 0
+        self.counts: Dict[str, int] = {}
+        self.violation: Optional[str] = None
+        self.stack: Optional[str] = None
+        self._write_started = None
+
+    def _resolve_budget(self) -> QueryBudget:
+        # Routing has happened by the first statement, so the matched route is in the scope
+        route = self.scope.get("route")
+        budget = getattr(getattr(route, "endpoint", None), "query_budget", None)
+        if budget is None:
+            budget = QueryBudget(DEFAULT_MAX_QUERIES, name=getattr(route, "path", self.scope.get("path")))
+        return budget
+
+    def record(self, statement: str) -> None:
+        if statement.lstrip()[:9].upper().startswith(_IGNORED_PREFIXES):
+            return
+        if self.budget is None:
+            self.budget = self._resolve_budget()
+        self.queries += 1
+        repeats = self.counts[statement] = self.counts.get(statement, 0) + 1
+        if self.violation is not None:
+            return
+        if repeats > self.budget.max_repeats:
+            self.violation = f"statement run {repeats} times (limit {self.budget.max_repeats}): {statement.strip()[:300]}"
+        elif self.queries > self.budget.max_queries:
+            self.violation = f"statement {self.queries} exceeds the budget of {self.budget.max_queries}: {statement.strip()[:300]}"
+        else:
+            return
+        # Only captured on the first violation, so the happy path stays cheap
+        self.stack = "".join(traceback.format_stack()[:-3])
+
+    def begin_write_attempt(self, attempt: int) -> None:
+        # A retry re-runs the failed attempt's statements; forget that attempt instead of counting them twice
+        if attempt == 0:
+            self._write_started = (self.queries, dict(self.counts), self.violation, self.stack)
+        elif self._write_started is not None:
+            self.queries, counts, self.violation, self.stack = self._write_started
+            self.counts = dict(counts)
+
+    def report(self, mode: str) -> None:
+        if self.violation is None:
+            return
+        message = (
+            f"Query budget exceeded by {self.name or self.budget.name}: {self.queries} statements, {self.violation}"
+        )
+        if mode == MODE_RAISE:
+            raise QueryBudgetExceeded(f"{message}\nFirst offending statement issued from:\n{self.stack}")
+        logger.warning("%s\nFirst offending statement issued from:\n%s", message, self.stack)
+
+
+_active: ContextVar[Tuple[_Tracker, ...]] = ContextVar("query_budget_trackers", default=())
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    for tracker in _active.get():
+        tracker.record(statement)
+
+
+def _begin_write_attempt(attempt: int) -> None:
+    for tracker in _active.get():
+        tracker.begin_write_attempt(attempt)
+
+
+write_attempt_hooks.append(_begin_write_attempt)
+
+
+class QueryBudgetMiddleware:
+    """ASGI middleware checking each HTTP request against its route's declared QueryBudget."""
+
+    def __init__(self, app, mode: str = QUERY_BUDGET_MODE):
+        self.app = app
+        self.mode = mode
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        tracker = _Tracker(scope=scope)
+        token = _active.set(_active.get() + (tracker,))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _active.reset(token)
+            # Also when the handler raised, so a failing route cannot hide an overrun
+            tracker.report(self.mode)
@@ -0,0 +1,92 @@
+"""Per-request metrics: latency and status per route, and the SQL each request runs."""
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+import metrics
+from database import engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+DB_TIME_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+
+# Label for requests no route matched, so 404 scans don't create a series per path
+UNMATCHED_ROUTE = "unmatched"
+
+metrics.describe("http_requests_total", "HTTP requests by method, route and status", labeled=True)
+metrics.describe_histogram("http_request_duration_seconds", "HTTP request latency by route", LATENCY_BUCKETS)
+metrics.describe_histogram("http_request_db_queries", "SQL statements executed per HTTP request", QUERY_COUNT_BUCKETS)
+metrics.describe_histogram("http_request_db_seconds", "Time spent in SQL statements per HTTP request", DB_TIME_BUCKETS)
+
+
+class RequestStats:
+    """SQL activity of one request. Shared by the request's task and its threadpool calls."""
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _current_request.get()
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _start_query(conn, cursor, statement, parameters, context, executemany):
+    if _current_request.get() is not None:
+        conn.info["query_started"] = time.perf_counter()
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _end_query(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_request.get()
+    if stats is None:
+        return
+    started = conn.info.pop("query_started", None)
+    stats.queries += 1
+    if started is not None:
+        stats.db_seconds += time.perf_counter() - started
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware timing each HTTP request (through the last body chunk) and
+    recording it under its route template, e.g. /auctions/{auction_id}, together
+    with the statements and DB time the cursor hooks above attributed to it.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current_request.reset(token)
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            labels = {"method": scope["method"], "route": route}
+            metrics.inc("http_requests_total", labels={**labels, "status": str(status)})
+            metrics.observe("http_request_duration_seconds", elapsed, labels)
+            metrics.observe("http_request_db_queries", stats.queries, labels)
+            metrics.observe("http_request_db_seconds", stats.db_seconds, labels)
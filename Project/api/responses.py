@@ -0,0 +1,70 @@
+"""
+Fast JSON responses. Models are serialized straight to bytes by pydantic's
+compiled serializer (one validation, no jsonable_encoder pass); plain data is
+encoded with orjson when it is installed. Decimals are always written as strings.
+"""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib encoder
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    # Same encodings pydantic uses in JSON mode
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class: orjson (or stdlib) encoding of already-plain content."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def dump_json(response_type: Any, value: Any) -> bytes:
+    """Validate ORM objects (or plain data) as `response_type` and serialize them to JSON bytes."""
+    adapter = _adapter(response_type)
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+
+def model_response(
+    response_type: Any,
+    value: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Response for `value` as `response_type`, bypassing FastAPI's response_model pass."""
+    return Response(dump_json(response_type, value), status_code, headers, media_type="application/json")
+
+
+def json_response(model: BaseModel, etag: Optional[str] = None) -> Response:
+    """Response for an already-built model."""
+    headers = {"ETag": etag} if etag else None
+    return Response(to_json(model), media_type="application/json", headers=headers)
@@ -1,37 +1,76 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import asyncio
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
-from database import get_db, Auction, AuctionItem, Bid, User
-from schemas import AuctionResponse, AuctionDetailResponse, AuctionCreate, BidCreate, BidResponse
-from services.auction import ensure_auction_closed_if_ended
+from typing import List, Optional, Union
+from database import get_db, Auction
+from etags import auction_etag, is_fresh, not_modified
+from compact import render_auction, view_param
+from pagination import PageParams, paginate_auctions
+from responses import model_response
+from schemas import AuctionPage, CompactResponse, AuctionResponse, AuctionDetailResponse, AuctionCreate, BidCreate, BidResponse, ItemPriceResponse, ProxyBidCreate, ProxyBidResponse
+from services.auction import effective_status_filter
+from services.bidding import BidRejected, submit_bid, submit_proxy_bid
+from services.price_book import price_book
+from services.pubsub import auction_broker
+from services.response_cache import LISTS, auction_tag, cache_auction_page, request_key, response_cache, user_tag
+from services.scheduler import auction_closer
+from query_budget import query_budget
 import auth
 
 router = APIRouter()
 
-@router.get("/", response_model=List[AuctionResponse])
-async def get_auctions(
-    current_user: User = Depends(auth.get_current_user),
+# Comment line sent to idle streams so proxies keep the connection open
+STREAM_KEEPALIVE_SECONDS = 15
+
+@router.get("/", response_model=Union[AuctionPage, CompactResponse])
+@query_budget(2)
+def get_auctions(
+    request: Request,
+    current_user: auth.Principal = Depends(auth.get_current_user),
     db: Session = Depends(get_db),
     status_filter: Optional[str] = Query(None, alias="status"),
+    page: PageParams = Depends(),
+    view: str = Depends(view_param),
 ):
+    cached = response_cache.get(request_key(request))
+    if cached:
+        return cached.respond(request)
+    generation = response_cache.generation()
     query = (
         db.query(Auction)
         .options(joinedload(Auction.creator))
-        .order_by(Auction.created_at.desc())
     )
     if status_filter and status_filter in ("active", "ended", "cancelled"):
-        query = query.filter(Auction.status == status_filter)
-    auctions = query.all()
-    for a in auctions:
-        ensure_auction_closed_if_ended(db, a)
-    return auctions
+        query = query.filter(effective_status_filter(status_filter))
+    auctions, next_cursor = paginate_auctions(query, page)
+    return cache_auction_page(request, generation, auctions, next_cursor, view)
 
-@router.get("/{auction_id}", response_model=AuctionDetailResponse)
-async def get_auction(
+@router.get("/{auction_id}", response_model=Union[AuctionDetailResponse, CompactResponse])
+@query_budget(3)
+def get_auction(
     auction_id: int,
-    current_user: User = Depends(auth.get_current_user),
+    request: Request,
+    current_user: auth.Principal = Depends(auth.get_current_user),
     db: Session = Depends(get_db),
+    view: str = Depends(view_param),
 ):
+    cache_key = ("auction", auction_id, view)
+    cached = response_cache.get(cache_key)
+    if cached:
+        return cached.respond(request)
+    generation = response_cache.generation()
+    # Answer revalidations from the version row alone, before loading creator and items
+    current = db.execute(
+        select(Auction.version, Auction.effective_status).where(Auction.id == auction_id)
+    ).first()
+    if current is None:
+        raise HTTPException(status_code=404, detail="Auction not found")
+    etag = auction_etag(auction_id, current.version, current.effective_status, view)
+    if is_fresh(request, etag):
+        return not_modified(etag)
     auction = (
         db.query(Auction)
         .options(
@@ -43,69 +82,112 @@ async def get_auction(
     )
     if not auction:
         raise HTTPException(status_code=404, detail="Auction not found")
-    ensure_auction_closed_if_ended(db, auction)
-    return auction
+    entry = response_cache.put(
+        cache_key,
+        render_auction(auction, view, price_book.load_items(auction.id, auction.items)),
+        etag,
+        [auction_tag(auction_id), user_tag(auction.created_by)],
+        generation,
+    )
+    return entry.respond(request)
 
-@router.post("/{auction_id}/bids", response_model=BidResponse)
-async def place_bid(
+@router.get("/{auction_id}/prices", response_model=List[ItemPriceResponse])
+@query_budget(3)
+def get_auction_prices(
     auction_id: int,
-    body: BidCreate,
-    current_user: User = Depends(auth.get_current_customer),
+    current_user: auth.Principal = Depends(auth.get_current_user),
     db: Session = Depends(get_db),
 ):
-    auction = (
-        db.query(Auction)
-        .options(joinedload(Auction.items))
-        .filter(Auction.id == auction_id)
-        .first()
+    prices = price_book.get_auction(auction_id)
+    if prices is None:
+        if not db.query(Auction.id).filter(Auction.id == auction_id).first():
+            raise HTTPException(status_code=404, detail="Auction not found")
+        prices = price_book.load_auction(db, auction_id)
+    return model_response(List[ItemPriceResponse], prices)
+
+@router.get("/{auction_id}/stream")
+@query_budget(2)
+async def stream_auction(
+    auction_id: int,
+    since: Optional[int] = Query(None, ge=0, description="Replay events after this event id"),
+    last_event_id: Optional[str] = Header(None),
+    current_user: auth.Principal = Depends(auth.get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Server-sent events for one auction: `bid` on every accepted bid and `closed`
+    when it ends. Reconnecting clients resume from Last-Event-ID (or ?since=)
+    out of the recent backlog; event ids restart when the server does. If the
+    backlog cannot cover the gap the client is sent `reset` and should reload
+    the auction before applying further events.
+    """
+    exists = await run_in_threadpool(
+        lambda: db.query(Auction.id).filter(Auction.id == auction_id).first() is not None
     )
-    if not auction:
+    # Hand the connection back to the pool before the long-lived stream starts
+    await run_in_threadpool(db.close)
+    if not exists:
         raise HTTPException(status_code=404, detail="Auction not found")
-    ensure_auction_closed_if_ended(db, auction)
-    if auction.status != "active":
-        raise HTTPException(status_code=400, detail="Auction is not active")
-    item = db.query(AuctionItem).filter(
-        AuctionItem.id == body.item_id,
-        AuctionItem.auction_id == auction_id,
-    ).first()
-    if not item:
-        raise HTTPException(status_code=404, detail="Item not found in this auction")
-    if body.amount <= item.current_bid:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Bid must be greater than current bid ({item.current_bid})",
-        )
-    if body.amount < item.opening_price:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Bid must be at least opening price ({item.opening_price})",
-        )
-    item.current_bid = body.amount
-    item.current_bidder_id = current_user.id
-    db_bid = Bid(
-        item_id=body.item_id,
-        bidder_id=current_user.id,
-        amount=body.amount,
-    )
-    db.add(db_bid)
-    db.commit()
-    db.refresh(db_bid)
-    db.refresh(item)
-    bid = (
-        db.query(Bid)
-        .options(
-            joinedload(Bid.item).joinedload(AuctionItem.auction).joinedload(Auction.creator),
-            joinedload(Bid.bidder),
-        )
-        .filter(Bid.id == db_bid.id)
-        .first()
+    if since is None and last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    subscription = auction_broker.subscribe(auction_id, since)
+
+    async def events():
+        try:
+            while True:
+                try:
+                    event = await subscription.next(STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                except EOFError:
+                    # Fell too far behind; the client reconnects and replays from its last id
+                    yield b"event: evicted\ndata: {}\n\n"
+                    return
+                yield event.frame
+        finally:
+            auction_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    return bid
+
+@router.post("/{auction_id}/bids", response_model=BidResponse)
+@query_budget(9, max_repeats=2)
+def place_bid(
+    auction_id: int,
+    body: BidCreate,
+    current_user: auth.Principal = Depends(auth.get_current_customer),
+    db: Session = Depends(get_db),
+):
+    try:
+        bid = submit_bid(db, auction_id, body.item_id, current_user.id, body.amount)
+    except BidRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    return model_response(BidResponse, bid)
+
+@router.post("/{auction_id}/proxy-bids", response_model=ProxyBidResponse)
+@query_budget(12)
+def place_proxy_bid(
+    auction_id: int,
+    body: ProxyBidCreate,
+    current_user: auth.Principal = Depends(auth.get_current_customer),
+    db: Session = Depends(get_db),
+):
+    """Bid automatically on an item up to max_amount; sending a higher max raises it."""
+    try:
+        proxy = submit_proxy_bid(db, auction_id, body.item_id, current_user.id, body.max_amount)
+    except BidRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    return model_response(ProxyBidResponse, proxy)
 
 @router.post("/", response_model=AuctionResponse)
-async def create_auction(
+@query_budget(4)
+def create_auction(
     auction: AuctionCreate,
-    current_user: User = Depends(auth.get_current_manager),
+    current_user: auth.Principal = Depends(auth.get_current_manager),
     db: Session = Depends(get_db),
 ):
     db_auction = Auction(
@@ -117,22 +199,25 @@ async def create_auction(
     db.add(db_auction)
     db.commit()
     db.refresh(db_auction)
-    db_auction.creator = current_user
-    return db_auction
+    response_cache.invalidate(LISTS)
+    auction_closer.schedule(db_auction.ended_at)
+    return model_response(AuctionResponse, db_auction)
 
 @router.put("/{auction_id}", response_model=AuctionResponse)
-async def update_auction(
+@query_budget(1)
+def update_auction(
     auction_id: int,
-    current_user: User = Depends(auth.get_current_manager),
+    current_user: auth.Principal = Depends(auth.get_current_manager),
     db: Session = Depends(get_db),
 ):
     # Placeholder: Update auction details
     return {"id": auction_id, "name": "Updated Auction", "status": "active"}
 
 @router.post("/{auction_id}/end", response_model=AuctionResponse)
-async def end_auction(
+@query_budget(1)
+def end_auction(
     auction_id: int,
-    current_user: User = Depends(auth.get_current_manager),
+    current_user: auth.Principal = Depends(auth.get_current_manager),
     db: Session = Depends(get_db),
 ):
     # Placeholder: End auction and finalize sales
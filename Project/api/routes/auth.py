@@ -4,12 +4,14 @@ from sqlalchemy.orm import Session
 from datetime import timedelta
 from database import get_db, User
 from schemas import Token, UserCreate, UserResponse
+from query_budget import query_budget
 import auth
 
 router = APIRouter()
 
 @router.post("/register", response_model=UserResponse)
-async def register(user: UserCreate, db: Session = Depends(get_db)):
+@query_budget(3)
+def register(user: UserCreate, db: Session = Depends(get_db)):
     existing = db.query(User).filter(User.email == user.email).first()
     if existing:
         raise HTTPException(
@@ -29,7 +31,8 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
     return db_user
 
 @router.post("/login", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+@query_budget(1)
+def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     db_user = db.query(User).filter(User.email == form_data.username).first()
     if not db_user or not auth.verify_password(form_data.password, db_user.password):
         raise HTTPException(
@@ -44,6 +47,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=UserResponse)
-async def read_users_me(current_user: User = Depends(auth.get_current_user)):
+@query_budget(1)
+def read_users_me(current_user: auth.Principal = Depends(auth.get_current_user)):
     # Placeholder: Return current user info
     return current_user
\ No newline at end of file
@@ -1,77 +1,93 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
-from database import get_db, User, Auction, AuctionItem, Bid
-from schemas import BidResponse, AuctionResponse
-from services.auction import ensure_auction_closed_if_ended
+from typing import List, Optional, Union
+from database import get_db, Auction, AuctionItem, Bid
+from etags import is_fresh, not_modified, page_etag
+from compact import VIEW_COMPACT, compact_bids, render_page, view_param
+from pagination import PageParams, paginate_auctions
+from responses import json_response, model_response
+from schemas import AuctionPage, BatchBidRequest, BatchBidResponse, BatchBidResult, CompactResponse, BidResponse
+from services.auction import effective_status_filter
+from services.bidding import BID_BATCH_LIMIT, submit_bids
+from services.response_cache import cache_auction_page, request_key, response_cache
+from query_budget import query_budget
 import auth
 
 router = APIRouter()
 
-@router.get("/auctions/active", response_model=List[AuctionResponse])
-async def list_active_auctions(
-    current_user: User = Depends(auth.get_current_customer),
+@router.get("/auctions/active", response_model=Union[AuctionPage, CompactResponse])
+@query_budget(2)
+def list_active_auctions(
+    request: Request,
+    current_user: auth.Principal = Depends(auth.get_current_customer),
     db: Session = Depends(get_db),
+    page: PageParams = Depends(),
+    view: str = Depends(view_param),
 ):
+    cached = response_cache.get(request_key(request))
+    if cached:
+        return cached.respond(request)
+    generation = response_cache.generation()
     query = (
         db.query(Auction)
         .options(joinedload(Auction.creator))
-        .filter(Auction.status == "active")
-        .order_by(Auction.created_at.desc())
+        .filter(effective_status_filter("active"))
     )
-    auctions = query.all()
-    for a in auctions:
-        ensure_auction_closed_if_ended(db, a)
-    return [a for a in auctions if a.status == "active"]
+    auctions, next_cursor = paginate_auctions(query, page)
+    return cache_auction_page(request, generation, auctions, next_cursor, view)
 
-@router.get("/auctions/mine", response_model=List[AuctionResponse])
-async def get_my_auctions(
-    current_user: User = Depends(auth.get_current_customer),
+@router.get("/auctions/mine", response_model=Union[AuctionPage, CompactResponse])
+@query_budget(2)
+def get_my_auctions(
+    request: Request,
+    current_user: auth.Principal = Depends(auth.get_current_customer),
     db: Session = Depends(get_db),
+    page: PageParams = Depends(),
+    view: str = Depends(view_param),
 ):
-    subq = db.query(Bid.item_id).filter(Bid.bidder_id == current_user.id).distinct()
-    auction_ids = (
-        db.query(AuctionItem.auction_id)
-        .filter(AuctionItem.id.in_(subq))
-        .distinct()
-        .all()
-    )
-    aid_list = [r[0] for r in auction_ids]
-    if not aid_list:
-        return []
+    bid_items = select(Bid.item_id).where(Bid.bidder_id == current_user.id)
+    bid_auctions = select(AuctionItem.auction_id).where(AuctionItem.id.in_(bid_items))
     query = (
         db.query(Auction)
         .options(joinedload(Auction.creator))
-        .filter(Auction.id.in_(aid_list))
-        .order_by(Auction.created_at.desc())
+        .filter(Auction.id.in_(bid_auctions))
     )
-    auctions = query.all()
-    for a in auctions:
-        ensure_auction_closed_if_ended(db, a)
-    return auctions
+    auctions, next_cursor = paginate_auctions(query, page)
+    etag = page_etag(auctions, next_cursor, view)
+    if is_fresh(request, etag):
+        return not_modified(etag)
+    return json_response(render_page(auctions, next_cursor, view), etag)
 
-@router.get("/auctions", response_model=List[AuctionResponse])
-async def get_auctions(
-    current_user: User = Depends(auth.get_current_customer),
+@router.get("/auctions", response_model=Union[AuctionPage, CompactResponse])
+@query_budget(2)
+def get_auctions(
+    request: Request,
+    current_user: auth.Principal = Depends(auth.get_current_customer),
     db: Session = Depends(get_db),
     status_filter: Optional[str] = Query(None, alias="status"),
+    page: PageParams = Depends(),
+    view: str = Depends(view_param),
 ):
+    cached = response_cache.get(request_key(request))
+    if cached:
+        return cached.respond(request)
+    generation = response_cache.generation()
     query = (
         db.query(Auction)
         .options(joinedload(Auction.creator))
-        .order_by(Auction.created_at.desc())
     )
     if status_filter and status_filter in ("active", "ended", "cancelled"):
-        query = query.filter(Auction.status == status_filter)
-    auctions = query.all()
-    for a in auctions:
-        ensure_auction_closed_if_ended(db, a)
-    return auctions
+        query = query.filter(effective_status_filter(status_filter))
+    auctions, next_cursor = paginate_auctions(query, page)
+    return cache_auction_page(request, generation, auctions, next_cursor, view)
 
-@router.get("/bids", response_model=List[BidResponse])
-async def get_user_bids(
-    current_user: User = Depends(auth.get_current_customer),
+@router.get("/bids", response_model=Union[List[BidResponse], CompactResponse])
+@query_budget(2)
+def get_user_bids(
+    current_user: auth.Principal = Depends(auth.get_current_customer),
     db: Session = Depends(get_db),
+    view: str = Depends(view_param),
 ):
     bids = (
         db.query(Bid)
@@ -83,4 +99,31 @@ async def get_user_bids(
         .order_by(Bid.created_at.desc())
         .all()
     )
-    return bids
\ No newline at end of file
+    if view == VIEW_COMPACT:
+        return json_response(compact_bids(bids))
+    return model_response(List[BidResponse], bids)
+
+@router.post("/bids/batch", response_model=BatchBidResponse)
+@query_budget(7)
+def place_bids(
+    body: BatchBidRequest,
+    current_user: auth.Principal = Depends(auth.get_current_customer),
+    db: Session = Depends(get_db),
+):
+    if len(body.bids) > BID_BATCH_LIMIT:
+        raise HTTPException(status_code=400, detail=f"At most {BID_BATCH_LIMIT} bids per batch")
+    outcomes = submit_bids(db, current_user.id, [(bid.auction_id, bid.item_id, bid.amount) for bid in body.bids])
+    results = [
+        BatchBidResult(
+            auction_id=outcome.auction_id,
+            item_id=outcome.item_id,
+            amount=outcome.amount,
+            accepted=outcome.accepted,
+            bid_id=outcome.bid_id,
+            reason=outcome.rejection.reason if outcome.rejection else None,
+            detail=outcome.rejection.detail if outcome.rejection else None,
+        )
+        for outcome in outcomes
+    ]
+    accepted = sum(result.accepted for result in results)
+    return json_response(BatchBidResponse(accepted=accepted, rejected=len(results) - accepted, results=results))
@@ -1,75 +1,88 @@
 import csv
 import io
+import shutil
+import tempfile
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, File, Query, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
-from typing import List, Optional
+from typing import List, Optional, Union
 
-from database import get_db, User, Auction, AuctionItem, Bid
-from schemas import AuctionResponse, AuctionCreate, AuctionItemCreate, AuctionItemResponse, AuctionImportResult
-from services.auction import ensure_auction_closed_if_ended, parse_auctions_csv
+from database import SessionLocal, get_db, Auction
+from compact import view_param
+from pagination import PageParams, paginate_auctions
+from schemas import AuctionPage, CompactResponse, AuctionResponse, AuctionCreate, AuctionItemCreate, AuctionItemResponse, ImportJobResponse, PriceBookCheckResult
+from services.auction import auction_stats_query, effective_status_filter
+from services.import_jobs import ImportsClosed, import_jobs
+from services.importer import IMPORT_BATCH_SIZE
+from services.price_book import price_book
+from services.response_cache import cache_auction_page, request_key, response_cache
+from query_budget import query_budget
 import auth
 
 router = APIRouter()
 
-@router.get("/auctions", response_model=List[AuctionResponse])
-async def get_auctions(
-    current_user: User = Depends(auth.get_current_manager),
+# Rows fetched from the cursor and written to the CSV stream at a time
+EXPORT_CHUNK_ROWS = 1000
+# Bytes copied at a time when spooling an upload for an import job
+IMPORT_COPY_CHUNK_BYTES = 1024 * 1024
+
+@router.get("/auctions", response_model=Union[AuctionPage, CompactResponse])
+@query_budget(3)
+def get_auctions(
+    request: Request,
+    current_user: auth.Principal = Depends(auth.get_current_manager),
     db: Session = Depends(get_db),
     status_filter: Optional[str] = Query(None, alias="status"),
+    page: PageParams = Depends(),
+    view: str = Depends(view_param),
 ):
+    cached = response_cache.get(request_key(request))
+    if cached:
+        return cached.respond(request)
+    generation = response_cache.generation()
     query = (
         db.query(Auction)
         .options(joinedload(Auction.creator))
-        .order_by(Auction.created_at.desc())
     )
     if status_filter and status_filter in ("active", "ended", "cancelled"):
-        query = query.filter(Auction.status == status_filter)
-    auctions = query.all()
-    for a in auctions:
-        ensure_auction_closed_if_ended(db, a)
-    return auctions
+        query = query.filter(effective_status_filter(status_filter))
+    auctions, next_cursor = paginate_auctions(query, page)
+    return cache_auction_page(request, generation, auctions, next_cursor, view)
 
 @router.get("/auctions/export")
-async def export_auctions_csv(
-    current_user: User = Depends(auth.get_current_manager),
-    db: Session = Depends(get_db),
+@query_budget(2)
+def export_auctions_csv(
+    current_user: auth.Principal = Depends(auth.get_current_manager),
 ):
-    query = (
-        db.query(Auction)
-        .options(joinedload(Auction.items))
-        .order_by(Auction.id)
-    )
-    auctions = query.all()
-    for a in auctions:
-        ensure_auction_closed_if_ended(db, a)
-
     def row_gen():
-        buffer = io.StringIO()
-        writer = csv.writer(buffer)
-        writer.writerow(["auction_id", "name", "status", "ended_at", "item_count", "total_bids", "revenue"])
-        yield buffer.getvalue()
-        for a in auctions:
+        # The response outlives the request's session, so the export owns its own.
+        db = SessionLocal()
+        try:
             buffer = io.StringIO()
             writer = csv.writer(buffer)
-            item_count = len(a.items)
-            total_bids = db.query(func.count(Bid.id)).join(AuctionItem).filter(AuctionItem.auction_id == a.id).scalar() or 0
-            revenue = sum(
-                (item.closing_price if a.status == "ended" else item.current_bid) for item in a.items
-            ) if a.items else Decimal("0")
-            writer.writerow([
-                a.id,
-                a.name,
-                a.status,
-                a.ended_at.isoformat() if a.ended_at else "",
-                item_count,
-                total_bids,
-                str(revenue),
-            ])
+            writer.writerow(["auction_id", "name", "status", "ended_at", "item_count", "total_bids", "revenue"])
             yield buffer.getvalue()
+            result = db.execute(auction_stats_query().execution_options(yield_per=EXPORT_CHUNK_ROWS))
+            for rows in result.partitions():
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerows(
+                    (
+                        row.id,
+                        row.name,
+                        row.status,
+                        row.ended_at.isoformat() if row.ended_at else "",
+                        row.item_count,
+                        row.total_bids,
+                        str(row.revenue if row.revenue is not None else Decimal("0")),
+                    )
+                    for row in rows
+                )
+                yield buffer.getvalue()
+        finally:
+            db.close()
 
     return StreamingResponse(
         row_gen(),
@@ -77,67 +90,72 @@ async def export_auctions_csv(
         headers={"Content-Disposition": "attachment; filename=auction_stats.csv"},
     )
 
-@router.post("/auctions/import", response_model=AuctionImportResult)
-async def import_auctions_csv(
-    current_user: User = Depends(auth.get_current_manager),
-    db: Session = Depends(get_db),
+@router.post("/auctions/import", response_model=ImportJobResponse, status_code=202)
+@query_budget(1)
+def import_auctions_csv(
+    current_user: auth.Principal = Depends(auth.get_current_manager),
     file: UploadFile = File(...),
+    batch_size: int = Query(IMPORT_BATCH_SIZE, ge=1, le=10000),
 ):
-    content = (await file.read()).decode("utf-8", errors="replace")
-    rows = parse_auctions_csv(content)
-    created = 0
-    errors = []
-    for idx, (name, ended_at, items) in enumerate(rows):
-        if not name:
-            errors.append(f"Row {idx + 2}: missing name")
-            continue
-        if ended_at is None:
-            errors.append(f"Row {idx + 2}: invalid or missing ended_at")
-            continue
-        if not items:
-            errors.append(f"Row {idx + 2}: at least one item required")
-            continue
-        try:
-            auction = Auction(
-                name=name,
-                ended_at=ended_at,
-                created_by=current_user.id,
-                status="active",
-            )
-            db.add(auction)
-            db.flush()
-            for item_name, opening_price in items:
-                db.add(
-                    AuctionItem(
-                        name=item_name,
-                        opening_price=opening_price,
-                        closing_price=Decimal("0"),
-                        auction_id=auction.id,
-                    )
-                )
-            db.commit()
-            created += 1
-        except Exception as e:
-            db.rollback()
-            errors.append(f"Row {idx + 2}: {e!s}")
-    return AuctionImportResult(created=created, errors=errors)
+    # The upload is gone once the request ends, so the job works from its own copy
+    with tempfile.NamedTemporaryFile(prefix="auction-import-", suffix=".csv", delete=False) as dest:
+        shutil.copyfileobj(file.file, dest, IMPORT_COPY_CHUNK_BYTES)
+    try:
+        return import_jobs.submit(dest.name, current_user.id, batch_size)
+    except ImportsClosed:
+        raise HTTPException(status_code=503, detail="Server is shutting down")
+
+@router.get("/imports/{job_id}", response_model=ImportJobResponse)
+@query_budget(1)
+def get_import_job(
+    job_id: str,
+    current_user: auth.Principal = Depends(auth.get_current_manager),
+):
+    job = import_jobs.get(job_id, current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
+@router.post("/imports/{job_id}/cancel", response_model=ImportJobResponse)
+@query_budget(1)
+def cancel_import_job(
+    job_id: str,
+    current_user: auth.Principal = Depends(auth.get_current_manager),
+):
+    job = import_jobs.cancel(job_id, current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
+@router.get("/price-book/check", response_model=PriceBookCheckResult)
+@query_budget(2)
+def check_price_book(
+    current_user: auth.Principal = Depends(auth.get_current_manager),
+    db: Session = Depends(get_db),
+):
+    mismatches = price_book.check_consistency(db)
+    return PriceBookCheckResult(items_checked=len(price_book), mismatches=mismatches)
 
 @router.post("/auctions", response_model=AuctionResponse)
-async def create_auction(auction: AuctionCreate, current_user: User = Depends(auth.get_current_manager), db: Session = Depends(get_db)):
+@query_budget(1)
+def create_auction(auction: AuctionCreate, current_user: auth.Principal = Depends(auth.get_current_manager), db: Session = Depends(get_db)):
     # Placeholder: Create new auction
     return {"id": 1, "name": auction.name, "status": "active", "created_by": current_user.id}
 
 @router.put("/auctions/{auction_id}", response_model=AuctionResponse)
-async def update_auction(auction_id: int, current_user: User = Depends(auth.get_current_manager), db: Session = Depends(get_db)):
+@query_budget(1)
+def update_auction(auction_id: int, current_user: auth.Principal = Depends(auth.get_current_manager), db: Session = Depends(get_db)):
     # Placeholder: Update auction details
     return {"id": auction_id, "name": "Updated Auction", "status": "active"}
 
 @router.post("/auctions/{auction_id}/items", response_model=AuctionItemResponse)
-async def add_item_to_auction(auction_id: int, item: AuctionItemCreate, current_user: User = Depends(auth.get_current_manager), db: Session = Depends(get_db)):
+@query_budget(1)
+def add_item_to_auction(auction_id: int, item: AuctionItemCreate, current_user: auth.Principal = Depends(auth.get_current_manager), db: Session = Depends(get_db)):
     # Placeholder: Add item to auction
     return {"id": 1, "name": item.name, "auction_id": auction_id, "opening_price": item.opening_price}
 
 @router.post("/auctions/{auction_id}/end", response_model=AuctionResponse)
-async def end_auction(auction_id: int, current_user: User = Depends(auth.get_current_manager), db: Session = Depends(get_db)):
+@query_budget(1)
+def end_auction(auction_id: int, current_user: auth.Principal = Depends(auth.get_current_manager), db: Session = Depends(get_db)):
     # Placeholder: End auction and process results
     return {"id": auction_id, "name": "Ended Auction", "status": "ended"}
\ No newline at end of file
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from pydantic import AliasChoices, BaseModel, EmailStr, Field
+from typing import Dict, Optional, List
 from datetime import datetime
 from decimal import Decimal
 
@@ -27,6 +27,7 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     email: Optional[str] = None
+    exp: Optional[int] = None
 
 class AuctionBase(BaseModel):
     name: str
@@ -44,12 +45,17 @@ class AuctionResponse(AuctionBase):
     id: int
     created_at: datetime
     created_by: int
-    status: str
+    # Read from Auction.effective_status so ended-but-not-yet-closed auctions report 'ended'
+    status: str = Field(validation_alias=AliasChoices("effective_status", "status"))
     creator: UserResponse
     
     class Config:
         from_attributes = True
 
+class AuctionPage(BaseModel):
+    items: List[AuctionResponse]
+    next_cursor: Optional[str] = None
+
 class AuctionItemBase(BaseModel):
     name: str
     opening_price: Decimal
@@ -92,10 +98,109 @@ class BidResponse(BidBase):
     class Config:
         from_attributes = True
 
+class BatchBidCreate(BidBase):
+    auction_id: int
+
+class BatchBidRequest(BaseModel):
+    bids: List[BatchBidCreate] = Field(min_length=1)
+
+class BatchBidResult(BaseModel):
+    auction_id: int
+    item_id: int
+    amount: Decimal
+    accepted: bool
+    bid_id: Optional[int] = None
+    reason: Optional[str] = None  # rule identifier when rejected
+    detail: Optional[str] = None
+
+class BatchBidResponse(BaseModel):
+    accepted: int
+    rejected: int
+    results: List[BatchBidResult]  # one per submitted bid, in order
+
+class ProxyBidCreate(BaseModel):
+    item_id: int
+    max_amount: Decimal
+
+class ProxyBidResponse(ProxyBidCreate):
+    id: int
+    bidder_id: int
+    placed_at: datetime
+    leading: bool
+    item: AuctionItemResponse  # price and leader after the engine ran
+    
+    class Config:
+        from_attributes = True
+
 class AuctionDetailResponse(AuctionResponse):
     items: List[AuctionItemResponse]
 
+# Compact view (?view=compact): nested objects are replaced by their ids and
+# side-loaded once each in CompactResponse's maps
+
+class CompactAuction(AuctionBase):
+    id: int
+    created_at: datetime
+    created_by: int
+    status: str = Field(validation_alias=AliasChoices("effective_status", "status"))
+    
+    class Config:
+        from_attributes = True
+
+class CompactItem(AuctionItemBase):
+    id: int
+    current_bid: Decimal
+    current_bidder_id: Optional[int]
+    
+    class Config:
+        from_attributes = True
+
+class CompactBid(BidBase):
+    id: int
+    bidder_id: int
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class CompactResponse(BaseModel):
+    ids: List[int]  # the auctions or bids requested, in order
+    auctions: Dict[int, CompactAuction] = {}
+    items: Dict[int, CompactItem] = {}
+    bids: Dict[int, CompactBid] = {}
+    users: Dict[int, UserResponse] = {}
+    next_cursor: Optional[str] = None
+
+class ItemPriceResponse(BaseModel):
+    item_id: int
+    auction_id: int
+    current_bid: Decimal
+    current_bidder_id: Optional[int]
+
+    class Config:
+        from_attributes = True
+
+class PriceMismatch(BaseModel):
+    item_id: int
+    book_bid: Optional[Decimal]
+    book_bidder_id: Optional[int]
+    db_bid: Optional[Decimal]
+    db_bidder_id: Optional[int]
+
+class PriceBookCheckResult(BaseModel):
+    items_checked: int
+    mismatches: List[PriceMismatch]
+
 
 class AuctionImportResult(BaseModel):
     created: int
-    errors: List[str]
\ No newline at end of file
+    errors: List[str]
+
+class ImportJobResponse(AuctionImportResult):
+    id: str
+    status: str  # 'queued', 'running', 'completed', 'failed', 'cancelled'
+    rows_processed: int
+    rows_per_second: float
+
+    class Config:
+        from_attributes = True
\ No newline at end of file
@@ -1,83 +1,93 @@
-"""Auction service: lazy-close and shared logic."""
-import csv
-import io
+"""Auction service: closing and shared logic."""
 from datetime import datetime
-from decimal import Decimal, InvalidOperation
-from typing import List, Tuple
+from typing import List
 
+from sqlalchemy import and_, case, func, or_, select, update
 from sqlalchemy.orm import Session
 
-from database import Auction
+from database import Auction, AuctionItem, Bid
 
 
-def _parse_ended_at(value: str) -> datetime | None:
-    value = (value or "").strip()
-    if not value:
-        return None
-    try:
-        return datetime.fromisoformat(value.replace("Z", "+00:00"))
-    except ValueError:
-        pass
-    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
-        try:
-            return datetime.strptime(value[:19].replace("T", " "), fmt)
-        except ValueError:
-            continue
-    return None
+def effective_status_filter(status: str, now: datetime | None = None):
+    """
+    WHERE clause matching auctions whose effective status (see Auction.effective_status)
+    is `status`, written so SQLite can still use the status/ended_at columns directly.
+    """
+    now = now or datetime.utcnow()
+    if status == "active":
+        return and_(
+            Auction.status == "active",
+            or_(Auction.ended_at.is_(None), Auction.ended_at > now),
+        )
+    if status == "ended":
+        return or_(
+            Auction.status == "ended",
+            and_(Auction.status == "active", Auction.ended_at.isnot(None), Auction.ended_at <= now),
+        )
+    return Auction.status == status
 
 
-def parse_auctions_csv(content: str) -> List[Tuple[str, datetime | None, List[Tuple[str, Decimal]]]]:
+def auction_stats_query():
     """
-    Parse CSV: one row per auction. Columns name, ended_at, item_1_name, item_1_price, item_2_name, item_2_price, ...
-    Returns list of (name, ended_at, [(item_name, opening_price), ...]).
-    Empty item name or invalid price skips that item. Invalid ended_at yields None (caller may reject).
+    One GROUP BY statement yielding, per auction ordered by id:
+    id, name, status (effective), ended_at, item_count, total_bids, revenue.
+    Revenue is the sum of closing prices once the auction is closed, else of current bids.
+    Grouping on auctions.id in id order lets SQLite aggregate while it scans, and the bid
+    count per item is an index-only lookup, so rows stream out without a temp table.
     """
-    reader = csv.DictReader(io.StringIO(content))
-    rows_out = []
-    for row in reader:
-        name = (row.get("name") or "").strip()
-        ended_at_val = _parse_ended_at(row.get("ended_at") or "")
-        items = []
-        i = 1
-        while True:
-            iname = (row.get(f"item_{i}_name") or "").strip()
-            iprice_str = (row.get(f"item_{i}_price") or "").strip()
-            if not iname and not iprice_str:
-                i += 1
-                if i > 100:
-                    break
-                continue
-            if not iname:
-                i += 1
-                continue
-            try:
-                price = Decimal(iprice_str) if iprice_str else Decimal("0")
-                if price < 0:
-                    continue
-                items.append((iname, price))
-            except (InvalidOperation, ValueError):
-                pass
-            i += 1
-            if i > 100:
-                break
-        rows_out.append((name, ended_at_val, items))
-    return rows_out
+    item_bid_count = (
+        select(func.count(Bid.id))
+        .where(Bid.item_id == AuctionItem.id)
+        .correlate(AuctionItem)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            Auction.id,
+            Auction.name,
+            Auction.effective_status.label("status"),
+            Auction.ended_at,
+            func.count(AuctionItem.id).label("item_count"),
+            func.coalesce(func.sum(item_bid_count), 0).label("total_bids"),
+            case(
+                (Auction.status == "ended", func.sum(AuctionItem.closing_price)),
+                else_=func.sum(AuctionItem.current_bid),
+            ).label("revenue"),
+        )
+        .outerjoin(AuctionItem, AuctionItem.auction_id == Auction.id)
+        .group_by(Auction.id)
+        .order_by(Auction.id)
+    )
 
 
-def ensure_auction_closed_if_ended(db: Session, auction: Auction) -> None:
+def close_due_auctions(db: Session, now: datetime | None = None) -> List[int]:
     """
-    If the auction has ended (now >= ended_at) and is still active,
-    mark it ended and set each item's closing_price = current_bid.
-    Idempotent: safe to call multiple times.
+    End every active auction whose ended_at has passed, in one transaction:
+    set closing_price = current_bid for all their items, flip status to 'ended'
+    and bump their version.
+    Returns the ids of the auctions closed. Idempotent: safe to call repeatedly.
     """
-    if auction.status != "active":
-        return
-    if auction.ended_at is None:
-        return
-    if datetime.utcnow() < auction.ended_at:
-        return
-    auction.status = "ended"
-    for item in auction.items:
-        item.closing_price = item.current_bid
+    now = now or datetime.utcnow()
+    due = select(Auction.id).where(
+        Auction.status == "active",
+        Auction.ended_at.isnot(None),
+        Auction.ended_at <= now,
+    )
+    # Updating the items first takes the write lock, so no bid can land between
+    # picking the due auctions and copying their prices.
+    db.execute(
+        update(AuctionItem)
+        .where(AuctionItem.auction_id.in_(due.scalar_subquery()))
+        .values(closing_price=AuctionItem.current_bid)
+        .execution_options(synchronize_session=False)
+    )
+    auction_ids = list(db.scalars(due))
+    if auction_ids:
+        db.execute(
+            update(Auction)
+            .where(Auction.id.in_(auction_ids))
+            .values(status="ended", version=Auction.version + 1)
+            .execution_options(synchronize_session=False)
+        )
     db.commit()
-    db.refresh(auction)
+    return auction_ids
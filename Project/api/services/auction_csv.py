@@ -0,0 +1,58 @@
+"""
+Parsing of auctions CSV files. Imports nothing from the app (no database, no engine),
+so import job worker processes load only this module when they unpickle a chunk.
+"""
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Tuple
+
+
+def _parse_ended_at(value: str) -> datetime | None:
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        pass
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value[:19].replace("T", " "), fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def parse_auction_record(row: Dict[str, str]) -> Tuple[str, datetime | None, List[Tuple[str, Decimal]]]:
+    """
+    Parse one CSV record (header -> value). Columns name, ended_at, item_1_name, item_1_price, item_2_name, item_2_price, ...
+    Returns (name, ended_at, [(item_name, opening_price), ...]).
+    Empty item name or invalid/negative price skips that item. Invalid ended_at yields None (caller may reject).
+    """
+    name = (row.get("name") or "").strip()
+    ended_at_val = _parse_ended_at(row.get("ended_at") or "")
+    items = []
+    for i in range(1, 101):
+        iname = (row.get(f"item_{i}_name") or "").strip()
+        iprice_str = (row.get(f"item_{i}_price") or "").strip()
+        if not iname:
+            continue
+        try:
+            price = Decimal(iprice_str) if iprice_str else Decimal("0")
+        except (InvalidOperation, ValueError):
+            continue
+        if price < 0:
+            continue
+        items.append((iname, price))
+    return name, ended_at_val, items
+
+
+def parse_auction_records(header: List[str], records: List[List[str]], first_row_number: int):
+    """
+    Parse a chunk of raw CSV records (as split by csv.reader) that follow `header`.
+    Picklable, so import jobs can fan chunks out to worker processes.
+    """
+    return [
+        (first_row_number + offset, *parse_auction_record(dict(zip(header, record))))
+        for offset, record in enumerate(records)
+    ]
@@ -0,0 +1,456 @@
+"""Bid engine: validate and apply a bid with a single conditional UPDATE, plus proxy (max) bids."""
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import case, exists, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
+
+from database import Auction, AuctionItem, Bid, ProxyBid, run_write_transaction
+from services.auction import effective_status_filter
+from services.price_book import price_book
+from services.pubsub import auction_broker
+from services.response_cache import response_cache
+
+# Rule identifiers reported when a bid is rejected
+AUCTION_NOT_FOUND = "auction_not_found"
+AUCTION_NOT_ACTIVE = "auction_not_active"
+ITEM_NOT_FOUND = "item_not_found"
+BID_NOT_ABOVE_CURRENT = "bid_not_above_current"
+BID_BELOW_OPENING = "bid_below_opening"
+BID_CONFLICT = "bid_conflict"
+PROXY_NOT_ABOVE_MAX = "proxy_not_above_max"
+
+# Most bids accepted in one batch request
+BID_BATCH_LIMIT = int(os.getenv("AUCTION_BID_BATCH_LIMIT", "100"))
+# Step by which a proxy bid outbids the strongest competing bid
+BID_INCREMENT = Decimal(os.getenv("AUCTION_BID_INCREMENT", "1.00"))
+
+_CENTS = Decimal("0.01")
+
+
+class BidRejected(Exception):
+    """A bid failed one of the placement rules."""
+
+    def __init__(self, reason: str, detail: str, status_code: int = 400):
+        super().__init__(detail)
+        self.reason = reason
+        self.detail = detail
+        self.status_code = status_code
+
+
+@dataclass
+class BidOutcome:
+    """Result of one bid in a batch: bid_id/created_at when accepted, rejection otherwise."""
+    auction_id: int
+    item_id: int
+    amount: Decimal
+    bidder_id: int
+    bid_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    rejection: Optional[BidRejected] = None
+
+    @property
+    def accepted(self) -> bool:
+        return self.bid_id is not None
+
+
+def _auction_is_open(auction_id: int, now: datetime):
+    return exists().where(Auction.id == auction_id, effective_status_filter("active", now))
+
+
+def _check_rules(auction, item, current_bid: Optional[Decimal], amount: Decimal, now: datetime) -> Optional[BidRejected]:
+    """
+    The first placement rule a bid breaks, given the auction's (status, ended_at) row
+    and the item's (opening_price) row, either None if missing; or None if it passes.
+    """
+    if auction is None:
+        return BidRejected(AUCTION_NOT_FOUND, "Auction not found", 404)
+    if auction.status != "active" or (auction.ended_at is not None and auction.ended_at <= now):
+        return BidRejected(AUCTION_NOT_ACTIVE, "Auction is not active")
+    if item is None:
+        return BidRejected(ITEM_NOT_FOUND, "Item not found in this auction", 404)
+    current_bid = current_bid or Decimal("0")
+    if amount <= current_bid:
+        return BidRejected(
+            BID_NOT_ABOVE_CURRENT,
+            f"Bid must be greater than current bid ({current_bid.quantize(_CENTS)})",
+        )
+    if amount < item.opening_price:
+        return BidRejected(
+            BID_BELOW_OPENING,
+            f"Bid must be at least opening price ({item.opening_price.quantize(_CENTS)})",
+        )
+    return None
+
+
+def _conflict() -> BidRejected:
+    return BidRejected(BID_CONFLICT, "Bid conflicted with a concurrent update, please retry", 409)
+
+
+def _diagnose_rejection(db: Session, auction_id: int, item_id: int, amount: Decimal, now: datetime) -> BidRejected:
+    """Work out which rule a rejected bid failed. Only runs on the failure path."""
+    auction = db.execute(
+        select(Auction.status, Auction.ended_at).where(Auction.id == auction_id)
+    ).first()
+    item = db.execute(
+        select(AuctionItem.current_bid, AuctionItem.opening_price).where(
+            AuctionItem.id == item_id,
+            AuctionItem.auction_id == auction_id,
+        )
+    ).first()
+    current_bid = item.current_bid if item is not None else None
+    return _check_rules(auction, item, current_bid, amount, now) or _conflict()
+
+
+def _raise_price(
+    db: Session, auction_id: int, item_id: int, bidder_id: int, amount: Decimal, now: datetime, tie: bool = False
+) -> bool:
+    """
+    The conditional UPDATE that makes a bid the item's current bid. False if any rule
+    failed. With `tie`, a bid equal to the current bid also takes the lead (a standing
+    maximum answering a later bid of the same amount).
+    """
+    current_bid = func.coalesce(AuctionItem.current_bid, 0)
+    result = db.execute(
+        update(AuctionItem)
+        .where(
+            AuctionItem.id == item_id,
+            AuctionItem.auction_id == auction_id,
+            current_bid <= amount if tie else current_bid < amount,
+            AuctionItem.opening_price <= amount,
+            _auction_is_open(auction_id, now),
+        )
+        .values(current_bid=amount, current_bidder_id=bidder_id)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def _raise_prices(
+    db: Session,
+    prices: Dict[int, Tuple[Decimal, int]],
+    read: Dict[int, Tuple[Optional[Decimal], Optional[int]]],
+    now: datetime,
+) -> Set[int]:
+    """
+    Set-based form of _raise_price: one UPDATE moves every item in `prices` to its
+    new (current_bid, current_bidder_id), but only items still at the price and
+    bidder they were `read` at, in auctions still open. Returns the ids it moved.
+    """
+    def by_item(values):
+        return case(values, value=AuctionItem.id)
+
+    result = db.execute(
+        update(AuctionItem)
+        .where(
+            AuctionItem.id.in_(prices),
+            func.coalesce(AuctionItem.current_bid, 0) == by_item({i: read[i][0] or 0 for i in prices}),
+            func.coalesce(AuctionItem.current_bidder_id, 0) == by_item({i: read[i][1] or 0 for i in prices}),
+            exists().where(Auction.id == AuctionItem.auction_id, effective_status_filter("active", now)),
+        )
+        .values(
+            current_bid=by_item({i: amount for i, (amount, _) in prices.items()}),
+            current_bidder_id=by_item({i: bidder_id for i, (_, bidder_id) in prices.items()}),
+        )
+        .returning(AuctionItem.id)
+        .execution_options(synchronize_session=False)
+    )
+    return set(result.scalars())
+
+
+def _bump_versions(db: Session, auction_ids: Iterable[int]) -> None:
+    db.execute(
+        update(Auction)
+        .where(Auction.id.in_(set(auction_ids)))
+        .values(version=Auction.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _save_bids(db: Session, placed: List[BidOutcome], now: datetime) -> List[BidOutcome]:
+    """INSERT the placed bids in order with one statement, fill in their outcomes and bump the auctions' versions."""
+    if not placed:
+        return []
+    rows = db.execute(
+        insert(Bid).returning(Bid.id, Bid.item_id, Bid.bidder_id, Bid.amount),
+        [
+            {"item_id": outcome.item_id, "bidder_id": outcome.bidder_id, "amount": outcome.amount, "created_at": now}
+            for outcome in placed
+        ],
+    )
+    # A multi-row INSERT may return rows in any order, but one transaction never
+    # places two bids with the same item, bidder and (cent) amount
+    bid_ids = {(row.item_id, row.bidder_id, row.amount): row.id for row in rows}
+    for outcome in placed:
+        outcome.bid_id = bid_ids[(outcome.item_id, outcome.bidder_id, outcome.amount)]
+        outcome.created_at = now
+    _bump_versions(db, {outcome.auction_id for outcome in placed})
+    return placed
+
+
+def _top_proxies(item_ids: Iterable[int]):
+    """The two highest maximums on each item, best first; equal maximums rank by age."""
+    ranked = (
+        select(
+            ProxyBid.item_id,
+            ProxyBid.bidder_id,
+            ProxyBid.max_amount,
+            func.row_number()
+            .over(
+                partition_by=ProxyBid.item_id,
+                order_by=(ProxyBid.max_amount.desc(), ProxyBid.placed_at, ProxyBid.id),
+            )
+            .label("rank"),
+        )
+        .where(ProxyBid.item_id.in_(set(item_ids)))
+        .subquery()
+    )
+    return select(ranked).where(ranked.c.rank <= 2).order_by(ranked.c.item_id, ranked.c.rank)
+
+
+def _proxy_answer(top_two, current_bid: Optional[Decimal], current_bidder_id: Optional[int], opening_price: Decimal):
+    """
+    How an item's standing maximums answer its current price: (bidder_id, amount)
+    of the bid the top maximum places, or None. Only the two highest matter: the
+    top one bids just enough to beat the strongest rival (the runner-up maximum or
+    another bidder's visible bid), capped at its own maximum. A maximum is always
+    set above the price of its time, so any visible bid equal to it came later and
+    the standing maximum wins the tie: it takes the lead at the same amount.
+    """
+    if not top_two:
+        return None
+    leader = top_two[0]
+    current_bid = current_bid or Decimal("0")
+    rival = Decimal("0") if current_bidder_id == leader.bidder_id else current_bid
+    if len(top_two) > 1:
+        rival = max(rival, top_two[1].max_amount)
+    amount = min(leader.max_amount, max(opening_price, rival + BID_INCREMENT)).quantize(_CENTS)
+    if amount < current_bid or (amount == current_bid and current_bidder_id == leader.bidder_id):
+        return None
+    return leader.bidder_id, amount
+
+
+def _resolve_proxies(db: Session, auction_id: int, item_id: int, now: datetime) -> Optional[BidOutcome]:
+    """
+    Settle every standing maximum on an item in one pass (see _proxy_answer).
+    Returns at most one bid to record, for the winner's price.
+    """
+    top_two = db.execute(_top_proxies([item_id])).all()
+    if not top_two:
+        return None
+    item = db.execute(
+        select(AuctionItem.current_bid, AuctionItem.current_bidder_id, AuctionItem.opening_price).where(
+            AuctionItem.id == item_id
+        )
+    ).one()
+    answer = _proxy_answer(top_two, item.current_bid, item.current_bidder_id, item.opening_price)
+    if answer is None:
+        return None
+    bidder_id, amount = answer
+    if not _raise_price(db, auction_id, item_id, bidder_id, amount, now, tie=True):
+        return None
+    return BidOutcome(auction_id, item_id, amount, bidder_id)
+
+
+def _apply_bid(db: Session, auction_id: int, item_id: int, bidder_id: int, amount: Decimal) -> List[BidOutcome]:
+    now = datetime.utcnow()
+    if not _raise_price(db, auction_id, item_id, bidder_id, amount, now):
+        db.rollback()
+        raise _diagnose_rejection(db, auction_id, item_id, amount, now)
+    placed = [BidOutcome(auction_id, item_id, amount, bidder_id)]
+    counter = _resolve_proxies(db, auction_id, item_id, now)
+    if counter:
+        placed.append(counter)
+    outcomes = _save_bids(db, placed, now)
+    db.commit()
+    return outcomes
+
+
+def _announce(outcomes: List[BidOutcome]) -> None:
+    """After commit: update the price book, drop cached responses and push live events."""
+    accepted = [outcome for outcome in outcomes if outcome.accepted]
+    if not accepted:
+        return
+    for outcome in accepted:
+        price_book.record_bid(outcome.item_id, outcome.auction_id, outcome.amount, outcome.bidder_id)
+    response_cache.invalidate_auctions({outcome.auction_id for outcome in accepted})
+    for outcome in accepted:
+        auction_broker.publish(outcome.auction_id, "bid", {
+            "auction_id": outcome.auction_id,
+            "item_id": outcome.item_id,
+            "bid_id": outcome.bid_id,
+            "bidder_id": outcome.bidder_id,
+            "amount": outcome.amount,
+            "created_at": outcome.created_at.isoformat(),
+        })
+
+
+def submit_bid(db: Session, auction_id: int, item_id: int, bidder_id: int, amount: Decimal) -> Bid:
+    """
+    Place a bid in one transaction: a conditional UPDATE of the item
+    (amount > current_bid, amount >= opening_price, auction active and not past ended_at)
+    followed by the Bid INSERT and an Auction.version bump. Concurrent bidders are
+    serialized by the UPDATE itself, so only one of two racing bids at the same price can win.
+    Other bidders' proxy maximums answer in the same transaction, so the returned
+    bid may already be outbid. Accepted bids are published to the auction's live stream.
+    Raises BidRejected naming the failed rule.
+    """
+    placed = run_write_transaction(db, _apply_bid, auction_id, item_id, bidder_id, amount.quantize(_CENTS))
+    bid = load_bid(db, placed[0].bid_id)
+    _announce(placed)
+    return bid
+
+
+def _apply_bids(
+    db: Session, bidder_id: int, bids: List[Tuple[int, int, Decimal]]
+) -> Tuple[List[BidOutcome], List[BidOutcome]]:
+    now = datetime.utcnow()
+    auctions = {
+        row.id: row
+        for row in db.execute(
+            select(Auction.id, Auction.status, Auction.ended_at).where(
+                Auction.id.in_({auction_id for auction_id, _, _ in bids})
+            )
+        )
+    }
+    items = {
+        row.id: row
+        for row in db.execute(
+            select(
+                AuctionItem.id,
+                AuctionItem.auction_id,
+                AuctionItem.current_bid,
+                AuctionItem.current_bidder_id,
+                AuctionItem.opening_price,
+            ).where(AuctionItem.id.in_({item_id for _, item_id, _ in bids}))
+        )
+    }
+    proxies: Dict[int, list] = {}
+    if items:
+        for row in db.execute(_top_proxies(items)):
+            proxies.setdefault(row.item_id, []).append(row)
+    read = {item_id: (item.current_bid, item.current_bidder_id) for item_id, item in items.items()}
+    # (current_bid, current_bidder_id) as this batch moves them, so a later bid on an item must beat an earlier one
+    standing = dict(read)
+    outcomes = []
+    placed = []
+    for auction_id, item_id, amount in bids:
+        outcome = BidOutcome(auction_id, item_id, amount, bidder_id)
+        outcomes.append(outcome)
+        item = items.get(item_id)
+        if item is not None and item.auction_id != auction_id:
+            item = None
+        current_bid = standing[item_id][0] if item is not None else None
+        outcome.rejection = _check_rules(auctions.get(auction_id), item, current_bid, amount, now)
+        if outcome.rejection is not None:
+            continue
+        standing[item_id] = (amount, bidder_id)
+        placed.append(outcome)
+        answer = _proxy_answer(proxies.get(item_id), amount, bidder_id, item.opening_price)
+        if answer is not None:
+            counter_bidder_id, counter_amount = answer
+            standing[item_id] = (counter_amount, counter_bidder_id)
+            placed.append(BidOutcome(auction_id, item_id, counter_amount, counter_bidder_id))
+    if placed:
+        moved = {outcome.item_id for outcome in placed}
+        raised = _raise_prices(db, {item_id: standing[item_id] for item_id in moved}, read, now)
+        if raised != moved:
+            # Another bid landed on these items between the reads above and the UPDATE
+            for outcome in placed:
+                if outcome.item_id not in raised and outcome.bidder_id == bidder_id:
+                    outcome.rejection = _conflict()
+            placed = [outcome for outcome in placed if outcome.item_id in raised]
+    placed = _save_bids(db, placed, now)
+    db.commit()
+    return outcomes, placed
+
+
+def submit_bids(db: Session, bidder_id: int, bids: List[Tuple[int, int, Decimal]]) -> List[BidOutcome]:
+    """
+    Place several (auction_id, item_id, amount) bids in one transaction with a fixed
+    number of statements, however many bids there are: the auctions, items and top
+    proxy maximums involved are read in one query each, every bid is checked against
+    them in order (proxy maximums answering as they would to submit_bid), and the
+    resulting prices are written by one conditional UPDATE. Items a concurrent bid
+    moved in the meantime are left alone and their bids rejected as conflicts.
+    Rejected bids do not stop the others. Returns one outcome per bid, in request order.
+    """
+    bids = [(auction_id, item_id, amount.quantize(_CENTS)) for auction_id, item_id, amount in bids]
+    outcomes, placed = run_write_transaction(db, _apply_bids, bidder_id, bids)
+    _announce(placed)
+    return outcomes
+
+
+def _apply_proxy_bid(db: Session, auction_id: int, item_id: int, bidder_id: int, max_amount: Decimal) -> List[BidOutcome]:
+    now = datetime.utcnow()
+    auction = db.execute(
+        select(Auction.status, Auction.ended_at).where(Auction.id == auction_id)
+    ).first()
+    item = db.execute(
+        select(AuctionItem.current_bid, AuctionItem.opening_price).where(
+            AuctionItem.id == item_id,
+            AuctionItem.auction_id == auction_id,
+        )
+    ).first()
+    proxy = db.query(ProxyBid).filter(ProxyBid.item_id == item_id, ProxyBid.bidder_id == bidder_id).first()
+    current_bid = item.current_bid if item is not None else None
+    rejection = _check_rules(auction, item, current_bid, max_amount, now)
+    if rejection is None and proxy is not None and max_amount <= proxy.max_amount:
+        rejection = BidRejected(
+            PROXY_NOT_ABOVE_MAX,
+            f"Max bid must be greater than your current max ({proxy.max_amount})",
+        )
+    if rejection is not None:
+        db.rollback()
+        raise rejection
+    if proxy is None:
+        db.add(ProxyBid(item_id=item_id, bidder_id=bidder_id, max_amount=max_amount, placed_at=now))
+    else:
+        proxy.max_amount = max_amount
+        proxy.placed_at = now
+    try:
+        db.flush()
+    except IntegrityError:
+        # The same bidder set a max on this item concurrently
+        db.rollback()
+        raise _conflict()
+    counter = _resolve_proxies(db, auction_id, item_id, now)
+    outcomes = _save_bids(db, [counter] if counter else [], now)
+    db.commit()
+    return outcomes
+
+
+def submit_proxy_bid(db: Session, auction_id: int, item_id: int, bidder_id: int, max_amount: Decimal) -> ProxyBid:
+    """
+    Set (or raise) the bidder's maximum for an item and let the engine bid for them:
+    in the same transaction the item's maximums are resolved and the visible price
+    moves to the runner-up's maximum plus BID_INCREMENT. One call replaces a
+    client-side poll-and-rebid loop; later bids by others are answered automatically.
+    Raises BidRejected if the maximum would not be a valid bid or does not raise
+    the bidder's previous maximum.
+    """
+    placed = run_write_transaction(db, _apply_proxy_bid, auction_id, item_id, bidder_id, max_amount)
+    _announce(placed)
+    return (
+        db.query(ProxyBid)
+        .options(joinedload(ProxyBid.item).joinedload(AuctionItem.auction).joinedload(Auction.creator))
+        .filter(ProxyBid.item_id == item_id, ProxyBid.bidder_id == bidder_id)
+        .one()
+    )
+
+
+def load_bid(db: Session, bid_id: int) -> Bid:
+    """Load a bid with everything BidResponse serializes, in one query."""
+    return (
+        db.query(Bid)
+        .options(
+            joinedload(Bid.item).joinedload(AuctionItem.auction).joinedload(Auction.creator),
+            joinedload(Bid.bidder),
+        )
+        .filter(Bid.id == bid_id)
+        .one()
+    )
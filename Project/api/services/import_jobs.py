@@ -0,0 +1,199 @@
+"""Background auction import jobs: chunks are parsed in worker processes and inserted in batches."""
+import csv
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional
+
+from database import SessionLocal
+from services.auction_csv import parse_auction_records
+from services.importer import IMPORT_BATCH_SIZE, AuctionImporter
+
+logger = logging.getLogger(__name__)
+
+# Processes parsing CSV chunks, shared by all jobs
+IMPORT_PARSE_WORKERS = int(os.getenv("AUCTION_IMPORT_PARSE_WORKERS", str(os.cpu_count() or 1)))
+# Jobs inserting at the same time (SQLite still serializes their commits)
+IMPORT_JOB_WORKERS = int(os.getenv("AUCTION_IMPORT_JOB_WORKERS", "2"))
+# CSV records per chunk sent to a parse worker
+IMPORT_CHUNK_ROWS = int(os.getenv("AUCTION_IMPORT_CHUNK_ROWS", "5000"))
+# Finished jobs kept for polling before the oldest are forgotten
+IMPORT_JOBS_RETAINED = int(os.getenv("AUCTION_IMPORT_JOBS_RETAINED", "100"))
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+
+class ImportsClosed(RuntimeError):
+    """The job manager has been shut down and accepts no more imports."""
+
+
+@dataclass
+class ImportJob:
+    id: str
+    created_by: int
+    path: str
+    batch_size: int
+    status: str = "queued"  # queued, running, completed, failed, cancelled
+    rows_processed: int = 0
+    created: int = 0
+    errors: List[str] = field(default_factory=list)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    cancel_requested: bool = False
+
+    @property
+    def rows_per_second(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        return self.rows_processed / elapsed if elapsed > 0 else 0.0
+
+
+class ImportJobManager:
+    """
+    Runs imports off the request path. Each job streams its uploaded file through
+    csv.reader, hands chunks of raw records to a shared process pool for parsing
+    (a bounded number in flight, so memory stays flat), and feeds the parsed rows to
+    an AuctionImporter on a job thread. Progress is published on the ImportJob as
+    each chunk lands; cancellation is honoured between chunks, keeping the batches
+    already committed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, ImportJob]" = OrderedDict()
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        # Set by shutdown(); no executors are created and no jobs accepted after it
+        self._closed = False
+
+    def _start_executors(self):
+        # Called with the lock held
+        if self._closed:
+            raise ImportsClosed("Import jobs are shut down")
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(IMPORT_JOB_WORKERS, thread_name_prefix="auction-import")
+            # spawn: forking a process that is running threads is not safe
+            self._processes = ProcessPoolExecutor(
+                IMPORT_PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._threads, self._processes
+
+    def _executors(self):
+        with self._lock:
+            return self._start_executors()
+
+    def submit(self, path: str, created_by: int, batch_size: int = IMPORT_BATCH_SIZE) -> ImportJob:
+        """
+        Queue an import of the CSV file at `path`; the file is deleted when the job ends.
+        Raises ImportsClosed (and deletes the file) once shutdown() has been called.
+        """
+        job = ImportJob(id=uuid.uuid4().hex, created_by=created_by, path=path, batch_size=batch_size)
+        with self._lock:
+            try:
+                threads, _ = self._start_executors()
+            except ImportsClosed:
+                os.unlink(path)
+                raise
+            self._jobs[job.id] = job
+            self._forget_finished()
+            # Under the lock, so shutdown() cannot close the pool in between
+            threads.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str, created_by: int) -> Optional[ImportJob]:
+        """The job, or None if it does not exist or `created_by` did not submit it."""
+        job = self._jobs.get(job_id)
+        if job is None or job.created_by != created_by:
+            return None
+        return job
+
+    def cancel(self, job_id: str, created_by: int) -> Optional[ImportJob]:
+        job = self.get(job_id, created_by)
+        if job is not None and job.status not in FINISHED_STATUSES:
+            job.cancel_requested = True
+        return job
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+            for job in self._jobs.values():
+                if job.status not in FINISHED_STATUSES:
+                    job.cancel_requested = True
+            threads, processes = self._threads, self._processes
+            self._threads = self._processes = None
+        if threads is not None:
+            threads.shutdown(wait=True)
+            processes.shutdown(wait=True)
+
+    def _forget_finished(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED_STATUSES]
+        for job_id in finished[:max(len(finished) - IMPORT_JOBS_RETAINED, 0)]:
+            del self._jobs[job_id]
+
+    def _parsed_chunks(self, job: ImportJob) -> Iterator[list]:
+        _, processes = self._executors()
+        in_flight = deque()
+        with open(job.path, newline="", encoding="utf-8", errors="replace") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            row_number = 2
+            chunk = []
+            for record in reader:
+                if not record:
+                    continue
+                chunk.append(record)
+                if len(chunk) >= IMPORT_CHUNK_ROWS:
+                    in_flight.append(processes.submit(parse_auction_records, header, chunk, row_number))
+                    row_number += len(chunk)
+                    chunk = []
+                    if len(in_flight) > IMPORT_PARSE_WORKERS:
+                        yield in_flight.popleft().result()
+            if chunk:
+                in_flight.append(processes.submit(parse_auction_records, header, chunk, row_number))
+        while in_flight:
+            yield in_flight.popleft().result()
+
+    def _run(self, job: ImportJob) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        db = SessionLocal()
+        importer = AuctionImporter(db, job.created_by, job.batch_size)
+        # Share the error list so errors show up while the job is still running
+        importer.errors = job.errors
+        try:
+            # Jobs still queued at shutdown stop here, before asking for parse workers
+            if not job.cancel_requested:
+                for rows in self._parsed_chunks(job):
+                    if job.cancel_requested:
+                        break
+                    for row in rows:
+                        importer.add(row)
+                    job.rows_processed = importer.rows_processed
+                    job.created = importer.created
+            if job.cancel_requested:
+                job.status = "cancelled"
+            else:
+                importer.flush()
+                job.status = "completed"
+        except Exception as e:
+            logger.exception("Import job %s failed", job.id)
+            job.errors.append(f"Import failed: {e!s}")
+            job.status = "failed"
+        finally:
+            job.rows_processed = importer.rows_processed
+            job.created = importer.created
+            job.finished_at = time.time()
+            db.close()
+            os.unlink(job.path)
+
+
+import_jobs = ImportJobManager()
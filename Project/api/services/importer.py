@@ -0,0 +1,125 @@
+"""Batched auction import: validated rows are bulk-inserted a batch at a time."""
+import os
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from database import Auction, AuctionItem, is_lock_error, run_write_transaction
+from services.response_cache import LISTS, response_cache
+from services.scheduler import auction_closer
+
+IMPORT_BATCH_SIZE = int(os.getenv("AUCTION_IMPORT_BATCH_SIZE", "500"))
+
+# (row_number, name, ended_at, [(item_name, opening_price), ...]) as returned by parse_auction_records
+AuctionRow = Tuple[int, str, Optional[datetime], List[Tuple[str, Decimal]]]
+
+
+def validate_auction_row(name: str, ended_at: Optional[datetime], items: list) -> Optional[str]:
+    """Return why a parsed row cannot be imported, or None if it can."""
+    if not name:
+        return "missing name"
+    if ended_at is None:
+        return "invalid or missing ended_at"
+    if not items:
+        return "at least one item required"
+    return None
+
+
+class AuctionImporter:
+    """
+    Accumulates parsed CSV rows and inserts them in batches: one executemany INSERT
+    for the batch's auctions (with RETURNING ids) and one for all their items, in a
+    single transaction. If a batch fails, it is replayed row by row inside savepoints
+    so only the bad rows are reported and the rest still commit. Lock contention is
+    never blamed on a row: it propagates to run_write_transaction, which retries.
+    """
+
+    def __init__(self, db: Session, created_by: int, batch_size: int = IMPORT_BATCH_SIZE):
+        self.db = db
+        self.created_by = created_by
+        self.batch_size = batch_size
+        self.rows_processed = 0
+        self.created = 0
+        self.errors: List[str] = []
+        self._batch: List[AuctionRow] = []
+
+    def add(self, row: AuctionRow) -> None:
+        row_number, name, ended_at, items = row
+        self.rows_processed += 1
+        error = validate_auction_row(name, ended_at, items)
+        if error:
+            self.errors.append(f"Row {row_number}: {error}")
+            return
+        self._batch.append(row)
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def run(self, rows: Iterable[AuctionRow]) -> "AuctionImporter":
+        for row in rows:
+            self.add(row)
+        self.flush()
+        return self
+
+    def flush(self) -> None:
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+        try:
+            run_write_transaction(self.db, self._write_batch, batch)
+            inserted = batch
+        except Exception as e:
+            if is_lock_error(e):
+                # Retries ran out; the rows are fine, the database is busy
+                raise
+            inserted, errors = run_write_transaction(self.db, self._write_rows_isolated, batch)
+            self.errors.extend(errors)
+        self.created += len(inserted)
+        if inserted:
+            response_cache.invalidate(LISTS)
+        for _, _, ended_at, _ in inserted:
+            auction_closer.schedule(ended_at)
+
+    def _insert(self, batch: List[AuctionRow]) -> None:
+        auction_ids = self.db.scalars(
+            insert(Auction).returning(Auction.id, sort_by_parameter_order=True),
+            [
+                {"name": name, "ended_at": ended_at, "created_by": self.created_by, "status": "active"}
+                for _, name, ended_at, _ in batch
+            ],
+        ).all()
+        self.db.execute(
+            insert(AuctionItem),
+            [
+                {
+                    "name": item_name,
+                    "opening_price": opening_price,
+                    "closing_price": Decimal("0"),
+                    "auction_id": auction_id,
+                }
+                for auction_id, (_, _, _, items) in zip(auction_ids, batch)
+                for item_name, opening_price in items
+            ],
+        )
+
+    def _write_batch(self, db: Session, batch: List[AuctionRow]) -> None:
+        self._insert(batch)
+        db.commit()
+
+    def _write_rows_isolated(self, db: Session, batch: List[AuctionRow]) -> Tuple[List[AuctionRow], List[str]]:
+        inserted = []
+        errors = []
+        for row in batch:
+            try:
+                with db.begin_nested():
+                    self._insert([row])
+            except Exception as e:
+                if is_lock_error(e):
+                    raise
+                errors.append(f"Row {row[0]}: {e!s}")
+                continue
+            inserted.append(row)
+        db.commit()
+        return inserted, errors
@@ -0,0 +1,147 @@
+"""Process-local price book: current bid and leader per auction item, served from memory."""
+import threading
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database import Auction, AuctionItem
+
+_CENTS = Decimal("0.01")
+
+
+@dataclass(frozen=True)
+class ItemPrice:
+    item_id: int
+    auction_id: int
+    current_bid: Decimal
+    current_bidder_id: Optional[int]
+
+
+def _price_from_row(row) -> ItemPrice:
+    return ItemPrice(
+        item_id=row.id,
+        auction_id=row.auction_id,
+        current_bid=row.current_bid if row.current_bid is not None else Decimal("0"),
+        current_bidder_id=row.current_bidder_id,
+    )
+
+
+def _price_query():
+    return select(
+        AuctionItem.id,
+        AuctionItem.auction_id,
+        AuctionItem.current_bid,
+        AuctionItem.current_bidder_id,
+    )
+
+
+class PriceBook:
+    """
+    In-memory view of auction_items.current_bid / current_bidder_id.
+    The database stays the source of truth: the book is seeded from it at startup,
+    updated by the bid path after each commit, and lazily loads auctions it has
+    not seen (e.g. created after startup). Each worker process has its own book.
+    GET /auctions/{id}/prices is answered from it without touching SQLite; the
+    auction detail still loads names and items from the database but takes each
+    item's price and leader from here, so both reads agree.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items: Dict[int, ItemPrice] = {}
+        self._auction_items: Dict[int, List[int]] = {}
+
+    def _store(self, price: ItemPrice) -> None:
+        existing = self._items.get(price.item_id)
+        if existing is not None and existing.current_bid > price.current_bid:
+            # A newer bid was recorded while this row was being read.
+            return
+        self._items[price.item_id] = price
+        item_ids = self._auction_items.setdefault(price.auction_id, [])
+        if existing is None:
+            item_ids.append(price.item_id)
+
+    def seed(self, db: Session) -> int:
+        """Load every item's price from the database. Returns the number of items."""
+        rows = db.execute(_price_query()).all()
+        auction_ids = db.execute(select(Auction.id)).scalars().all()
+        with self._lock:
+            self._items.clear()
+            self._auction_items.clear()
+            # Auctions without items are known too, so their empty price list is served from memory
+            for auction_id in auction_ids:
+                self._auction_items[auction_id] = []
+            for row in rows:
+                self._store(_price_from_row(row))
+        return len(rows)
+
+    def load_auction(self, db: Session, auction_id: int) -> List[ItemPrice]:
+        """(Re)load one auction's items from the database."""
+        rows = db.execute(_price_query().where(AuctionItem.auction_id == auction_id)).all()
+        return self.load_items(auction_id, rows)
+
+    def load_items(self, auction_id: int, items: Iterable) -> List[ItemPrice]:
+        """
+        Store an auction's already-read item rows (or AuctionItem objects) and return
+        the book's prices for the auction, which may be newer than the rows.
+        """
+        with self._lock:
+            for item in items:
+                self._store(_price_from_row(item))
+            self._auction_items.setdefault(auction_id, [])
+            return [self._items[i] for i in self._auction_items[auction_id]]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, item_id: int) -> Optional[ItemPrice]:
+        return self._items.get(item_id)
+
+    def get_auction(self, auction_id: int) -> Optional[List[ItemPrice]]:
+        """Prices for an auction's items, or None if the auction is not in the book."""
+        with self._lock:
+            item_ids = self._auction_items.get(auction_id)
+            if item_ids is None:
+                return None
+            return [self._items[i] for i in item_ids]
+
+    def record_bid(self, item_id: int, auction_id: int, amount: Decimal, bidder_id: int) -> None:
+        """Record a committed bid. Out-of-order calls never lower the price."""
+        with self._lock:
+            self._store(ItemPrice(item_id, auction_id, amount.quantize(_CENTS), bidder_id))
+
+    def check_consistency(self, db: Session) -> List[dict]:
+        """Compare the book with the database and return one entry per differing item."""
+        rows = db.execute(_price_query()).all()
+        with self._lock:
+            book = dict(self._items)
+        mismatches = []
+        for row in rows:
+            expected = _price_from_row(row)
+            actual = book.pop(row.id, None)
+            if actual is None:
+                # Not loaded yet; it will be read from the database on first use.
+                continue
+            if (actual.current_bid, actual.current_bidder_id) != (expected.current_bid, expected.current_bidder_id):
+                mismatches.append({
+                    "item_id": row.id,
+                    "book_bid": actual.current_bid,
+                    "book_bidder_id": actual.current_bidder_id,
+                    "db_bid": expected.current_bid,
+                    "db_bidder_id": expected.current_bidder_id,
+                })
+        for item_id, actual in book.items():
+            mismatches.append({
+                "item_id": item_id,
+                "book_bid": actual.current_bid,
+                "book_bidder_id": actual.current_bidder_id,
+                "db_bid": None,
+                "db_bidder_id": None,
+            })
+        return mismatches
+
+
+price_book = PriceBook()
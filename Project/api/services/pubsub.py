@@ -0,0 +1,179 @@
+"""In-process pub/sub of auction events (bids, closes) for live watchers."""
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Set
+
+import metrics
+
+# Events kept per auction for replay to reconnecting watchers
+STREAM_BACKLOG_SIZE = int(os.getenv("AUCTION_STREAM_BACKLOG_SIZE", "256"))
+# Undelivered events a watcher may fall behind by before it is evicted
+STREAM_QUEUE_SIZE = int(os.getenv("AUCTION_STREAM_QUEUE_SIZE", "64"))
+# How long an unwatched auction's backlog is kept for reconnects before its channel is dropped
+STREAM_BACKLOG_TTL_SECONDS = float(os.getenv("AUCTION_STREAM_BACKLOG_TTL_SECONDS", "300"))
+
+metrics.describe("stream_events_published_total", "Auction events published to live watchers")
+metrics.describe("stream_subscribers_evicted_total", "Live watchers dropped for falling too far behind")
+
+
+@dataclass(frozen=True)
+class AuctionEvent:
+    seq: int
+    type: str
+    frame: bytes  # encoded once as an SSE frame, shared by every subscriber
+    published_at: float = 0.0  # time.monotonic()
+
+
+def _encode(seq: int, event_type: str, data: dict) -> bytes:
+    payload = json.dumps(data, default=str, separators=(",", ":"))
+    return f"id: {seq}\nevent: {event_type}\ndata: {payload}\n\n".encode()
+
+
+def _reset(auction_id: int, seq: int) -> AuctionEvent:
+    # Tells a watcher whose position cannot be replayed to reload the auction, then carries on live
+    return AuctionEvent(seq, "reset", _encode(seq, "reset", {"auction_id": auction_id}))
+
+
+class Subscription:
+    def __init__(self, auction_id: int, last_seq: int, queue_size: int = STREAM_QUEUE_SIZE):
+        self.auction_id = auction_id
+        self.last_seq = last_seq
+        self.queue: "asyncio.Queue[Optional[AuctionEvent]]" = asyncio.Queue(queue_size)
+        self.evicted = False
+
+    async def next(self, timeout: float) -> AuctionEvent:
+        """
+        Next unseen event. Raises asyncio.TimeoutError if none arrives within
+        `timeout` seconds, and EOFError once evicted. Events already seen
+        (replayed backlog racing a live publish) are skipped.
+        """
+        while True:
+            event = await asyncio.wait_for(self.queue.get(), timeout)
+            if event is None:
+                raise EOFError("subscriber evicted")
+            if event.seq > self.last_seq:
+                self.last_seq = event.seq
+                return event
+
+
+class _Channel:
+    def __init__(self, seq: int = 0):
+        self.seq = seq
+        self.backlog: Deque[AuctionEvent] = deque(maxlen=STREAM_BACKLOG_SIZE)
+        self.subscribers: Set[Subscription] = set()
+
+
+class AuctionBroker:
+    """
+    Per-auction channels with a sequence-numbered backlog. publish() may be called
+    from any thread (route handlers run in the threadpool); fan-out and subscriber
+    bookkeeping happen on the event loop bound at startup. A subscriber whose queue
+    is full is evicted rather than allowed to slow the others down; it can reconnect
+    with its last event id and replay from the backlog. A watcher whose last event
+    id the backlog no longer covers (or that predates a restart) gets a `reset`
+    event instead of a partial replay. Channels nobody watches are dropped once
+    their newest event is STREAM_BACKLOG_TTL_SECONDS old.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels: Dict[int, _Channel] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Highest event id of any dropped channel; new channels number their events above it
+        # so an id from before a drop is never mistaken for a later event
+        self._seq_floor = 0
+        self._next_prune = time.monotonic() + STREAM_BACKLOG_TTL_SECONDS
+
+    def bind(self, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        self._loop = loop
+
+    def subscriber_count(self) -> int:
+        return sum(len(channel.subscribers) for channel in list(self._channels.values()))
+
+    def channel_count(self) -> int:
+        return len(self._channels)
+
+    def _channel(self, auction_id: int) -> _Channel:
+        channel = self._channels.get(auction_id)
+        if channel is None:
+            channel = self._channels[auction_id] = _Channel(self._seq_floor)
+        return channel
+
+    def _prune(self, now: float) -> None:
+        """Drop idle channels (called with the lock held)."""
+        self._next_prune = now + STREAM_BACKLOG_TTL_SECONDS
+        for auction_id, channel in list(self._channels.items()):
+            if channel.subscribers:
+                continue
+            if channel.backlog and channel.backlog[-1].published_at > now - STREAM_BACKLOG_TTL_SECONDS:
+                continue
+            del self._channels[auction_id]
+            self._seq_floor = max(self._seq_floor, channel.seq)
+
+    def publish(self, auction_id: int, event_type: str, data: dict) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_prune:
+                self._prune(now)
+            channel = self._channel(auction_id)
+            channel.seq += 1
+            event = AuctionEvent(channel.seq, event_type, _encode(channel.seq, event_type, data), now)
+            channel.backlog.append(event)
+        metrics.inc("stream_events_published_total")
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._fan_out, channel, event)
+
+    def _fan_out(self, channel: _Channel, event: AuctionEvent) -> None:
+        for subscription in list(channel.subscribers):
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._evict(channel, subscription)
+
+    def _evict(self, channel: _Channel, subscription: Subscription) -> None:
+        channel.subscribers.discard(subscription)
+        subscription.evicted = True
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+        metrics.inc("stream_subscribers_evicted_total")
+
+    def subscribe(self, auction_id: int, last_seq: Optional[int] = None) -> Subscription:
+        """
+        Register a watcher (on the event loop). A new watcher (no last_seq) is sent
+        the backlog; a resuming one every event after last_seq, or a single `reset`
+        if some of those events are no longer in the backlog.
+        """
+        with self._lock:
+            channel = self._channel(auction_id)
+            seq = channel.seq
+            oldest = channel.backlog[0].seq if channel.backlog else seq + 1
+            replay = [event for event in channel.backlog if last_seq is None or event.seq > last_seq]
+            if last_seq is not None and not oldest - 1 <= last_seq <= seq:
+                subscription = Subscription(auction_id, seq - 1)
+                subscription.queue.put_nowait(_reset(auction_id, seq))
+            else:
+                # Room for the whole replay on top of the usual live headroom
+                subscription = Subscription(auction_id, last_seq or 0, len(replay) + STREAM_QUEUE_SIZE)
+                for event in replay:
+                    subscription.queue.put_nowait(event)
+            # Under the lock, so a concurrent prune cannot drop the channel before it is watched
+            channel.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        channel = self._channels.get(subscription.auction_id)
+        if channel is not None:
+            channel.subscribers.discard(subscription)
+
+
+auction_broker = AuctionBroker()
+
+metrics.describe_gauge("stream_subscribers", "Live auction watchers connected", auction_broker.subscriber_count)
+metrics.describe_gauge("stream_channels", "Auctions with an event channel in memory", auction_broker.channel_count)
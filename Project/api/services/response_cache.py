@@ -0,0 +1,228 @@
+"""In-process cache of serialized auction read responses, invalidated by tag."""
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Optional, Set
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import Session, object_session
+
+import metrics
+from compact import render_page
+from database import Auction, User
+from etags import is_fresh, not_modified, page_etag
+
+# Upper bound on the total size of cached response bodies
+RESPONSE_CACHE_BYTES = int(os.getenv("AUCTION_RESPONSE_CACHE_BYTES", str(32 * 1024 * 1024)))
+
+# Tag on every cached auction list; new and closed auctions change which pages they appear on
+LISTS = "lists"
+
+# Tag invalidations remembered for readers still in flight; beyond twice this many the older half is forgotten
+_INVALIDATIONS_KEPT = 1024
+
+metrics.describe("response_cache_hits_total", "Auction reads served from the response cache")
+metrics.describe("response_cache_misses_total", "Auction reads that had to query and serialize")
+metrics.describe("response_cache_evictions_total", "Cached responses evicted to stay under the size bound")
+metrics.describe("response_cache_invalidations_total", "Cached responses dropped because their data changed")
+
+
+def auction_tag(auction_id: int) -> str:
+    return f"auction:{auction_id}"
+
+
+def user_tag(user_id: int) -> str:
+    """Tag on responses that embed the user (as an auction's creator)."""
+    return f"user:{user_id}"
+
+
+def request_key(request: Request) -> Hashable:
+    """Cache key for shared (not per-user) reads: path plus sorted query parameters."""
+    return request.url.path, tuple(sorted(request.query_params.multi_items()))
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    tags: FrozenSet[str]
+
+    def respond(self, request: Request) -> Response:
+        if is_fresh(request, self.etag):
+            return not_modified(self.etag)
+        return Response(self.body, media_type="application/json", headers={"ETag": self.etag})
+
+
+class ResponseCache:
+    """
+    LRU of serialized JSON bodies, bounded by total bytes. Each entry carries tags
+    (an auction it shows, or LISTS) and invalidate(tag) drops every entry with that
+    tag. Readers take generation() before querying and pass it to put(); if one of
+    the entry's tags was invalidated in between, the possibly stale body is served
+    but not stored. Only the most recent invalidations are remembered for that check;
+    a reader that started before the forgotten ones does not store its body either.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[Hashable]] = {}
+        self._invalidated_at: Dict[str, int] = {}
+        self._generation = 0
+        # put() refuses readers that started before this: the cache was cleared or invalidations were forgotten
+        self._floor = 0
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def generation(self) -> int:
+        return self._generation
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry.body)
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                metrics.inc("response_cache_misses_total")
+                return None
+            self._entries.move_to_end(key)
+        metrics.inc("response_cache_hits_total")
+        return entry
+
+    def put(self, key: Hashable, model: BaseModel, etag: str, tags: Iterable[str], generation: int) -> CachedResponse:
+        entry = CachedResponse(to_json(model), etag, frozenset(tags))
+        if len(entry.body) > self.max_bytes:
+            return entry
+        evicted = 0
+        with self._lock:
+            if self._floor > generation or any(
+                self._invalidated_at.get(tag, -1) > generation for tag in entry.tags
+            ):
+                return entry
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self._bytes += len(entry.body)
+            for tag in entry.tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                evicted += 1
+        if evicted:
+            metrics.inc("response_cache_evictions_total", evicted)
+        return entry
+
+    def invalidate(self, *tags: str) -> None:
+        dropped = 0
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                self._invalidated_at.pop(tag, None)
+                self._invalidated_at[tag] = self._generation
+                for key in list(self._keys_by_tag.get(tag, ())):
+                    self._drop(key)
+                    dropped += 1
+            if len(self._invalidated_at) > 2 * _INVALIDATIONS_KEPT:
+                self._forget_invalidations()
+        if dropped:
+            metrics.inc("response_cache_invalidations_total", dropped)
+
+    def _forget_invalidations(self) -> None:
+        # Insertion order is invalidation order, so the oldest records come first
+        forget = len(self._invalidated_at) - _INVALIDATIONS_KEPT
+        for tag in list(self._invalidated_at)[:forget]:
+            self._floor = max(self._floor, self._invalidated_at.pop(tag))
+
+    def invalidate_auctions(self, auction_ids: Iterable[int], lists: bool = False) -> None:
+        tags = [auction_tag(auction_id) for auction_id in auction_ids]
+        self.invalidate(*tags, *([LISTS] if lists else []))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._floor = self._generation
+            self._invalidated_at.clear()
+            dropped = len(self._entries)
+            self._entries.clear()
+            self._keys_by_tag.clear()
+            self._bytes = 0
+        if dropped:
+            metrics.inc("response_cache_invalidations_total", dropped)
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_BYTES)
+
+
+def cache_auction_page(
+    request: Request,
+    generation: int,
+    auctions: List[Auction],
+    next_cursor: Optional[str],
+    view: str,
+) -> Response:
+    """Serialize a page of auctions in `view`, cache it under the request's key and respond."""
+    page = render_page(auctions, next_cursor, view)
+    tags = [LISTS]
+    for auction in auctions:
+        tags += [auction_tag(auction.id), user_tag(auction.created_by)]
+    entry = response_cache.put(request_key(request), page, page_etag(auctions, next_cursor, view), tags, generation)
+    return entry.respond(request)
+
+metrics.describe_gauge("response_cache_entries", "Responses held in the response cache", lambda: len(response_cache))
+metrics.describe_gauge("response_cache_bytes", "Bytes held in the response cache", lambda: response_cache.size_bytes)
+
+
+# The User columns cached responses render (UserResponse); password changes leave them valid
+_RENDERED_USER_FIELDS = ("name", "email", "role")
+
+
+def _invalidate_on_commit(target, tag: str) -> None:
+    # Dropped once the change is visible; dropping earlier would let a reader re-cache the old body
+    object_session(target).info.setdefault("response_cache_tags", set()).add(tag)
+
+
+@event.listens_for(User, "after_update")
+def _invalidate_updated_user(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in _RENDERED_USER_FIELDS):
+        # The creator is part of their auctions' bodies, so their ETags must change too
+        connection.execute(
+            update(Auction).where(Auction.created_by == target.id).values(version=Auction.version + 1)
+        )
+        _invalidate_on_commit(target, user_tag(target.id))
+
+
+@event.listens_for(User, "after_delete")
+def _invalidate_deleted_user(mapper, connection, target):
+    _invalidate_on_commit(target, user_tag(target.id))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    tags = session.info.pop("response_cache_tags", None)
+    if tags:
+        response_cache.invalidate(*tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session):
+    session.info.pop("response_cache_tags", None)
@@ -0,0 +1,111 @@
+"""Background auction closer: ends auctions as their ended_at passes."""
+import heapq
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database import Auction, SessionLocal, run_write_transaction
+from services.auction import close_due_auctions
+from services.pubsub import auction_broker
+from services.response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY = timedelta(seconds=1)
+
+
+def _as_naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class AuctionCloser:
+    """
+    Keeps a min-heap of upcoming Auction.ended_at values and, on a daemon thread,
+    closes every due auction in one set-based transaction when the earliest one passes.
+    Call schedule() whenever an auction with an ended_at is created or imported.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self._session_factory = session_factory
+        self._heap: List[datetime] = []
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def start(self) -> None:
+        db = self._session_factory()
+        try:
+            ended_ats = db.scalars(
+                select(Auction.ended_at).where(
+                    Auction.status == "active",
+                    Auction.ended_at.isnot(None),
+                )
+            ).all()
+        finally:
+            db.close()
+        with self._cond:
+            self._heap = [_as_naive_utc(t) for t in ended_ats]
+            heapq.heapify(self._heap)
+            self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="auction-closer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def schedule(self, ended_at: Optional[datetime]) -> None:
+        """Register an auction end time; wakes the closer if it is now the earliest."""
+        if ended_at is None:
+            return
+        ended_at = _as_naive_utc(ended_at)
+        with self._cond:
+            heapq.heappush(self._heap, ended_at)
+            if self._heap[0] == ended_at:
+                self._cond.notify()
+
+    def _wait_until_due(self) -> bool:
+        """Block until the earliest end time has passed. Returns False when stopping."""
+        with self._cond:
+            while not self._stopping:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                delay = (self._heap[0] - datetime.utcnow()).total_seconds()
+                if delay <= 0:
+                    now = datetime.utcnow()
+                    while self._heap and self._heap[0] <= now:
+                        heapq.heappop(self._heap)
+                    return True
+                self._cond.wait(timeout=delay)
+            return False
+
+    def _run(self) -> None:
+        while self._wait_until_due():
+            db = self._session_factory()
+            try:
+                closed = run_write_transaction(db, close_due_auctions)
+                if closed:
+                    logger.info("Closed %d auction(s): %s", len(closed), closed)
+                    response_cache.invalidate_auctions(closed, lists=True)
+                for auction_id in closed:
+                    auction_broker.publish(auction_id, "closed", {"auction_id": auction_id, "status": "ended"})
+            except Exception:
+                db.rollback()
+                logger.exception("Closing due auctions failed; retrying")
+                self.schedule(datetime.utcnow() + RETRY_DELAY)
+            finally:
+                db.close()
+
+
+auction_closer = AuctionCloser(SessionLocal)
@@ -0,0 +1,108 @@
+"""
+Shared fixtures. The app runs against a throwaway SQLite file seeded with the
+sample data, with query budgets raising (see query_budget.py).
+"""
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+_DB_DIR = tempfile.mkdtemp(prefix="auction-tests-")
+# Read at import time by database.py and query_budget.py, so set before importing the app
+os.environ.setdefault("AUCTION_DB_URL", f"sqlite:///{os.path.join(_DB_DIR, 'auction_house.db')}")
+os.environ.setdefault("AUCTION_QUERY_BUDGET", "raise")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+import populate_data
+from auth import principal_cache
+from database import Auction, AuctionItem, SessionLocal, User, engine
+from services.response_cache import response_cache
+
+CUSTOMER = ("alexandra.reynolds@email.com", "hashed_password_customer_1")
+OTHER_CUSTOMER = ("marcus.williams@email.com", "hashed_password_customer_2")
+MANAGER = ("margaret@hammond-gallery.com", "hashed_password_manager_1")
+OTHER_MANAGER = ("james@chen-heritage.com", "hashed_password_manager_2")
+
+
+@pytest.fixture(scope="session")
+def client():
+    populate_data.populate_database()
+    from main import app
+    with TestClient(app) as test_client:
+        yield test_client
+    engine.dispose()
+    shutil.rmtree(_DB_DIR, ignore_errors=True)
+
+
+def _login(client, credentials):
+    email, password = credentials
+    response = client.post("/auth/login", data={"username": email, "password": password})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="session")
+def customer(client):
+    return _login(client, CUSTOMER)
+
+
+@pytest.fixture(scope="session")
+def other_customer(client):
+    return _login(client, OTHER_CUSTOMER)
+
+
+@pytest.fixture(scope="session")
+def manager(client):
+    return _login(client, MANAGER)
+
+
+@pytest.fixture(scope="session")
+def other_manager(client):
+    return _login(client, OTHER_MANAGER)
+
+
+@pytest.fixture
+def db(client):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def cold_caches():
+    """Drop cached principals and responses so a request takes its most expensive path."""
+    principal_cache.clear()
+    response_cache.clear()
+
+
+@pytest.fixture
+def make_auction(db):
+    """Create an active auction with `items` items directly in the database; returns the Auction."""
+
+    def make(items=3, opening_price="10.00"):
+        # End the read transaction earlier attribute loads began; its snapshot may be stale
+        db.rollback()
+        creator = db.query(User).filter(User.email == MANAGER[0]).one()
+        auction = Auction(
+            name="Test auction",
+            created_by=creator.id,
+            status="active",
+            ended_at=datetime.utcnow() + timedelta(days=1),
+        )
+        auction.items = [
+            AuctionItem(name=f"Lot {n}", opening_price=Decimal(opening_price), current_bid=0)
+            for n in range(1, items + 1)
+        ]
+        db.add(auction)
+        db.commit()
+        return auction
+
+    return make
@@ -0,0 +1,63 @@
+"""Bid engine behaviour through the bid routes and services.bidding."""
+import itertools
+import threading
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from database import AuctionItem, Bid, SessionLocal, User
+from services.bidding import BID_CONFLICT, BID_NOT_ABOVE_CURRENT, BidRejected, submit_bid
+
+
+def test_batch_rejection_amounts_are_quantized(client, customer, make_auction):
+    auction = make_auction(items=1)
+    item_id = auction.items[0].id
+    bids = [
+        {"auction_id": auction.id, "item_id": item_id, "amount": "20"},
+        {"auction_id": auction.id, "item_id": item_id, "amount": "15"},
+    ]
+    response = client.post("/customers/bids/batch", json={"bids": bids}, headers=customer)
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    assert results[0]["accepted"] is True
+    assert results[1]["detail"] == "Bid must be greater than current bid (20.00)"
+
+
+def test_concurrent_bidders_on_one_item(db, make_auction):
+    auction = make_auction(items=1)
+    auction_id, item_id = auction.id, auction.items[0].id
+    bidder_ids = db.execute(select(User.id).where(User.role == "customer")).scalars().all()
+    # Ever-higher amounts, handed out in an order the threads then race to apply
+    amounts = itertools.count(11)
+    amounts_lock = threading.Lock()
+    accepted, rejections, errors = [], [], []
+
+    def bidder(bidder_id):
+        session = SessionLocal()
+        try:
+            for _ in range(15):
+                with amounts_lock:
+                    amount = Decimal(next(amounts))
+                try:
+                    submit_bid(session, auction_id, item_id, bidder_id, amount)
+                    accepted.append(amount)
+                except BidRejected as e:
+                    rejections.append(e.reason)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=bidder, args=(bidder_id,)) for bidder_id in bidder_ids * 2]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert set(rejections) <= {BID_NOT_ABOVE_CURRENT, BID_CONFLICT}
+    db.rollback()
+    history = db.execute(select(Bid.amount).where(Bid.item_id == item_id).order_by(Bid.id)).scalars().all()
+    assert len(history) == len(accepted)
+    assert all(earlier < later for earlier, later in zip(history, history[1:]))
+    assert db.get(AuctionItem, item_id).current_bid == max(accepted)
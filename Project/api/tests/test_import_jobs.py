@@ -0,0 +1,97 @@
+"""Background import jobs through the manager routes, and what their worker processes load."""
+import io
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+
+import pytest
+
+from services.import_jobs import ImportJob, ImportJobManager, ImportsClosed
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEADER = b"name,ended_at,item_1_name,item_1_price\n"
+
+
+def submit(client, headers, body=HEADER):
+    upload = {"file": ("auctions.csv", io.BytesIO(body), "text/csv")}
+    response = client.post("/managers/auctions/import", files=upload, headers=headers)
+    assert response.status_code == 202, response.text
+    return response.json()["id"]
+
+
+def test_only_the_creator_sees_a_job(client, manager, other_manager):
+    job_id = submit(client, manager)
+    assert client.get(f"/managers/imports/{job_id}", headers=other_manager).status_code == 404
+    assert client.get(f"/managers/imports/{job_id}", headers=manager).status_code == 200
+
+
+def test_only_the_creator_cancels_a_job(client, manager, other_manager):
+    job_id = submit(client, manager)
+    response = client.post(f"/managers/imports/{job_id}/cancel", headers=other_manager)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Import job not found"
+    assert client.post(f"/managers/imports/{job_id}/cancel", headers=manager).status_code == 200
+
+
+def test_rows_are_parsed_in_worker_processes(client, manager):
+    job_id = submit(client, manager, HEADER + b"Imported lot,2099-01-01,Vase,12.50\nImported lot 2,2099-01-02,Clock,3\n")
+    deadline = time.monotonic() + 60
+    while True:
+        job = client.get(f"/managers/imports/{job_id}", headers=manager).json()
+        if job["status"] not in ("queued", "running") or time.monotonic() > deadline:
+            break
+        time.sleep(0.05)
+    assert job["status"] == "completed", job
+    assert (job["created"], job["errors"]) == (2, [])
+
+
+def run_python(code, **env):
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=API_DIR, env={**os.environ, **env}, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+
+def test_parse_worker_module_does_not_load_the_app():
+    loaded = run_python(
+        "import sys, services.auction_csv; print(sorted({'database', 'main', 'sqlalchemy'} & set(sys.modules)))"
+    )
+    assert loaded == "[]"
+
+
+def test_importing_main_creates_no_tables(tmp_path):
+    # A spawned worker re-imports the parent's main module; that must not touch the database
+    path = tmp_path / "untouched.db"
+    run_python("import main", AUCTION_DB_URL=f"sqlite:///{path}")
+    if path.exists():
+        with sqlite3.connect(path) as conn:
+            assert conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall() == []
+
+
+def test_no_imports_after_shutdown(tmp_path):
+    manager = ImportJobManager()
+    manager.shutdown()
+    upload = tmp_path / "auctions.csv"
+    upload.write_bytes(HEADER)
+    with pytest.raises(ImportsClosed):
+        manager.submit(str(upload), created_by=1)
+    assert not upload.exists()
+
+
+def test_job_queued_at_shutdown_starts_no_workers(db, tmp_path):
+    manager = ImportJobManager()
+    manager._executors()
+    upload = tmp_path / "auctions.csv"
+    upload.write_bytes(HEADER + b"Late lot,2099-01-01,Vase,1\n")
+    job = ImportJob(id="queued", created_by=1, path=str(upload), batch_size=10)
+    manager._jobs[job.id] = job
+    manager.shutdown()
+    # What the job thread does if it picks the job up after shutdown() released the pools
+    manager._run(job)
+    assert (job.status, job.created) == ("cancelled", 0)
+    assert manager._threads is None and manager._processes is None
+    with pytest.raises(ImportsClosed):
+        manager._executors()
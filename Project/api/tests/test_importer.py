@@ -0,0 +1,76 @@
+"""AuctionImporter's batch and row-by-row write paths."""
+import sqlite3
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from conftest import MANAGER
+from database import User
+from services.importer import AuctionImporter
+
+
+def locked():
+    return OperationalError("INSERT", {}, sqlite3.OperationalError("database is locked"))
+
+
+@pytest.fixture
+def importer(db):
+    creator = db.query(User).filter(User.email == MANAGER[0]).one()
+    return AuctionImporter(db, creator.id, batch_size=10)
+
+
+def rows(count):
+    ended_at = datetime.utcnow() + timedelta(days=1)
+    return [(n + 2, f"Imported {n}", ended_at, [("Lot", Decimal("5"))]) for n in range(count)]
+
+
+def fail_batches(monkeypatch, importer):
+    def write_batch(db, batch):
+        raise ValueError("bad row somewhere")
+
+    monkeypatch.setattr(importer, "_write_batch", write_batch)
+
+
+def test_bad_rows_are_reported_and_the_rest_commit(monkeypatch, importer):
+    fail_batches(monkeypatch, importer)
+    insert = importer._insert
+
+    def insert_rejecting_row_3(batch):
+        if batch[0][0] == 3:
+            raise ValueError("bad price")
+        insert(batch)
+
+    monkeypatch.setattr(importer, "_insert", insert_rejecting_row_3)
+    importer.run(rows(3))
+    assert (importer.created, importer.errors) == (2, ["Row 3: bad price"])
+
+
+def test_lock_contention_in_the_row_fallback_is_retried_not_reported(monkeypatch, importer):
+    fail_batches(monkeypatch, importer)
+    insert = importer._insert
+    calls = []
+
+    def insert_locked_once(batch):
+        calls.append(batch[0][0])
+        if len(calls) == 2:
+            raise locked()
+        insert(batch)
+
+    monkeypatch.setattr(importer, "_insert", insert_locked_once)
+    importer.run(rows(3))
+    assert (importer.created, importer.errors) == (3, [])
+    # The whole row-by-row pass was retried after the lock error
+    assert calls == [2, 3, 2, 3, 4]
+
+
+def test_lock_contention_on_the_batch_is_not_replayed_row_by_row(monkeypatch, importer):
+    def write_batch(db, batch):
+        raise locked()
+
+    monkeypatch.setattr(importer, "_write_batch", write_batch)
+    monkeypatch.setattr("database.DB_LOCK_RETRIES", 0)
+    with pytest.raises(OperationalError, match="database is locked"):
+        importer.run(rows(3))
+    assert (importer.created, importer.errors) == (0, [])
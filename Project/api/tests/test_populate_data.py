@@ -0,0 +1,36 @@
+"""populate_data.py as a script: a pinned reference time makes the database reproducible."""
+import os
+import sqlite3
+import subprocess
+import sys
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TABLES = ["users", "auctions", "auction_items", "bids"]
+
+
+def populate(path, *args):
+    result = subprocess.run(
+        [sys.executable, "populate_data.py", "--managers", "1", "--customers", "3", "--auctions", "10",
+         "--bids-per-item", "2", "--seed", "7", *args],
+        cwd=API_DIR,
+        env={**os.environ, "AUCTION_DB_URL": f"sqlite:///{path}"},
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    with sqlite3.connect(path) as conn:
+        return {table: conn.execute(f"SELECT * FROM {table} ORDER BY id").fetchall() for table in TABLES}
+
+
+def test_pinned_now_reproduces_the_database(tmp_path):
+    first = populate(tmp_path / "first.db", "--now", "2026-01-01T12:00:00")
+    second = populate(tmp_path / "second.db", "--now", "2026-01-01T12:00:00")
+    assert first == second
+    assert all(first[table] for table in TABLES)
+
+
+def test_dates_are_relative_to_now(tmp_path):
+    data = populate(tmp_path / "data.db", "--no-sample", "--now", "2026-01-01")
+    with sqlite3.connect(tmp_path / "data.db") as conn:
+        (latest,) = conn.execute("SELECT max(created_at) FROM auctions").fetchone()
+    assert data["auctions"] and latest < "2026-01-01"
@@ -0,0 +1,56 @@
+"""The in-memory price book and the reads served from it."""
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from database import engine
+from services.price_book import price_book
+
+
+@contextmanager
+def counted_queries():
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+
+def test_seed_knows_auctions_without_items(db, make_auction):
+    auction = make_auction(items=0)
+    price_book.seed(db)
+    assert price_book.get_auction(auction.id) == []
+
+
+def test_empty_auction_prices_are_served_from_memory(client, customer, make_auction):
+    auction = make_auction(items=0)
+    assert client.get(f"/auctions/{auction.id}/prices", headers=customer).json() == []
+    with counted_queries() as statements:
+        assert client.get(f"/auctions/{auction.id}/prices", headers=customer).json() == []
+    assert statements == []
+
+
+def test_auction_detail_prices_come_from_the_book(client, customer, make_auction):
+    auction = make_auction(items=2)
+    item_id = auction.items[0].id
+    response = client.post(f"/auctions/{auction.id}/bids", json={"item_id": item_id, "amount": "25"}, headers=customer)
+    assert response.status_code == 200, response.text
+    detail = client.get(f"/auctions/{auction.id}", headers=customer).json()
+    prices = client.get(f"/auctions/{auction.id}/prices", headers=customer).json()
+    assert {item["id"]: item["current_bid"] for item in detail["items"]} == {
+        price["item_id"]: price["current_bid"] for price in prices
+    }
+    compact = client.get(f"/auctions/{auction.id}", params={"view": "compact"}, headers=customer).json()
+    assert compact["items"][str(item_id)]["current_bid"] == "25.00"
+
+
+def test_auction_detail_loads_the_auction_into_the_book(client, customer, make_auction):
+    auction = make_auction(items=2)
+    assert price_book.get_auction(auction.id) is None
+    client.get(f"/auctions/{auction.id}", headers=customer)
+    assert [price.item_id for price in price_book.get_auction(auction.id)] == [item.id for item in auction.items]
@@ -0,0 +1,95 @@
+"""Proxy (maximum) bids: how standing maximums answer manual bids and each other."""
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from database import AuctionItem, User
+from services.bidding import BID_INCREMENT, submit_bid, submit_bids, submit_proxy_bid
+
+
+@pytest.fixture
+def bidders(db):
+    """Ids of two customers, A then B."""
+    return db.execute(select(User.id).where(User.role == "customer").order_by(User.id).limit(2)).scalars().all()
+
+
+@pytest.fixture
+def item(make_auction):
+    auction = make_auction(items=1, opening_price="10.00")
+    return auction.id, auction.items[0].id
+
+
+def standing(db, item_id):
+    """(current_bid, current_bidder_id) as committed."""
+    db.rollback()
+    return tuple(db.execute(
+        select(AuctionItem.current_bid, AuctionItem.current_bidder_id).where(AuctionItem.id == item_id)
+    ).one())
+
+
+def test_proxy_opens_at_the_opening_price(db, bidders, item):
+    a, _ = bidders
+    submit_proxy_bid(db, *item, a, Decimal("50"))
+    assert standing(db, item[1]) == (Decimal("10.00"), a)
+
+
+def test_proxy_answers_a_lower_manual_bid(db, bidders, item):
+    a, b = bidders
+    submit_proxy_bid(db, *item, a, Decimal("50"))
+    submit_bid(db, *item, b, Decimal("30"))
+    assert standing(db, item[1]) == (Decimal("30") + BID_INCREMENT, a)
+
+
+def test_manual_bid_equal_to_the_max_does_not_take_the_lead(db, bidders, item):
+    a, b = bidders
+    submit_proxy_bid(db, *item, a, Decimal("50"))
+    submit_bid(db, *item, b, Decimal("50"))
+    assert standing(db, item[1]) == (Decimal("50.00"), a)
+
+
+def test_batch_bid_equal_to_the_max_does_not_take_the_lead(db, bidders, item):
+    a, b = bidders
+    submit_proxy_bid(db, *item, a, Decimal("50"))
+    (outcome,) = submit_bids(db, b, [(*item, Decimal("50"))])
+    assert outcome.accepted
+    assert standing(db, item[1]) == (Decimal("50.00"), a)
+
+
+def test_proxy_reaching_its_max_gives_up_the_lead(db, bidders, item):
+    a, b = bidders
+    submit_proxy_bid(db, *item, a, Decimal("50"))
+    submit_bid(db, *item, b, Decimal("49.50"))
+    # The answer is capped at the maximum rather than overshooting it
+    assert standing(db, item[1]) == (Decimal("50.00"), a)
+    submit_bid(db, *item, b, Decimal("50.01"))
+    assert standing(db, item[1]) == (Decimal("50.01"), b)
+
+
+def test_higher_proxy_beats_lower_proxy_by_one_increment(db, bidders, item):
+    a, b = bidders
+    submit_proxy_bid(db, *item, a, Decimal("50"))
+    submit_proxy_bid(db, *item, b, Decimal("80"))
+    assert standing(db, item[1]) == (Decimal("50") + BID_INCREMENT, b)
+
+
+def test_lower_proxy_placed_later_is_answered(db, bidders, item):
+    a, b = bidders
+    submit_proxy_bid(db, *item, a, Decimal("80"))
+    submit_proxy_bid(db, *item, b, Decimal("50"))
+    assert standing(db, item[1]) == (Decimal("50") + BID_INCREMENT, a)
+
+
+def test_equal_proxies_go_to_the_earlier(db, bidders, item):
+    a, b = bidders
+    submit_proxy_bid(db, *item, a, Decimal("50"))
+    submit_proxy_bid(db, *item, b, Decimal("50"))
+    assert standing(db, item[1]) == (Decimal("50.00"), a)
+
+
+def test_leader_raising_its_own_max_keeps_the_price(db, bidders, item):
+    a, b = bidders
+    submit_proxy_bid(db, *item, a, Decimal("50"))
+    submit_bid(db, *item, b, Decimal("20"))
+    submit_proxy_bid(db, *item, a, Decimal("90"))
+    assert standing(db, item[1]) == (Decimal("20") + BID_INCREMENT, a)
@@ -0,0 +1,116 @@
+"""Live auction events: replay to reconnecting watchers and the reset when it cannot be done."""
+import asyncio
+
+import pytest
+
+from services import pubsub
+from services.pubsub import STREAM_BACKLOG_SIZE, STREAM_BACKLOG_TTL_SECONDS, STREAM_QUEUE_SIZE, AuctionBroker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable time.monotonic() for the broker."""
+    now = [1000.0]
+    monkeypatch.setattr(pubsub.time, "monotonic", lambda: now[0])
+    return now
+
+
+def drain(subscription):
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+def publish(broker, count, auction_id=1):
+    for n in range(count):
+        broker.publish(auction_id, "bid", {"n": n})
+
+
+def test_next_raises_on_timeout():
+    async def watch():
+        subscription = AuctionBroker().subscribe(1)
+        with pytest.raises(asyncio.TimeoutError):
+            await subscription.next(0.01)
+
+    asyncio.run(watch())
+
+
+def test_replay_is_not_truncated_to_the_queue_size():
+    async def watch():
+        broker = AuctionBroker()
+        publish(broker, STREAM_QUEUE_SIZE * 2)
+        return [event.seq for event in drain(broker.subscribe(1, 10))]
+
+    assert asyncio.run(watch()) == list(range(11, STREAM_QUEUE_SIZE * 2 + 1))
+
+
+def test_position_older_than_the_backlog_gets_a_reset():
+    async def watch():
+        broker = AuctionBroker()
+        publish(broker, STREAM_BACKLOG_SIZE + 10)
+        broker.bind(asyncio.get_running_loop())
+        subscription = broker.subscribe(1, 5)
+        publish(broker, 1)
+        reset = await subscription.next(1)
+        assert reset.frame.startswith(f"id: {STREAM_BACKLOG_SIZE + 10}\nevent: reset\n".encode())
+        # Live events carry on after the reset
+        assert (await subscription.next(1)).seq == STREAM_BACKLOG_SIZE + 11
+
+    asyncio.run(watch())
+
+
+def test_position_from_before_a_restart_gets_a_reset():
+    async def watch():
+        broker = AuctionBroker()
+        publish(broker, 3)
+        return [(event.type, event.seq) for event in drain(broker.subscribe(1, 40))]
+
+    assert asyncio.run(watch()) == [("reset", 3)]
+
+
+def test_position_at_the_oldest_backlog_event_replays():
+    async def watch():
+        broker = AuctionBroker()
+        publish(broker, STREAM_BACKLOG_SIZE + 10)
+        return [event.seq for event in drain(broker.subscribe(1, 10))]
+
+    assert asyncio.run(watch()) == list(range(11, STREAM_BACKLOG_SIZE + 11))
+
+
+def test_unwatched_channels_are_dropped_once_their_backlog_ages_out(clock):
+    async def watch():
+        broker = AuctionBroker()
+        publish(broker, 3, auction_id=1)
+        watched = broker.subscribe(2)
+        publish(broker, 3, auction_id=2)
+        clock[0] += STREAM_BACKLOG_TTL_SECONDS / 2
+        publish(broker, 1, auction_id=3)
+        assert broker.channel_count() == 3
+        clock[0] += STREAM_BACKLOG_TTL_SECONDS * 0.75
+        publish(broker, 1, auction_id=4)
+        # 1 has aged out; 2 is watched; 3 is still fresh enough for reconnects
+        assert broker.channel_count() == 3
+        broker.unsubscribe(watched)
+        clock[0] += STREAM_BACKLOG_TTL_SECONDS * 2
+        publish(broker, 1, auction_id=4)
+        assert broker.channel_count() == 1
+
+    asyncio.run(watch())
+
+
+def test_ids_from_a_dropped_channel_get_a_reset(clock):
+    async def watch():
+        broker = AuctionBroker()
+        publish(broker, 5, auction_id=1)
+        clock[0] += STREAM_BACKLOG_TTL_SECONDS * 2
+        publish(broker, 1, auction_id=2)
+        publish(broker, 2, auction_id=1)
+        # The recreated channel numbers its events above every id handed out before
+        missed = [(event.type, event.seq) for event in drain(broker.subscribe(1, 3))]
+        caught_up = [(event.type, event.seq) for event in drain(broker.subscribe(1, 5))]
+        return missed, caught_up
+
+    missed, caught_up = asyncio.run(watch())
+    assert missed == [("reset", 7)]
+    assert caught_up == [("bid", 6), ("bid", 7)]
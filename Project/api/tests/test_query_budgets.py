@@ -0,0 +1,224 @@
+"""
+Every route, driven down its most expensive path with cold caches, must stay within
+its declared query budget. QueryBudgetMiddleware raises QueryBudgetExceeded through
+TestClient when it does not.
+"""
+import io
+import sqlite3
+
+import pytest
+from fastapi.exceptions import ResponseValidationError
+from fastapi.routing import APIRoute
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+from database import User, run_write_transaction
+from query_budget import QueryBudgetExceeded, query_budget
+from services.bidding import BID_BATCH_LIMIT
+
+pytestmark = pytest.mark.usefixtures("cold_caches")
+
+VIEWS = ["full", "compact"]
+
+
+def test_every_route_declares_a_budget(client):
+    from main import app
+    undeclared = [
+        route.path
+        for route in app.routes
+        if isinstance(route, APIRoute) and not hasattr(route.endpoint, "query_budget")
+    ]
+    assert undeclared == []
+
+
+def test_overrun_raises(client, customer, make_auction, monkeypatch):
+    from routes.auctions import get_auction
+    monkeypatch.setattr(get_auction.query_budget, "max_queries", 1)
+    auction = make_auction()
+    with pytest.raises(QueryBudgetExceeded, match="get_auction"):
+        client.get(f"/auctions/{auction.id}", headers=customer)
+
+
+def test_unnamed_budget_reports_its_caller(db):
+    with pytest.raises(QueryBudgetExceeded, match="test_unnamed_budget_reports_its_caller"):
+        with query_budget(0):
+            db.execute(select(User.id)).first()
+
+
+def test_lock_retry_counts_only_the_committed_attempt(db):
+    attempts = []
+
+    def work(db):
+        db.execute(select(User.id)).first()
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OperationalError("SELECT", {}, sqlite3.OperationalError("database is locked"))
+        db.commit()
+
+    with query_budget(1):
+        run_write_transaction(db, work)
+    assert len(attempts) == 2
+
+
+# main
+
+@pytest.mark.parametrize("path", ["/", "/health", "/metrics"])
+def test_service_routes(client, path):
+    assert client.get(path).status_code == 200
+
+
+# auth
+
+def test_register(client):
+    response = client.post(
+        "/auth/register",
+        json={"name": "Budget Tester", "email": "budget.tester@example.com", "password": "secret", "role": "customer"},
+    )
+    assert response.status_code == 200, response.text
+
+
+def test_login(client):
+    response = client.post(
+        "/auth/login",
+        data={"username": "alexandra.reynolds@email.com", "password": "hashed_password_customer_1"},
+    )
+    assert response.status_code == 200
+
+
+def test_me(client, customer):
+    assert client.get("/auth/me", headers=customer).status_code == 200
+
+
+# auctions
+
+@pytest.mark.parametrize("view", VIEWS)
+def test_list_auctions(client, customer, view):
+    assert client.get("/auctions/", params={"view": view}, headers=customer).status_code == 200
+
+
+@pytest.mark.parametrize("view", VIEWS)
+def test_get_auction(client, customer, make_auction, view):
+    auction = make_auction()
+    assert client.get(f"/auctions/{auction.id}", params={"view": view}, headers=customer).status_code == 200
+
+
+def test_get_auction_prices_not_in_price_book(client, customer, make_auction):
+    auction = make_auction()
+    assert client.get(f"/auctions/{auction.id}/prices", headers=customer).status_code == 200
+
+
+def test_stream_unknown_auction(client, customer):
+    # A live stream never ends under TestClient; the lookup before it is what costs queries
+    assert client.get("/auctions/999999/stream", headers=customer).status_code == 404
+
+
+def test_place_bid_with_proxy_counter_bid(client, customer, other_customer, make_auction):
+    auction = make_auction()
+    item_id = auction.items[0].id
+    response = client.post(
+        f"/auctions/{auction.id}/proxy-bids", json={"item_id": item_id, "max_amount": "50.00"}, headers=other_customer
+    )
+    assert response.status_code == 200, response.text
+    response = client.post(f"/auctions/{auction.id}/bids", json={"item_id": item_id, "amount": "20.00"}, headers=customer)
+    assert response.status_code == 200, response.text
+
+
+def test_place_proxy_bid_against_rival_proxy(client, customer, other_customer, make_auction):
+    auction = make_auction()
+    item_id = auction.items[0].id
+    client.post(f"/auctions/{auction.id}/proxy-bids", json={"item_id": item_id, "max_amount": "30.00"}, headers=other_customer)
+    response = client.post(
+        f"/auctions/{auction.id}/proxy-bids", json={"item_id": item_id, "max_amount": "40.00"}, headers=customer
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["leading"] is True
+
+
+def test_create_auction(client, manager):
+    response = client.post("/auctions/", json={"name": "Budget auction", "ended_at": None}, headers=manager)
+    assert response.status_code == 200, response.text
+
+
+@pytest.mark.parametrize("method, path", [("put", "/auctions/1"), ("post", "/auctions/1/end")])
+def test_auction_placeholders(client, manager, method, path):
+    # Placeholders whose bodies do not match their response models yet; the budget still applies
+    with pytest.raises(ResponseValidationError):
+        client.request(method, path, headers=manager)
+
+
+# customers
+
+@pytest.mark.parametrize("path", ["/customers/auctions/active", "/customers/auctions/mine", "/customers/auctions", "/customers/bids"])
+@pytest.mark.parametrize("view", VIEWS)
+def test_customer_lists(client, customer, path, view):
+    assert client.get(path, params={"view": view}, headers=customer).status_code == 200
+
+
+def test_place_bids_batch(client, customer, other_customer, make_auction):
+    auctions = [make_auction(), make_auction()]
+    for auction in auctions:
+        client.post(
+            f"/auctions/{auction.id}/proxy-bids",
+            json={"item_id": auction.items[0].id, "max_amount": "50.00"},
+            headers=other_customer,
+        )
+    bids = [
+        {"auction_id": auction.id, "item_id": item.id, "amount": "20.00"}
+        for auction in auctions
+        for item in auction.items
+    ]
+    response = client.post("/customers/bids/batch", json={"bids": bids}, headers=customer)
+    assert response.status_code == 200, response.text
+    assert response.json()["accepted"] == len(bids)
+
+
+def test_place_bids_full_batch(client, customer, other_customer, make_auction):
+    # The batch budget is a constant: a full batch runs no more statements than a short one
+    auction = make_auction(items=BID_BATCH_LIMIT)
+    for item in auction.items[::10]:
+        client.post(
+            f"/auctions/{auction.id}/proxy-bids", json={"item_id": item.id, "max_amount": "50.00"}, headers=other_customer
+        )
+    bids = [{"auction_id": auction.id, "item_id": item.id, "amount": "20.00"} for item in auction.items]
+    response = client.post("/customers/bids/batch", json={"bids": bids}, headers=customer)
+    assert response.status_code == 200, response.text
+    assert response.json()["accepted"] == BID_BATCH_LIMIT
+
+
+# managers
+
+@pytest.mark.parametrize("view", VIEWS)
+def test_manager_auctions(client, manager, view):
+    assert client.get("/managers/auctions", params={"view": view}, headers=manager).status_code == 200
+
+
+def test_export_auctions(client, manager):
+    assert client.get("/managers/auctions/export", headers=manager).status_code == 200
+
+
+def test_import_job_routes(client, manager):
+    upload = {"file": ("auctions.csv", io.BytesIO(b"name,ended_at,item_1_name,item_1_price\n"), "text/csv")}
+    response = client.post("/managers/auctions/import", files=upload, headers=manager)
+    assert response.status_code == 202, response.text
+    job_id = response.json()["id"]
+    assert client.get(f"/managers/imports/{job_id}", headers=manager).status_code == 200
+    assert client.post(f"/managers/imports/{job_id}/cancel", headers=manager).status_code == 200
+
+
+def test_check_price_book(client, manager):
+    assert client.get("/managers/price-book/check", headers=manager).status_code == 200
+
+
+@pytest.mark.parametrize(
+    "method, path, body",
+    [
+        ("post", "/managers/auctions", {"name": "Placeholder", "ended_at": None}),
+        ("put", "/managers/auctions/1", None),
+        ("post", "/managers/auctions/1/items", {"name": "Placeholder lot", "opening_price": "1.00", "auction_id": 1}),
+        ("post", "/managers/auctions/1/end", None),
+    ],
+)
+def test_manager_placeholders(client, manager, method, path, body):
+    with pytest.raises(ResponseValidationError):
+        client.request(method, path, json=body, headers=manager)
+
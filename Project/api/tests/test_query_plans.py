@@ -0,0 +1,113 @@
+"""
+The hot queries must be served by their indexes. Each test captures the SQL a route
+really runs and checks SQLite's EXPLAIN QUERY PLAN for it: the expected index is
+used, no table is scanned in full, and keyset pages are read in index order.
+"""
+import re
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from database import engine
+from services.auction import close_due_auctions
+
+pytestmark = pytest.mark.usefixtures("cold_caches")
+
+# "SCAN <table>" without "USING ... INDEX" reads every row; subquery results (anon_N) are exempt
+_FULL_SCAN = re.compile(r"^SCAN (?!anon_)\w+$")
+_SORTED = "USE TEMP B-TREE FOR ORDER BY"
+
+
+@contextmanager
+def captured_plans():
+    """Collect the query plan of every SELECT, UPDATE or DELETE run inside the block."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            statements.append((statement, parameters))
+
+    plans = []
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield plans
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            plans.append([row[-1] for row in rows])
+
+
+def assert_plans(plans, index, ordered=True):
+    steps = [step for plan in plans for step in plan]
+    assert any(index in step for step in steps), steps
+    assert not [step for step in steps if _FULL_SCAN.match(step)], steps
+    if ordered:
+        assert _SORTED not in steps, steps
+
+
+@pytest.mark.parametrize(
+    "path, index, ordered",
+    [
+        ("/auctions/", "ix_auctions_created_at_id", True),
+        ("/auctions/?status=active", "ix_auctions_status_created_at_id", True),
+        ("/auctions/?status=cancelled", "ix_auctions_status_created_at_id", True),
+        # Ended is "status = ended OR active past ended_at": one index search per branch, then a sort
+        ("/auctions/?status=ended", "ix_auctions_status_ended_at", False),
+        ("/customers/auctions/active", "ix_auctions_status_created_at_id", True),
+        ("/customers/auctions/mine", "ix_bids_bidder_id_created_at", False),
+        ("/customers/bids", "ix_bids_bidder_id_created_at", True),
+    ],
+)
+def test_customer_reads(client, customer, path, index, ordered):
+    with captured_plans() as plans:
+        assert client.get(path, headers=customer).status_code == 200
+    assert_plans(plans, index, ordered)
+
+
+def test_next_page(client, customer, make_auction):
+    make_auction()
+    make_auction()
+    next_cursor = client.get("/auctions/", params={"limit": 1}, headers=customer).json()["next_cursor"]
+    with captured_plans() as plans:
+        client.get("/auctions/", params={"limit": 1, "cursor": next_cursor}, headers=customer)
+    assert_plans(plans, "ix_auctions_created_at_id")
+
+
+@pytest.mark.parametrize(
+    "path, index",
+    [
+        ("/managers/auctions?status=active", "ix_auctions_status_created_at_id"),
+        ("/managers/auctions/export", "ix_bids_item_id"),
+    ],
+)
+def test_manager_reads(client, manager, path, index):
+    with captured_plans() as plans:
+        assert client.get(path, headers=manager).status_code == 200
+    assert_plans(plans, index)
+
+
+def test_auction_detail(client, customer, make_auction):
+    auction = make_auction()
+    with captured_plans() as plans:
+        assert client.get(f"/auctions/{auction.id}", headers=customer).status_code == 200
+    assert_plans(plans, "ix_auction_items_auction_id")
+
+
+def test_bid_answered_by_proxy(client, customer, other_customer, make_auction):
+    auction = make_auction()
+    item_id = auction.items[0].id
+    client.post(f"/auctions/{auction.id}/proxy-bids", json={"item_id": item_id, "max_amount": "50.00"}, headers=other_customer)
+    with captured_plans() as plans:
+        response = client.post(f"/auctions/{auction.id}/bids", json={"item_id": item_id, "amount": "20.00"}, headers=customer)
+    assert response.status_code == 200, response.text
+    # Ranking an item's few maximums sorts them; the lookup itself is an index search
+    assert_plans(plans, "ix_proxy_bids_item_id_max_amount", ordered=False)
+
+
+def test_close_due_auctions(db):
+    with captured_plans() as plans:
+        close_due_auctions(db)
+    assert_plans(plans, "ix_auctions_status_ended_at")
@@ -0,0 +1,100 @@
+"""The response cache: tag invalidation, its bookkeeping, and what invalidates it."""
+import pytest
+from pydantic import BaseModel
+
+from conftest import MANAGER
+from database import User
+from services import response_cache as cache_module
+from services.response_cache import ResponseCache, response_cache, user_tag
+
+pytestmark = pytest.mark.usefixtures("cold_caches")
+
+
+class Body(BaseModel):
+    value: int
+
+
+def test_old_invalidations_are_forgotten(monkeypatch):
+    monkeypatch.setattr(cache_module, "_INVALIDATIONS_KEPT", 4)
+    cache = ResponseCache(1024)
+    started = cache.generation()
+    for n in range(20):
+        cache.invalidate(f"tag:{n}")
+    assert len(cache._invalidated_at) <= 8
+    # A reader that started before the forgotten invalidations cannot tell whether its tags were hit
+    cache.put("stale", Body(value=1), "etag", ["tag:0"], started)
+    assert cache.get("stale") is None
+    cache.put("fresh", Body(value=2), "etag", ["tag:0"], cache.generation())
+    assert cache.get("fresh") is not None
+
+
+def test_recent_invalidations_still_refuse_stale_puts(monkeypatch):
+    monkeypatch.setattr(cache_module, "_INVALIDATIONS_KEPT", 4)
+    cache = ResponseCache(1024)
+    for n in range(20):
+        cache.invalidate(f"tag:{n}")
+    started = cache.generation()
+    cache.invalidate("tag:19")
+    cache.put("stale", Body(value=1), "etag", ["tag:19"], started)
+    assert cache.get("stale") is None
+    cache.put("other", Body(value=1), "etag", ["tag:18"], started)
+    assert cache.get("other") is not None
+
+
+def test_user_update_drops_only_responses_showing_that_user(client, customer, db, make_auction):
+    auction = make_auction()
+    client.get(f"/auctions/{auction.id}", headers=customer)
+    detail = ("auction", auction.id, "full")
+    response_cache.put("unrelated", Body(value=1), "etag", [user_tag(0)], response_cache.generation())
+
+    manager = db.query(User).filter(User.email == MANAGER[0]).one()
+    name, password = manager.name, manager.password
+    try:
+        manager.password = password + "-changed"
+        db.commit()
+        assert response_cache.get(detail) is not None
+
+        manager.name = "Renamed Manager"
+        db.commit()
+        assert response_cache.get(detail) is None
+        assert response_cache.get("unrelated") is not None
+        assert client.get(f"/auctions/{auction.id}", headers=customer).json()["creator"]["name"] == "Renamed Manager"
+    finally:
+        manager.name, manager.password = name, password
+        db.commit()
+
+
+def test_renaming_a_creator_changes_their_auctions_etags(client, customer, db, make_auction):
+    auction = make_auction()
+    paths = [f"/auctions/{auction.id}", "/auctions/"]
+    etags = {path: client.get(path, headers=customer).headers["ETag"] for path in paths}
+
+    manager = db.query(User).filter(User.email == MANAGER[0]).one()
+    name, password = manager.name, manager.password
+    try:
+        manager.password = password + "-changed"
+        db.commit()
+        for path, etag in etags.items():
+            assert client.get(path, headers={**customer, "If-None-Match": etag}).status_code == 304
+
+        manager.name = "Renamed Manager"
+        db.commit()
+        for path, etag in etags.items():
+            response = client.get(path, headers={**customer, "If-None-Match": etag})
+            assert response.status_code == 200, path
+            assert response.headers["ETag"] != etag
+        detail = client.get(paths[0], headers={**customer, "If-None-Match": etags[paths[0]]}).json()
+        assert detail["creator"]["name"] == "Renamed Manager"
+    finally:
+        manager.name, manager.password = name, password
+        db.commit()
+
+
+def test_rolled_back_user_change_keeps_cached_responses(client, customer, db, make_auction):
+    auction = make_auction()
+    client.get(f"/auctions/{auction.id}", headers=customer)
+    manager = db.query(User).filter(User.email == MANAGER[0]).one()
+    manager.name = "Never Saved"
+    db.flush()
+    db.rollback()
+    assert response_cache.get(("auction", auction.id, "full")) is not None
@@ -1,14 +1,96 @@
 import requests
+import base64
 import json
 import os
+import time
+from functools import wraps
 from pathlib import Path
-from typing import Dict, List, Any, Union
+from typing import Dict, Iterator, List, Any, Optional, Union
+from urllib.parse import urlencode
 import click
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_BASE_URL = os.getenv("AUCTION_API_URL", "http://localhost:8000")
+# (connect, read) timeouts in seconds
+REQUEST_TIMEOUT = (
+    float(os.getenv("AUCTION_CLI_CONNECT_TIMEOUT", "3.05")),
+    float(os.getenv("AUCTION_CLI_READ_TIMEOUT", "30")),
+)
+# Retries for connection errors (any method) and for 502/503/504 or read
+# errors on idempotent methods only, so a POST is never sent twice
+REQUEST_RETRIES = int(os.getenv("AUCTION_CLI_RETRIES", "3"))
+RETRY_BACKOFF = float(os.getenv("AUCTION_CLI_RETRY_BACKOFF", "0.3"))
+POOL_SIZE = int(os.getenv("AUCTION_CLI_POOL_SIZE", "10"))
+# Bids sent per POST /customers/bids/batch (the server's default limit)
+BID_BATCH_SIZE = 100
+
+# Reads use the server's compact view (ids plus side-loaded auctions/items/users
+# maps, each object sent once) and are expanded back into nested dicts here.
+COMPACT_VIEW = {"view": "compact"}
+
+def _expand_auction(payload: Dict, auction_id) -> Dict:
+    auction = payload["auctions"][str(auction_id)]
+    return {**auction, "creator": payload["users"].get(str(auction["created_by"]))}
+
+def _expand_item(payload: Dict, item_id) -> Dict:
+    item = payload["items"][str(item_id)]
+    return {**item, "auction": _expand_auction(payload, item["auction_id"])}
+
+def _expand_auction_detail(payload: Dict) -> Dict:
+    auction_id = payload["ids"][0]
+    items = [
+        _expand_item(payload, item_id)
+        for item_id, item in payload["items"].items()
+        if item["auction_id"] == auction_id
+    ]
+    return {**_expand_auction(payload, auction_id), "items": items}
+
+def _expand_bids(payload: Dict) -> List[Dict]:
+    bids = []
+    for bid_id in payload["ids"]:
+        bid = payload["bids"][str(bid_id)]
+        bids.append({
+            **bid,
+            "item": _expand_item(payload, bid["item_id"]),
+            "bidder": payload["users"].get(str(bid["bidder_id"])),
+        })
+    return bids
+
+def _build_session() -> requests.Session:
+    """Keep-alive session with a sized connection pool and bounded retries."""
+    retry = Retry(
+        total=REQUEST_RETRIES,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def _token_expiry(token: str) -> Optional[float]:
+    """The JWT's exp claim, read locally without verifying the signature (the server does that)."""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
 
 class APIClient:
-    def __init__(self, base_url: str = "http://localhost:8000"):
+    def __init__(self, base_url: str = DEFAULT_BASE_URL):
         self.base_url = base_url
+        self.session = _build_session()
+        # Read from disk once; kept in memory afterwards
         self.token = self._load_token()
+        # GET url -> (ETag, parsed body), replayed when the server answers 304
+        self._etag_cache: Dict[str, tuple] = {}
+        # /auth/me result for the current token; dropped on login, logout and 401
+        self._profile: Optional[Dict] = None
     
     def _load_token(self):
         """Load token from file if exists"""
@@ -24,6 +106,7 @@ class APIClient:
         token_file.write_text(token)
         token_file.chmod(0o600)  # Owner read/write only
         self.token = token
+        self._profile = None
     
     def _delete_token(self):
         """Delete token file"""
@@ -31,6 +114,8 @@ class APIClient:
         if token_file.exists():
             token_file.unlink()
         self.token = None
+        self._profile = None
+        self._etag_cache.clear()
         
     def _make_request(self, method: str, endpoint: str, data: Dict = None) -> Any:
         """Make HTTP request to API"""
@@ -44,26 +129,33 @@ class APIClient:
             headers["Content-Type"] = "application/json"
         else:
             data = None
+        
+        cached = self._etag_cache.get(url) if method == "GET" else None
+        if cached:
+            headers["If-None-Match"] = cached[0]
             
-        # Make HTTP request
-        if method == "GET":
-            response = requests.get(url, headers=headers)
-        elif method == "POST":
-            if data:
-                response = requests.post(url, headers=headers, json=data)
-            else:
-                response = requests.post(url, headers=headers)
-        elif method == "PUT":
-            response = requests.put(url, headers=headers, json=data)
-        else:
+        if method not in ("GET", "POST", "PUT"):
             raise ValueError(f"Unsupported HTTP method: {method}")
         
+        # Make HTTP request
+        try:
+            response = self.session.request(method, url, headers=headers, json=data, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            click.echo(f"Error: Could not reach the server ({e.__class__.__name__}).")
+            return None
+        
+        if response.status_code == 304 and cached:
+            return cached[1]
+        
         # Handle HTTP errors
         if response.status_code >= 400:
             self._handle_error_response(response)
             return None
-            
-        return response.json()
+        
+        result = response.json()
+        if method == "GET" and response.headers.get("ETag"):
+            self._etag_cache[url] = (response.headers["ETag"], result)
+        return result
     
     def _handle_error_response(self, response):
         """Handle HTTP error responses"""
@@ -109,14 +201,16 @@ class APIClient:
     
     def login(self, email: str, password: str) -> bool:
         """Login user and store token"""
-        from urllib.parse import urlencode
-        
         # Use form data as expected by OAuth2PasswordRequestForm
         data = {"username": email, "password": password}
         url = f"{self.base_url}/auth/login"
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
         
-        response = requests.post(url, headers=headers, data=urlencode(data))
+        try:
+            response = self.session.post(url, headers=headers, data=urlencode(data), timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            click.echo(f"Error: Could not reach the server ({e.__class__.__name__}).")
+            return False
         
         if response.status_code >= 400:
             self._handle_http_error(response)
@@ -134,22 +228,47 @@ class APIClient:
         self._delete_token()
         return True
     
+    def token_expired(self) -> bool:
+        """True if the stored token's exp has passed (tokens without a readable exp never expire here)."""
+        if not self.token:
+            return False
+        expires_at = _token_expiry(self.token)
+        return expires_at is not None and expires_at <= time.time()
+    
     def get_current_user(self):
-        """Get current user info"""
+        """Get current user info, fetched once per token and cached for the session"""
+        if self.token and self.token_expired():
+            self._delete_token()
         if not self.token:
             return None
-        return self._make_request("GET", "/auth/me")
+        if self._profile is None:
+            profile = self._make_request("GET", "/auth/me")
+            self._profile = profile if isinstance(profile, dict) else None
+        return self._profile
     
     # Auction methods
-    def get_auctions(self) -> List:
-        """Get all auctions"""
-        result = self._make_request("GET", "/auctions/")
-        return result if isinstance(result, list) else []
+    def iter_auctions(self, page_size: int = 50) -> Iterator[Dict]:
+        """Iterate over all auctions, fetching one page at a time as needed"""
+        params = {"limit": page_size, **COMPACT_VIEW}
+        while True:
+            result = self._make_request("GET", f"/auctions/?{urlencode(params)}")
+            if not isinstance(result, dict):
+                return
+            for auction_id in result.get("ids", []):
+                yield _expand_auction(result, auction_id)
+            if not result.get("next_cursor"):
+                return
+            params["cursor"] = result["next_cursor"]
     
     def get_auction(self, auction_id: int) -> Dict:
         """Get specific auction"""
-        result = self._make_request("GET", f"/auctions/{auction_id}")
-        return result if isinstance(result, dict) else {}
+        result = self._make_request("GET", f"/auctions/{auction_id}?{urlencode(COMPACT_VIEW)}")
+        return _expand_auction_detail(result) if isinstance(result, dict) else {}
+    
+    def get_auction_prices(self, auction_id: int) -> List[Dict]:
+        """Current bid and leader per item, served from the API's in-memory price book"""
+        result = self._make_request("GET", f"/auctions/{auction_id}/prices")
+        return result if isinstance(result, list) else []
     
     def create_auction(self, name: str) -> Dict:
         """Create new auction"""
@@ -176,7 +295,39 @@ class APIClient:
         result = self._make_request("POST", "/customers/bid", data)
         return result if isinstance(result, dict) else {}
     
+    def place_bids(self, bids: List[Dict]) -> List[Dict]:
+        """Place many bids ({auction_id, item_id, amount}); returns one result per bid, in order"""
+        results = []
+        for start in range(0, len(bids), BID_BATCH_SIZE):
+            result = self._make_request("POST", "/customers/bids/batch", {"bids": bids[start:start + BID_BATCH_SIZE]})
+            if not isinstance(result, dict):
+                break
+            results.extend(result.get("results", []))
+        return results
+    
     def get_user_bids(self) -> List:
         """Get current user's bids"""
-        result = self._make_request("GET", "/customers/bids")
-        return result if isinstance(result, list) else []
\ No newline at end of file
+        result = self._make_request("GET", f"/customers/bids?{urlencode(COMPACT_VIEW)}")
+        return _expand_bids(result) if isinstance(result, dict) else []
+
+_shared_client: Optional[APIClient] = None
+
+def get_client() -> APIClient:
+    """The process-wide client, created on first use."""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = APIClient()
+    return _shared_client
+
+def current_client() -> APIClient:
+    """The client on the active Click context, falling back to the process-wide one."""
+    ctx = click.get_current_context(silent=True)
+    client = ctx.find_object(APIClient) if ctx is not None else None
+    return client or get_client()
+
+def pass_client(f):
+    """Click decorator passing the shared APIClient as the first argument."""
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        return f(current_client(), *args, **kwargs)
+    return wrapper
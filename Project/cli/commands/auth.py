@@ -1,12 +1,12 @@
 import click
 from functools import wraps
-from api_client import APIClient
+from api_client import current_client, pass_client
 
 def require_auth(f):
     """Decorator to require authentication for CLI commands"""
     @wraps(f)
     def wrapper(*args, **kwargs):
-        client = APIClient()
+        client = current_client()
         if not client.token:
             click.echo("Error: Not logged in. Run 'auction-cli login' first.")
             return
@@ -18,10 +18,9 @@ def require_auth(f):
 @click.option('--email', prompt='Email', help='User email')
 @click.option('--password', prompt='Password', hide_input=True, confirmation_prompt=True, help='User password')
 @click.option('--role', prompt='Role', type=click.Choice(['customer', 'manager']), help='User role')
-@click.pass_context
-def register(ctx, name, email, password, role):
+@pass_client
+def register(client, name, email, password, role):
     """Register a new user"""
-    client = APIClient()
     result = client.register(name, email, password, role)
     if result:
         click.echo(f"✅ User registered successfully!")
@@ -38,9 +37,9 @@ def register_entry(standalone_mode=True):
         register.main(standalone_mode=False)
 
 @click.command()
-def logout():
+@pass_client
+def logout(client):
     """Logout and clear stored credentials"""
-    client = APIClient()
     client.logout()
     click.echo("✅ Logged out successfully!")
     click.echo("Token cleared from local storage.")
@@ -52,9 +51,9 @@ def logout_main(standalone_mode=True):
         logout.main(standalone_mode=False)
 
 @click.command()
-def whoami():
+@pass_client
+def whoami(client):
     """Show current logged-in user"""
-    client = APIClient()
     if not client.token:
         click.echo("Not logged in.")
         return
@@ -69,12 +68,12 @@ def whoami():
         click.echo("❌ Unable to fetch user information.")
 
 @click.command()
-def login():
+@pass_client
+def login(client):
     """Login and store credentials"""
     email = click.prompt('Email')
     password = click.prompt('Password', hide_input=True)
     
-    client = APIClient()
     token = client.login(email, password)
     if token:
         click.echo("✅ Logged in successfully!")
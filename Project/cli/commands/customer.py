@@ -1,6 +1,8 @@
 import click
+import csv
+import json
 from commands.auth import require_auth
-from api_client import APIClient
+from api_client import pass_client
 
 def main(standalone_mode=True):
     """Alternative entry point for standalone mode"""
@@ -9,22 +11,23 @@ def main(standalone_mode=True):
         pass  # Will be handled by calling the decorated function directly
 
 @click.command()
-def list_auctions():
+@pass_client
+def list_auctions(client):
     """List all active auctions"""
-    client = APIClient()
-    auctions = client.get_auctions()
-    if auctions:
-        click.echo("🏛️  Active Auctions:")
-        for auction in auctions:
-            click.echo(f"   📋 {auction['name']} (ID: {auction['id']})")
-    else:
+    found = False
+    for auction in client.iter_auctions():
+        if not found:
+            click.echo("🏛️  Active Auctions:")
+            found = True
+        click.echo(f"   📋 {auction['name']} (ID: {auction['id']})")
+    if not found:
         click.echo("No active auctions found.")
 
 @click.command()
 @click.argument('auction_id')
-def view_auction(auction_id):
+@pass_client
+def view_auction(client, auction_id):
     """View auction details"""
-    client = APIClient()
     auction = client.get_auction(auction_id)
     if auction and 'id' in auction:
         click.echo(f"🏛️  Auction Details:")
@@ -33,9 +36,12 @@ def view_auction(auction_id):
         click.echo(f"   Status: {auction['status']}")
         click.echo(f"   Created: {auction.get('created_at', 'Unknown')}")
         if 'items' in auction and auction['items']:
+            # Names rarely change and revalidate with a 304; prices come from the live price book
+            prices = {price['item_id']: price for price in client.get_auction_prices(auction_id)}
             click.echo(f"   Items: {len(auction['items'])}")
             for item in auction['items']:
-                click.echo(f"     🎯 {item['name']} - ${item.get('current_bid', 0)}")
+                current_bid = prices.get(item['id'], item).get('current_bid', 0)
+                click.echo(f"     🎯 {item['name']} - ${current_bid}")
     else:
         click.echo(f"❌ Auction not found with ID: {auction_id}")
 
@@ -43,9 +49,9 @@ def view_auction(auction_id):
 @click.argument('item_id')
 @click.argument('amount', type=float)
 @require_auth
-def place_bid(item_id, amount):
+@pass_client
+def place_bid(client, item_id, amount):
     """Place a bid on an item"""
-    client = APIClient()
     result = client.place_bid(item_id, amount)
     if result and 'id' in result:
         click.echo(f"✅ Bid placed successfully!")
@@ -55,11 +61,37 @@ def place_bid(item_id, amount):
     else:
         click.echo("❌ Failed to place bid.")
 
+@click.command()
+@click.argument('bids_file', type=click.File('r'))
+@require_auth
+@pass_client
+def place_bids(client, bids_file):
+    """Place many bids from a CSV (auction_id,item_id,amount) or JSON file"""
+    if bids_file.name.endswith('.json'):
+        bids = json.load(bids_file)
+    else:
+        bids = list(csv.DictReader(bids_file))
+    if not bids:
+        click.echo("No bids found in file.")
+        return
+    results = client.place_bids(bids)
+    if not results:
+        click.echo("❌ Failed to place bids.")
+        return
+    accepted = 0
+    for result in results:
+        if result['accepted']:
+            accepted += 1
+            click.echo(f"   ✅ Item {result['item_id']}: ${result['amount']} (Bid ID: {result['bid_id']})")
+        else:
+            click.echo(f"   ❌ Item {result['item_id']}: ${result['amount']} - {result['detail']}")
+    click.echo(f"{accepted} of {len(bids)} bids placed.")
+
 @click.command()
 @require_auth
-def my_bids():
+@pass_client
+def my_bids(client):
     """View user's bidding history"""
-    client = APIClient()
     bids = client.get_user_bids()
     if bids:
         click.echo("💰 Your Bids:")
@@ -1,6 +1,6 @@
 import click
 from commands.auth import require_auth
-from api_client import APIClient
+from api_client import pass_client
 
 def main(standalone_mode=True):
     """Alternative entry point for standalone mode"""
@@ -11,9 +11,9 @@ def main(standalone_mode=True):
 @click.command()
 @click.argument('name')
 @require_auth
-def create_auction(name):
+@pass_client
+def create_auction(client, name):
     """Create a new auction"""
-    client = APIClient()
     result = client.create_auction(name)
     if result and 'id' in result:
         click.echo(f"✅ Auction created successfully!")
@@ -28,9 +28,9 @@ def create_auction(name):
 @click.argument('name')
 @click.argument('opening_price', type=float)
 @require_auth
-def add_item(auction_id, name, opening_price):
+@pass_client
+def add_item(client, auction_id, name, opening_price):
     """Add item to auction"""
-    client = APIClient()
     result = client.add_item(auction_id, name, opening_price)
     if result and 'id' in result:
         click.echo(f"✅ Item added to auction!")
@@ -44,9 +44,9 @@ def add_item(auction_id, name, opening_price):
 @click.command()
 @click.argument('auction_id')
 @require_auth
-def end_auction(auction_id):
+@pass_client
+def end_auction(client, auction_id):
     """End an auction and process results"""
-    client = APIClient()
     result = client.end_auction(auction_id)
     if result and 'id' in result:
         click.echo(f"✅ Auction ended successfully!")
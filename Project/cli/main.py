@@ -4,14 +4,16 @@
 import click
 import sys
 from commands.auth import logout, login, whoami, register
-from commands.customer import list_auctions, view_auction, place_bid, my_bids
+from commands.customer import list_auctions, view_auction, place_bid, place_bids, my_bids
 from commands.manager import create_auction, add_item, end_auction
-from api_client import APIClient
+from api_client import get_client
 
 @click.group()
-def cli():
+@click.pass_context
+def cli(ctx):
     """Auction House CLI Application"""
-    pass
+    # One pooled client per process, shared by every command through the context
+    ctx.obj = get_client()
 
 def display_welcome():
     """Display welcome message"""
@@ -36,6 +38,7 @@ def display_help():
 
 🛡️ Customer Commands:
   place-bid      Place a bid (requires item_id amount)
+  place-bids     Place many bids from a CSV or JSON file (requires file)
   my-bids         View your bidding history
 
 👑 Manager Commands (requires login):
@@ -76,19 +79,21 @@ def execute_command(command_input):
 
         # Execute specific commands
         if cmd_name == 'list-auctions':
-            list_auctions.main(standalone_mode=False)
+            list_auctions.main(standalone_mode=False, obj=get_client())
         elif cmd_name == 'view-auction':
-            view_auction.main(standalone_mode=False, args=args)
+            view_auction.main(standalone_mode=False, args=args, obj=get_client())
         elif cmd_name == 'place-bid':
-            place_bid.main(standalone_mode=False, args=args)
+            place_bid.main(standalone_mode=False, args=args, obj=get_client())
+        elif cmd_name == 'place-bids':
+            place_bids.main(standalone_mode=False, args=args, obj=get_client())
         elif cmd_name == 'my-bids':
-            my_bids.main(standalone_mode=False)
+            my_bids.main(standalone_mode=False, obj=get_client())
         elif cmd_name == 'create-auction':
-            create_auction.main(standalone_mode=False, args=args)
+            create_auction.main(standalone_mode=False, args=args, obj=get_client())
         elif cmd_name == 'add-item':
-            add_item.main(standalone_mode=False, args=args)
+            add_item.main(standalone_mode=False, args=args, obj=get_client())
         elif cmd_name == 'end-auction':
-            end_auction.main(standalone_mode=False, args=args)
+            end_auction.main(standalone_mode=False, args=args, obj=get_client())
         else:
             click.echo(f"❌ Unknown command: {cmd_name}")
             click.echo("   Type 'help' for available commands.")
@@ -103,7 +108,7 @@ def run_interactive():
     """Run CLI in interactive mode with logout as exit"""
     display_welcome()
 
-    client = APIClient()
+    client = get_client()
     initial_user = client.get_current_user()
 
     if initial_user:
@@ -117,7 +122,8 @@ def run_interactive():
     # Interactive loop
     while True:
         try:
-            # Show appropriate prompt based on login status
+            # Show appropriate prompt based on login status; the profile is cached
+            # by the client, so this is not a request per prompt
             current_user = client.get_current_user()
             if current_user:
                 prompt = f"auction-cli ({current_user['name']})> "
@@ -140,15 +146,14 @@ def run_interactive():
                 click.echo("👋 Goodbye!")
                 return
             elif command_lower == 'login':
-                login.main(standalone_mode=False, args=[])
-                client = APIClient()  # Recreate client to pick up new token
+                login.main(standalone_mode=False, args=[], obj=client)
             elif command_lower == 'register':
-                register.main(standalone_mode=False, args=[])
+                register.main(standalone_mode=False, args=[], obj=client)
             elif command_lower == 'whoami':
-                whoami.main(standalone_mode=False, args=[])
+                whoami.main(standalone_mode=False, args=[], obj=client)
             elif command_lower == 'logout':
                 click.echo("👋 Logging out...")
-                logout.main(standalone_mode=False, args=[])
+                logout.main(standalone_mode=False, args=[], obj=client)
                 click.echo("👋 Goodbye!")
                 return
 
@@ -176,6 +181,7 @@ def main(interactive):
         cli.add_command(list_auctions)
         cli.add_command(view_auction)
         cli.add_command(place_bid)
+        cli.add_command(place_bids)
         cli.add_command(my_bids)
         cli.add_command(create_auction)
         cli.add_command(add_item)